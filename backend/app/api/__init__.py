@@ -2,7 +2,7 @@
 
 from fastapi import FastAPI
 
-from .routes import search, transcripts, playlists
+from .routes import admin, corpus, export, jobs, metrics, search, transcripts, playlists
 
 
 def register_routes(app: FastAPI) -> None:  # pragma: no cover (thin wrapper)
@@ -11,3 +11,8 @@ def register_routes(app: FastAPI) -> None:  # pragma: no cover (thin wrapper)
     app.include_router(search.router, tags=["search"])
     app.include_router(transcripts.router, tags=["transcripts"])
     app.include_router(playlists.router, tags=["playlists"])
+    app.include_router(corpus.router, tags=["corpus"])
+    app.include_router(export.router, tags=["export"])
+    app.include_router(jobs.router, tags=["jobs"])
+    app.include_router(metrics.router, tags=["system"])
+    app.include_router(admin.router, tags=["system"])
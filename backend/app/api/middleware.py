@@ -0,0 +1,221 @@
+"""ASGI middleware shared by every route."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+from app.models.transcript import split_video_ids
+from app.services.rate_limit import BULK, DEFAULT, SEARCH, Limit
+from app.utils.metrics import HTTP_REQUEST_DURATION
+from app.utils.profiling import SlowRequestLog, end_profile, start_profile
+
+# Bounded label values: anything else collapses into "-" so a client cannot
+# blow up the series count with arbitrary query strings.
+_FORMATS = frozenset({"json", "text", "srt", "vtt", "ndjson"})
+
+
+def _format_label(query_string: bytes) -> str:
+    for pair in query_string.split(b"&"):
+        name, _, value = pair.partition(b"=")
+        if name == b"format":
+            value = value.decode("latin-1")
+            return value if value in _FORMATS else "-"
+    return "-"
+
+
+class MetricsMiddleware:
+    """Record ``http_request_duration_seconds`` for every HTTP request.
+
+    Pure ASGI (no ``BaseHTTPMiddleware``), so streamed bodies are not
+    buffered and the timing covers the last body chunk.  The route label is
+    the matched path template (``/transcripts/{video_id}``), never the raw
+    path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                _format_label(scope.get("query_string", b"")),
+                str(status),
+            )
+
+
+class ProfilingMiddleware:
+    """Profile a ``sample_rate`` share of requests (see `app.utils.profiling`).
+
+    Spans finished before the response starts are listed in its
+    ``Server-Timing`` header; spans of a streamed body arrive too late for
+    the header but are part of what ``slow_log`` records once the body is
+    sent.  Only added to the app when profiling is enabled.
+    """
+
+    def __init__(self, app, slow_log: SlowRequestLog, sample_rate: float = 1.0):
+        self.app = app
+        self.slow_log = slow_log
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+        profile, token = start_profile()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing(profile.elapsed()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_profile(token)
+            self.slow_log.record(profile, profile.elapsed(), scope["method"], scope["path"], status)
+
+
+# Never limited: probes, scrapes and docs.
+_UNLIMITED_PREFIXES = ("/health", "/metrics", "/admin", "/docs", "/redoc", "/openapi.json")
+# Charged per video listed in the JSON body.
+_PER_VIDEO_BODY = {("POST", "/transcripts/bulk"), ("POST", "/export"), ("POST", "/jobs")}
+
+
+async def _buffer_body(receive) -> Tuple[bytes, object]:
+    """Read the whole request body; returns it and a ``receive`` replaying it."""
+    messages: List[dict] = []
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return b"".join(chunks), replay
+
+
+def _key_digest(key: bytes) -> str:
+    return hashlib.sha256(key).hexdigest()
+
+
+class RateLimitMiddleware:
+    """Token buckets per client and route class (see `app.services.rate_limit`).
+
+    Clients are identified by their ``X-API-Key`` header (hashed) when it is
+    one of the configured ``api_keys``, and otherwise by address – an
+    unknown key cannot buy a fresh bucket.  Bulk, export and job submissions are charged one token per
+    unique video in the body and playlist streams a flat ``playlist_cost``;
+    a single request never costs more than a full bucket.  Refused requests
+    get ``429`` with ``Retry-After`` before any routing or upstream work.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter,
+        limits: Dict[str, Limit],
+        playlist_cost: int = 100,
+        trust_forwarded_for: bool = False,
+        api_keys: Iterable[str] = (),
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.limits = limits
+        self.playlist_cost = playlist_cost
+        self.trust_forwarded_for = trust_forwarded_for
+        self._api_keys = {_key_digest(key.encode("latin-1")) for key in api_keys if key}
+
+    def _client(self, scope) -> str:
+        forwarded = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-api-key" and value:
+                digest = _key_digest(value)
+                if digest in self._api_keys:
+                    return "key:" + digest[:24]
+            elif name == b"x-forwarded-for":
+                forwarded = value
+        if forwarded and self.trust_forwarded_for:
+            return "ip:" + forwarded.split(b",", 1)[0].strip().decode("latin-1")
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    def _videos_in(self, body: bytes) -> int:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 1  # the route answers 422
+        if not isinstance(payload, dict):
+            return 1
+        if payload.get("playlist_id"):
+            return self.playlist_cost
+        video_ids = split_video_ids(payload.get("video_ids"))
+        return max(1, len(set(video_ids))) if isinstance(video_ids, list) else 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        if path.startswith(_UNLIMITED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if (method, path) in _PER_VIDEO_BODY:
+            route_class = BULK
+            body, receive = await _buffer_body(receive)
+            cost = self._videos_in(body)
+        elif path.startswith("/playlists/") and path.endswith("/transcripts"):
+            route_class, cost = BULK, self.playlist_cost
+        elif path.startswith("/search"):
+            route_class, cost = SEARCH, 1
+        else:
+            route_class, cost = DEFAULT, 1
+
+        limit = self.limits[route_class]
+        decision = await self.limiter.hit(f"{route_class}:{self._client(scope)}", limit, min(cost, limit.burst))
+        if not decision.allowed:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded, please retry later."},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(decision.retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
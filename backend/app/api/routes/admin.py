@@ -0,0 +1,28 @@
+"""/admin API endpoints – operational introspection."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.core.config import settings
+from app.utils.profiling import get_slow_request_log
+
+router = APIRouter(prefix="/admin")
+
+
+@router.get("/slow-requests")
+async def slow_requests(limit: Optional[int] = Query(None, ge=1, description="Return at most this many")):
+    """Span breakdowns of the slowest recently profiled requests, slowest first.
+
+    Empty unless ``PROFILING_ENABLED`` is set; only requests slower than
+    ``PROFILING_SLOW_MS`` are kept, in a ring buffer of
+    ``PROFILING_SLOW_CAPACITY`` entries.
+    """
+    log = get_slow_request_log()
+    return {
+        "enabled": settings.profiling_enabled,
+        "sample_rate": settings.profiling_sample_rate,
+        "threshold_ms": settings.profiling_slow_ms,
+        "recorded": log.recorded,
+        "requests": log.slowest(limit),
+    }
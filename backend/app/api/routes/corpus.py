@@ -0,0 +1,40 @@
+"""/corpus API endpoint – full-text search over already-fetched transcripts.
+
+Answered entirely from the in-process `CorpusIndex`; segment texts are
+filled in from the transcript cache.  Never contacts YouTube.
+"""
+
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.cache.transcript_cache import TranscriptCache, get_transcript_cache
+from app.models.transcript import CorpusSearchResponse
+from app.services.corpus_index import CorpusIndex, get_corpus_index, tokenize
+
+router = APIRouter(prefix="/corpus")
+
+
+@router.get("/search", response_model=CorpusSearchResponse)
+async def search_corpus(
+    q: str = Query(..., min_length=1, description="Words that must all appear in a segment"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of hits"),
+    per_video: int = Query(3, ge=1, le=50, description="Maximum hits from one video"),
+    index: CorpusIndex = Depends(get_corpus_index),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
+    """Ranked transcript segments matching every word of ``q``."""
+    if not tokenize(q):
+        raise HTTPException(status_code=400, detail="The query contains no searchable words.")
+    started = time.perf_counter()
+    hits = index.search(q, limit=limit, per_video=per_video)
+    took_ms = (time.perf_counter() - started) * 1000
+
+    entries = await cache.get_many(list(dict.fromkeys(hit.video_id for hit in hits)))
+    results = []
+    for hit in hits:
+        entry = entries.get(hit.video_id)
+        transcript = entry.transcript if entry is not None else None
+        text = transcript.text_at(hit.segment) if transcript is not None and hit.segment < len(transcript) else None
+        results.append({**hit.__dict__, "text": text})
+    return {"query": q, "hits": results, "took_ms": round(took_ms, 3)}
@@ -0,0 +1,102 @@
+"""/export API endpoint – streams many transcripts as one ZIP archive."""
+
+import json
+import logging
+import re
+from typing import AsyncIterator, Dict, List
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.api.routes.playlists import playlist_video_pages
+from app.api.routes.transcripts import describe_error
+from app.models.transcript import ExportRequest
+from app.services.formatters import STREAM_FORMATS, render_json_response
+from app.services.transcript_service import BulkItem, TranscriptService, get_transcript_service
+from app.services.youtube_client import YouTubeAPIError, YouTubeClient, get_youtube_client
+from app.services.zip_stream import ZipStream
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/export")
+
+EXTENSIONS = {"json": "json", "text": "txt", "srt": "srt", "vtt": "vtt", "ndjson": "ndjson"}
+MANIFEST_NAME = "manifest.json"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def export_filename(playlist_id: str | None) -> str:
+    """Download name of the archive; safe to quote in ``Content-Disposition``."""
+    name = _UNSAFE_FILENAME_CHARS.sub("_", playlist_id) if playlist_id else "export"
+    return f"transcripts-{name}.zip"
+
+
+def entry_name(video_id: str, extension: str) -> str:
+    """Archive entry of one transcript; never a path, whatever the ID holds."""
+    return f"{_UNSAFE_FILENAME_CHARS.sub('_', video_id) or '_'}.{extension}"
+
+
+def _entry_chunks(item: BulkItem, format: str):
+    if format == "json":
+        return [render_json_response(item.video_id, item.transcript)]
+    stream, _ = STREAM_FORMATS[format]
+    return stream(item.transcript)
+
+
+@router.post("/", response_class=StreamingResponse, responses={
+    200: {
+        "content": {"application/zip": {}},
+        "description": "ZIP archive with one file per transcript and a manifest.json, streamed as it is built.",
+    },
+    404: {"description": "Playlist not found"},
+    503: {"description": "YouTube Data API unavailable or not configured"},
+})
+async def export_transcripts(
+    request: ExportRequest,
+    service: TranscriptService = Depends(get_transcript_service),
+    client: YouTubeClient = Depends(get_youtube_client),
+):
+    """
+    Download the transcripts of many videos (or of a playlist) as a ZIP.
+
+    Each ``<video_id>.<ext>`` entry is written as soon as its transcript is
+    ready; the archive ends with ``manifest.json`` listing the exported
+    videos' count and every failure with its status code.  Nothing is
+    buffered beyond the chunk being written, so memory stays flat however
+    many videos are exported.
+    """
+    source = request.playlist_id or f"{len(request.video_ids)} video IDs"
+    logger.info("Export request: %s, format='%s'", source, request.format)
+    if request.playlist_id is not None:
+        items = service.stream_many(await playlist_video_pages(client, request.playlist_id))
+    else:
+        items = service.get_many(request.video_ids)
+    extension = EXTENSIONS[request.format]
+
+    async def archive() -> AsyncIterator[bytes]:
+        zip_stream = ZipStream()
+        failures: List[Dict] = []
+        manifest = {"format": request.format, "playlist_id": request.playlist_id, "exported": 0, "failed": failures}
+        try:
+            async for item in items:
+                if item.error is not None:
+                    status_code, detail = describe_error(item.error)
+                    failures.append({"video_id": item.video_id, "status_code": status_code, "detail": detail})
+                    continue
+                for data in zip_stream.add(entry_name(item.video_id, extension), _entry_chunks(item, request.format)):
+                    yield data
+                manifest["exported"] += 1
+        except YouTubeAPIError as exc:
+            logger.warning("Listing playlist %s failed mid-export: %s", request.playlist_id, exc)
+            manifest["aborted"] = f"Playlist listing aborted: {exc.message}"
+        body = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+        for data in zip_stream.add(MANIFEST_NAME, [body]):
+            yield data
+        for data in zip_stream.finish():
+            yield data
+
+    return StreamingResponse(
+        archive(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(request.playlist_id)}"'},
+    )
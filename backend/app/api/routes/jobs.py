@@ -0,0 +1,108 @@
+"""/jobs API endpoints – background bulk and playlist transcript jobs.
+
+Submitting returns at once with a job ID; the work is done by the worker
+pool of `app.services.jobs`.  Progress can be polled (``GET /jobs/{id}``)
+or followed as Server-Sent Events, and results are read in pages of the
+same per-video records the bulk endpoint streams.
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, List
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.models.job import JobRequest, JobStatus
+from app.services.jobs import TERMINAL, JobNotFound, JobStore, get_job_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs")
+
+
+def _not_found(job_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"No job with ID {job_id}.")
+
+
+def results_page(job_id: str, offset: int, records: List[bytes]) -> bytes:
+    """Body of ``GET /jobs/{id}/results``; stored records are embedded verbatim."""
+    head = json.dumps({"job_id": job_id, "offset": offset, "next_offset": offset + len(records)})
+    return head[:-1].encode("utf-8") + b',"items":[' + b",".join(records) + b"]}"
+
+
+@router.post("/", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(request: JobRequest, store: JobStore = Depends(get_job_store)):
+    """Queue a job for ``video_ids`` or every video of ``playlist_id``."""
+    job = await store.submit(request.format, video_ids=request.video_ids, playlist_id=request.playlist_id)
+    logger.info("Queued %s job %s (%s videos)", job.kind, job.job_id, job.total if job.total is not None else "?")
+    return job.public()
+
+
+@router.get("/{job_id}", response_model=JobStatus, responses={404: {"description": "Unknown or expired job"}})
+async def get_job(job_id: str = Path(...), store: JobStore = Depends(get_job_store)):
+    """Current status and progress counters of a job."""
+    try:
+        return (await store.get(job_id)).public()
+    except JobNotFound:
+        raise _not_found(job_id)
+
+
+@router.delete("/{job_id}", response_model=JobStatus, responses={404: {"description": "Unknown or expired job"}})
+async def cancel_job(job_id: str = Path(...), store: JobStore = Depends(get_job_store)):
+    """Cancel a job; results produced so far stay available."""
+    try:
+        return (await store.cancel(job_id)).public()
+    except JobNotFound:
+        raise _not_found(job_id)
+
+
+@router.get("/{job_id}/results", responses={
+    200: {"content": {"application/json": {}}, "description": "One page of per-video records"},
+    404: {"description": "Unknown or expired job"},
+})
+async def get_job_results(
+    job_id: str = Path(...),
+    offset: int = Query(0, ge=0, description="Index of the first record"),
+    limit: int = Query(100, ge=1, le=1000, description="Records per page"),
+    store: JobStore = Depends(get_job_store),
+):
+    """Records produced so far, in processing order; continue from ``next_offset``."""
+    try:
+        await store.get(job_id)
+    except JobNotFound:
+        raise _not_found(job_id)
+    records = await store.results(job_id, offset, limit)
+    return Response(content=results_page(job_id, offset, records), media_type="application/json")
+
+
+@router.get("/{job_id}/events", response_class=StreamingResponse, responses={
+    200: {"content": {"text/event-stream": {}}, "description": "A progress event per checkpoint, until the job ends"},
+    404: {"description": "Unknown or expired job"},
+})
+async def job_events(job_id: str = Path(...), store: JobStore = Depends(get_job_store)):
+    """Follow a job's progress as Server-Sent Events."""
+    try:
+        job = await store.get(job_id)
+    except JobNotFound:
+        raise _not_found(job_id)
+
+    async def events() -> AsyncIterator[bytes]:
+        current, last = job, None
+        while True:
+            snapshot = current.public()
+            if snapshot != last:
+                event = "done" if current.status in TERMINAL else "progress"
+                yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n".encode("utf-8")
+                last = snapshot
+            if current.status in TERMINAL:
+                return
+            await asyncio.sleep(settings.job_poll_interval_seconds)
+            try:
+                current = await store.get(job_id)
+            except JobNotFound:
+                return
+
+    return StreamingResponse(events(), media_type="text/event-stream")
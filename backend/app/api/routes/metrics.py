@@ -0,0 +1,91 @@
+"""/metrics API endpoint – Prometheus text exposition."""
+
+from typing import Any, Dict, Iterator
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.cache.search_cache import get_search_cache
+from app.cache.transcript_cache import get_transcript_cache
+from app.core.config import settings
+from app.services.rate_limit import get_rate_limiter
+from app.services.upstream import get_upstream_executor
+from app.services.youtube_client import get_youtube_client
+from app.utils.logger import logging_stats
+from app.utils.metrics import CONTENT_TYPE, REGISTRY, Family
+
+router = APIRouter()
+
+_LANE_GAUGES = ("limit", "in_flight", "queued")
+_LANE_COUNTERS = ("completed", "rejected", "timeouts", "failures")
+
+
+def _tier_samples(cache: str, stats: Dict[str, Any]):
+    for tier in ("l1", "l2", "archive"):
+        counters = stats.get(tier)
+        if not counters:
+            continue
+        yield {"cache": cache, "tier": tier, "result": "hit"}, counters["hits"]
+        yield {"cache": cache, "tier": tier, "result": "miss"}, counters["misses"]
+
+
+@REGISTRY.collector
+def collect_caches() -> Iterator[Family]:
+    transcripts = get_transcript_cache().stats()
+    searches = get_search_cache().stats()
+    yield (
+        "cache_lookups_total", "counter", "Cache lookups per cache, tier and result",
+        [*_tier_samples("transcripts", transcripts), *_tier_samples("search", searches)],
+    )
+    yield (
+        "cache_errors_total", "counter", "Failed cache backend calls",
+        [({"cache": "transcripts", "tier": "l2"}, transcripts["l2"]["errors"]),
+         ({"cache": "search", "tier": "l2"}, searches["l2"]["errors"])],
+    )
+    yield (
+        "cache_l1_bytes", "gauge", "Bytes held by the in-process cache tier",
+        [({"cache": "transcripts"}, transcripts["l1"]["bytes"]), ({"cache": "search"}, searches["l1"]["bytes"])],
+    )
+
+
+@REGISTRY.collector
+def collect_upstream() -> Iterator[Family]:
+    lanes = get_upstream_executor().stats()
+    for field in _LANE_GAUGES:
+        yield (
+            f"upstream_{field}", "gauge", f"Upstream executor lane {field.replace('_', ' ')}",
+            [({"upstream": name}, lane[field]) for name, lane in lanes.items()],
+        )
+    for field in _LANE_COUNTERS:
+        yield (
+            f"upstream_{field}_total", "counter", f"Upstream executor calls {field}",
+            [({"upstream": name}, lane[field]) for name, lane in lanes.items()],
+        )
+
+
+@REGISTRY.collector
+def collect_quota() -> Iterator[Family]:
+    quota = get_youtube_client().quota.snapshot()
+    yield "youtube_quota_used", "gauge", "YouTube Data API units spent today", [({}, quota["used"])]
+    yield "youtube_quota_remaining", "gauge", "YouTube Data API units left today", [({}, quota["remaining"])]
+
+
+@REGISTRY.collector
+def collect_logging() -> Iterator[Family]:
+    stats = logging_stats()
+    yield "log_records_queued", "gauge", "Log records waiting for the writer thread", [({}, stats["queued"])]
+    yield "log_records_dropped_total", "counter", "Log records dropped on a full queue", [({}, stats["dropped"])]
+    yield "log_records_sampled_out_total", "counter", "INFO/DEBUG log records skipped by sampling", [({}, stats["sampled_out"])]
+
+
+@REGISTRY.collector
+def collect_rate_limits() -> Iterator[Family]:
+    if settings.rate_limit_enabled:
+        refused = get_rate_limiter().stats()["refused"]
+        yield "rate_limit_refused_total", "counter", "Requests refused with 429", [({}, refused)]
+
+
+@router.get("/metrics", response_class=Response, include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
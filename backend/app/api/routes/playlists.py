@@ -1,15 +1,97 @@
-"""/playlists/{playlist_id}/transcripts endpoint (placeholder)."""
+"""/playlists/{playlist_id}/transcripts endpoint – streams a playlist's transcripts."""
 
-from fastapi import APIRouter, HTTPException, status
+import json
+import logging
+from typing import AsyncIterator, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.routes.transcripts import bulk_record
+from app.services.transcript_service import TranscriptService, get_transcript_service
+from app.services.youtube_client import YouTubeAPIError, YouTubeClient, get_youtube_client
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/playlists")
 
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _encode(record: bytes, stream: str, event: str = "transcript") -> bytes:
+    if stream == "sse":
+        return b"event: " + event.encode("ascii") + b"\ndata: " + record + b"\n\n"
+    return record + b"\n"
+
+
+def _json(record: Dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+async def playlist_video_pages(client: YouTubeClient, playlist_id: str) -> AsyncIterator[List[str]]:
+    """Pages of the playlist's video IDs, with the first page listed eagerly.
+
+    Listing it up front makes unknown playlists or API problems surface as a
+    proper HTTP status (404 / 503) instead of a broken stream; later pages
+    are listed lazily and may still raise `YouTubeAPIError` mid-stream.
+    """
+    pages = client.playlist_pages(playlist_id)
+    try:
+        first_page = await pages.__anext__()
+    except StopAsyncIteration:
+        first_page = []
+    except YouTubeAPIError as exc:
+        logger.warning("Listing playlist %s failed: %s", playlist_id, exc)
+        if exc.status_code == status.HTTP_404_NOT_FOUND:
+            raise HTTPException(status_code=404, detail="Playlist not found.")
+        raise HTTPException(status_code=503, detail=f"YouTube Data API unavailable: {exc.message}")
+
+    async def all_pages() -> AsyncIterator[List[str]]:
+        yield first_page
+        async for page in pages:
+            yield page
+
+    return all_pages()
+
+
+@router.get("/{playlist_id}/transcripts", response_class=StreamingResponse, responses={
+    200: {
+        "content": {"application/x-ndjson": {}, "text/event-stream": {}},
+        "description": "One record per playlist video, streamed as each transcript completes.",
+    },
+    404: {"description": "Playlist not found"},
+    503: {"description": "YouTube Data API unavailable or not configured"},
+})
+async def playlist_transcripts(
+    playlist_id: str = Path(..., description="The YouTube playlist ID"),
+    format: str = Query("json", pattern="^(json|text)$", description="Format of each transcript (json or text)"),
+    stream: str = Query("ndjson", pattern="^(ndjson|sse)$", description="Streaming encoding (ndjson or sse)"),
+    service: TranscriptService = Depends(get_transcript_service),
+    client: YouTubeClient = Depends(get_youtube_client),
+):  # noqa: D401
+    """Stream transcripts for all videos in a playlist.
+
+    Playlist pages are listed while transcripts of earlier pages are being
+    fetched, so the first records arrive after roughly one listing call plus
+    one transcript fetch, independent of the playlist length.  Each record
+    carries a per-video ``status``; with ``stream=sse`` a final ``done`` event
+    summarises the run.
+    """
+    logger.info("Playlist transcript request: playlist_id='%s', format='%s'", playlist_id, format)
+
+    pages = await playlist_video_pages(client, playlist_id)
 
-@router.get("/{playlist_id}/transcripts")
-async def playlist_transcripts(playlist_id: str):  # noqa: D401
-    """Fetch transcripts for all videos in a playlist (stub)."""
+    async def records() -> AsyncIterator[bytes]:
+        counts = {"ok": 0, "error": 0}
+        try:
+            async for item in service.stream_many(pages):
+                counts["ok" if item.error is None else "error"] += 1
+                yield _encode(bulk_record(item, format), stream)
+        except YouTubeAPIError as exc:
+            logger.warning("Listing playlist %s failed mid-stream: %s", playlist_id, exc)
+            yield _encode(_json({"status": "error", "detail": f"Playlist listing aborted: {exc.message}"}), stream, "error")
+            return
+        if stream == "sse":
+            yield _encode(_json({"playlist_id": playlist_id, **counts}), stream, "done")
 
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Playlist transcript endpoint not yet implemented.",
-    )
+    return StreamingResponse(records(), media_type=_MEDIA_TYPES[stream])
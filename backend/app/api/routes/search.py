@@ -1,25 +1,41 @@
-"""/search API endpoint – proxies to the YouTube Data API (placeholder).
+"""/search API endpoint – proxies to the YouTube Data API.
 
-Actual implementation will:
-1. Validate query params (`q`, `maxResults`, ...).
-2. Call the YouTube Data API using the key from settings.
-3. Return a filtered JSON response with essential video metadata.
-
-For the repository bootstrap we merely return a `501 Not Implemented` stub so
-that the OpenAPI schema is generated and clients are aware of the endpoint.
+Validates the query parameters, answers from the search cache when an
+equivalent search was made recently and otherwise calls ``search.list``
+(100 quota units) through the shared `YouTubeClient`.  Returns a compact
+JSON list of video metadata.
 """
 
-from fastapi import APIRouter, HTTPException, Query, status
+import logging
+from typing import Optional
 
-router = APIRouter(prefix="/search")
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models.video import SearchResponse
+from app.services.search_service import SearchService, get_search_service
+from app.services.youtube_client import MAX_PAGE_SIZE, YouTubeAPIError
 
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search")
 
-@router.get("/")
-async def search_videos(q: str = Query(..., description="Search query")):
-    """Search YouTube videos by keyword (stub)."""
 
-    # TODO: Replace with real implementation
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Search endpoint not yet implemented.",
-    )
+@router.get("/", response_model=SearchResponse, responses={
+    400: {"description": "Rejected by the YouTube Data API"},
+    503: {"description": "YouTube Data API unavailable, out of quota or not configured"},
+})
+async def search_videos(
+    q: str = Query(..., min_length=1, description="Search query"),
+    max_results: int = Query(25, alias="maxResults", ge=1, le=MAX_PAGE_SIZE, description="Results per page"),
+    page_token: Optional[str] = Query(None, alias="pageToken", description="Token of the page to return"),
+    service: SearchService = Depends(get_search_service),
+):
+    """Search YouTube videos by keyword."""
+    try:
+        page = await service.search(q, max_results=max_results, page_token=page_token)
+    except YouTubeAPIError as exc:
+        logger.warning("Search for %r failed: %s", q, exc)
+        if exc.status_code == 400:
+            raise HTTPException(status_code=400, detail=exc.message)
+        raise HTTPException(status_code=503, detail="YouTube Data API unavailable.", headers={"Retry-After": "1"})
+    return {"query": q, **page}
@@ -1,17 +1,34 @@
 """/transcripts API endpoint – fetches transcripts for a video."""
 
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import json
 import logging # For logging actual errors
+import math
 
-from fastapi import APIRouter, HTTPException, Query, Path, Response
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
+from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, TooManyRequests
 # Explicitly alias NoTranscriptFound from the library
 from youtube_transcript_api import NoTranscriptFound as YTNoTranscriptFound
-from youtube_transcript_api.formatters import JSONFormatter, TextFormatter
 
 # Pydantic Models
 from pydantic import BaseModel
 
+from app.models.compact import CompactTranscript
+from app.models.tracks import Selection
+from app.models.transcript import BulkTranscriptRequest, TranscriptSearchResponse, TranscriptTracksResponse
+from app.services.formatters import STREAM_FORMATS, render_json_response, render_ok_record
+from app.services.transcript_service import (
+    BulkItem,
+    TranscriptNotFound,
+    TranscriptService,
+    get_transcript_service,
+)
+from app.services.http_cache import ENCODINGS, choose_encoding, etag, matching_etag
+from app.services.transcript_search import find_phrase, phrase_pattern
+from app.services.upstream import UpstreamOverloaded, UpstreamTimeout
+from app.utils.profiling import timed_chunks
+
 logger = logging.getLogger(__name__)
 
 class TranscriptSegment(BaseModel):
@@ -30,68 +47,299 @@ router = APIRouter(prefix="/transcripts")
     200: {
         "content": {
             "application/json": {},
-            "text/plain": {}
+            "text/plain": {},
+            "application/x-subrip": {},
+            "text/vtt": {},
+            "application/x-ndjson": {},
         },
         "description": "Successfully retrieved transcript.",
     },
+    304: {"description": "Not modified (``If-None-Match`` matches the ETag)"},
+    400: {"description": "Invalid time window"},
     404: {"description": "Transcript not found or disabled"},
     500: {"description": "Internal server error"},
+    503: {"description": "Upstream overloaded, retry later"},
+    504: {"description": "Upstream did not answer in time"},
 })
 async def get_transcript_by_video_id(
+    request: Request,
     video_id: str = Path(..., description="The YouTube video ID"),
-    format: str = Query("json", pattern="^(json|text)$", description="Format of the transcript (json or text)"),
+    format: str = Query(
+        "json",
+        pattern="^(json|text|srt|vtt|ndjson)$",
+        description="Format of the transcript (json, text, srt, vtt or ndjson)",
+    ),
+    language: Optional[str] = Query(
+        None,
+        pattern=r"^[A-Za-z0-9-]+(,[A-Za-z0-9-]+)*$",
+        description="Comma-separated language codes in order of preference (default: any)",
+    ),
+    prefer: str = Query("manual", pattern="^(manual|generated)$", description="Track kind to try first"),
+    start: Optional[float] = Query(None, ge=0, description="Only segments from this time on (seconds)"),
+    end: Optional[float] = Query(None, gt=0, description="Only segments starting before this time (seconds)"),
+    service: TranscriptService = Depends(get_transcript_service),
 ):
     """
     Retrieve transcript for a given YouTube video ID.
+
+    ``start`` / ``end`` return only the segments overlapping that window.
+
+    Responses carry a content-hash ``ETag`` (one per content-coding); a
+    matching ``If-None-Match`` gets ``304 Not Modified`` from the cached
+    digest, without the transcript being loaded or rendered.  Whole
+    transcripts are served precompressed when the client accepts it.
     """
-    logger.info(f"Request for transcript: video_id='{video_id}', format='{format}'")
+    logger.info("Request for transcript: video_id='%s', format='%s', language='%s'", video_id, format, language)
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="'end' must be greater than 'start'.")
+    selection = Selection(tuple(language.split(",")) if language else (), prefer)
+    windowed = start is not None or end is not None
+    if_none_match = request.headers.get("if-none-match")
     try:
-        # This call itself can raise TranscriptsDisabled or other specific errors for invalid video IDs.
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        transcript_to_fetch = None
-        try:
-            # Attempt to find a manually created transcript first
-            transcript_to_fetch = transcript_list.find_manually_created_transcript()
-        except YTNoTranscriptFound:
-            logger.info(f"No manually created transcript found for video ID: {video_id}. Trying generated.")
-            try:
-                # If no manual transcript, try to find a generated one
-                transcript_to_fetch = transcript_list.find_generated_transcript()
-            except YTNoTranscriptFound:
-                logger.warning(f"No transcript found (manual or generated) for video ID: {video_id}")
-                raise HTTPException(status_code=404, detail="No transcript found for this video.")
-        
-        if transcript_to_fetch: # Check if a transcript object was actually found
-            logger.info(f"Transcript found (type: {'manual' if transcript_to_fetch.is_manually_created else 'generated'}) for video_id='{video_id}'")
-        else: # Should ideally not be reached if previous logic is correct
-            logger.error(f"Transcript object (transcript_to_fetch) is None for video ID: {video_id} before fetching. This indicates a logic flaw.")
-            raise HTTPException(status_code=500, detail="Internal server error: transcript object not found before fetch.")
-
-        fetched_transcript_segments = transcript_to_fetch.fetch()
+        if if_none_match:
+            # Answered from the cached digest record alone: the transcript is
+            # neither loaded nor decoded, let alone rendered.
+            digest = await service.digest(video_id, selection)
+            if digest is not None:
+                response = not_modified_response(if_none_match, digest, format, start, end)
+                if response is not None:
+                    return response
+
+        # Served from the transcript cache when possible; otherwise
+        # `list_transcripts()` and `fetch()` run in the upstream executor, so a
+        # slow YouTube answer only occupies a worker thread, not the event loop.
+        transcript = await service.get(video_id, selection)
+        response = not_modified_response(if_none_match, transcript.digest, format, start, end)
+        if response is not None:
+            return response
+        tags = representation_etags(transcript.digest, format, start, end)
+        headers = {"ETag": tags[None]}
+
+        if windowed:
+            # Two binary searches over the cached start times; only the
+            # segments inside the window are copied and rendered.
+            part = transcript.slice(start, end)
+            if format == "json":
+                return Response(
+                    content=render_json_response(video_id, part), media_type="application/json", headers=headers
+                )
+            return stream_response(part, format, headers)
+
+        headers["Vary"] = "Accept-Encoding"
+        media_type = "application/json" if format == "json" else STREAM_FORMATS[format][1]
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            body = service.encoded_body(video_id, transcript, selection, format, encoding)
+            if body is not None:
+                headers["Content-Encoding"] = encoding
+                headers["ETag"] = tags[encoding]
+                return Response(content=body, media_type=media_type, headers=headers)
 
         if format == "json":
-            formatter = JSONFormatter()
-            # The library's JSONFormatter returns a JSON string.
-            # We need to parse it to fit our Pydantic model structure.
-            formatted_transcript_str = formatter.format_transcript(fetched_transcript_segments)
-            import json # Ensure json is imported
-            parsed_segments = json.loads(formatted_transcript_str)
-            return TranscriptResponse(video_id=video_id, transcript=parsed_segments)
-        
-        elif format == "text":
-            formatter = TextFormatter()
-            formatted_transcript_text = formatter.format_transcript(fetched_transcript_segments)
-            return Response(content=formatted_transcript_text, media_type="text/plain")
+            # Rendered straight from the compact cached form (or returned as
+            # stored bytes for hot videos), keeping the `TranscriptResponse`
+            # schema without re-validating every segment through Pydantic.
+            body = service.rendered_body(video_id, transcript, selection, format)
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        # text / srt / vtt / ndjson are streamed in chunks as they are rendered
+        return stream_response(transcript, format, headers)
 
+    except TranscriptNotFound:
+        logger.warning("No transcript found (manual or generated) for video ID: %s", video_id)
+        raise HTTPException(status_code=404, detail="No transcript found for this video.")
     except TranscriptsDisabled:
-        logger.warning(f"Transcripts disabled for video ID: {video_id}")
+        logger.warning("Transcripts disabled for video ID: %s", video_id)
         raise HTTPException(status_code=404, detail="Transcripts are disabled for this video.")
-    except YTNoTranscriptFound: 
-        logger.warning(f"A NoTranscriptFound exception was caught at an outer level for video ID: {video_id}")
+    except YTNoTranscriptFound:
+        logger.warning("A NoTranscriptFound exception was caught at an outer level for video ID: %s", video_id)
         raise HTTPException(status_code=404, detail="No transcript available for this video (outer catch).")
+    except UpstreamOverloaded as exc:
+        logger.warning("Rejecting transcript request for video ID %s: %s", video_id, exc)
+        raise HTTPException(
+            status_code=503,
+            detail="Upstream is overloaded, please retry later.",
+            headers={"Retry-After": retry_after(exc)},
+        )
+    except TooManyRequests:
+        logger.warning("YouTube is rate limiting transcript requests (video ID %s)", video_id)
+        raise HTTPException(
+            status_code=503,
+            detail="YouTube is rate limiting requests, please retry later.",
+            headers={"Retry-After": retry_after(None)},
+        )
+    except UpstreamTimeout as exc:
+        logger.warning("Upstream timeout for video ID %s: %s", video_id, exc)
+        raise HTTPException(status_code=504, detail="Upstream did not answer in time.")
     except HTTPException as http_exc: # Explicitly re-raise HTTPException
         raise http_exc
     except Exception as e:
-        logger.exception(f"An unexpected error occurred while fetching transcript for video ID {video_id}: {e}")
+        logger.exception("An unexpected error occurred while fetching transcript for video ID %s: %s", video_id, e)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+
+@router.get("/{video_id}/tracks", response_model=TranscriptTracksResponse, responses={
+    404: {"description": "Transcripts disabled or none available"},
+    503: {"description": "Upstream overloaded, retry later"},
+    504: {"description": "Upstream did not answer in time"},
+})
+async def get_transcript_tracks(
+    video_id: str = Path(..., description="The YouTube video ID"),
+    service: TranscriptService = Depends(get_transcript_service),
+):
+    """
+    List the caption tracks (languages, manual/generated, translatable) of a video.
+
+    Served from cache for any video whose transcript was requested before.
+    """
+    try:
+        tracks = await service.get_tracks(video_id)
+    except Exception as exc:
+        status_code, detail = describe_error(exc)
+        if status_code == 500:
+            logger.exception("Unexpected error while listing tracks for video ID %s", video_id)
+        headers = {"Retry-After": retry_after(exc)} if status_code == 503 else None
+        raise HTTPException(status_code=status_code, detail=detail, headers=headers)
+    return {"video_id": video_id, "tracks": [track.public() for track in tracks]}
+
+
+@router.get("/{video_id}/search", response_model=TranscriptSearchResponse, responses={
+    400: {"description": "The query contains no words"},
+    404: {"description": "Transcript not found or disabled"},
+    503: {"description": "Upstream overloaded, retry later"},
+    504: {"description": "Upstream did not answer in time"},
+})
+async def search_transcript(
+    video_id: str = Path(..., description="The YouTube video ID"),
+    q: str = Query(..., min_length=1, description="Phrase to look for (case-insensitive)"),
+    context: int = Query(1, ge=0, le=10, description="Segments of context on each side of a match"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of matches"),
+    service: TranscriptService = Depends(get_transcript_service),
+):
+    """
+    Find where a phrase is said in a video, with timestamps and context.
+
+    Searches the cached transcript (fetching it first if needed).
+    """
+    if phrase_pattern(q) is None:
+        raise HTTPException(status_code=400, detail="The query contains no searchable words.")
+    try:
+        transcript = await service.get(video_id)
+    except Exception as exc:
+        status_code, detail = describe_error(exc)
+        if status_code == 500:
+            logger.exception("Unexpected error while searching the transcript of video ID %s", video_id)
+        headers = {"Retry-After": retry_after(exc)} if status_code == 503 else None
+        raise HTTPException(status_code=status_code, detail=detail, headers=headers)
+
+    matches = []
+    for match in find_phrase(transcript, q, limit=limit):
+        first, last = max(0, match.first - context), min(len(transcript), match.last + 1 + context)
+        matches.append({
+            "start": transcript.starts_ms[match.first] / 1000,
+            "end": (transcript.starts_ms[match.last] + transcript.durations_ms[match.last]) / 1000,
+            "text": " ".join(transcript.text_at(i) for i in range(match.first, match.last + 1)),
+            "context": [
+                {"text": transcript.text_at(i), "start": transcript.starts_ms[i] / 1000,
+                 "duration": transcript.durations_ms[i] / 1000}
+                for i in range(first, last)
+            ],
+        })
+    return {"video_id": video_id, "query": q, "matches": matches}
+
+
+def representation_etags(
+    digest: str, format: str, start: Optional[float], end: Optional[float]
+) -> Dict[Optional[str], str]:
+    """ETag of every variant of a transcript response, keyed by content-coding.
+
+    Strong validators must differ between content-codings (RFC 9110), so
+    each precompressed variant gets its own tag; time windows are only
+    served uncompressed.
+    """
+    if start is not None or end is not None:
+        return {None: etag(digest, format, start, end)}
+    tags: Dict[Optional[str], str] = {None: etag(digest, format)}
+    for encoding in ENCODINGS:
+        tags[encoding] = etag(digest, format, encoding)
+    return tags
+
+
+def not_modified_response(
+    if_none_match: Optional[str], digest: str, format: str, start: Optional[float], end: Optional[float]
+) -> Optional[Response]:
+    """304 carrying the variant tag ``If-None-Match`` matched, or ``None``."""
+    matched = matching_etag(if_none_match, list(representation_etags(digest, format, start, end).values()))
+    if matched is None:
+        return None
+    headers = {"ETag": matched}
+    if start is None and end is None:
+        headers["Vary"] = "Accept-Encoding"
+    return Response(status_code=304, headers=headers)
+
+
+def stream_response(
+    transcript: CompactTranscript, format: str, headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """Stream ``transcript`` in one of the `STREAM_FORMATS`."""
+    stream, media_type = STREAM_FORMATS[format]
+    return StreamingResponse(
+        timed_chunks(f"render.{format}", stream(transcript)), media_type=media_type, headers=headers
+    )
+
+
+def retry_after(exc: Optional[BaseException]) -> str:
+    """``Retry-After`` value (whole seconds) for a 503 caused by ``exc``."""
+    return str(max(1, math.ceil(getattr(exc, "retry_after", 1))))
+
+
+def describe_error(exc: BaseException) -> Tuple[int, str]:
+    """Map a fetch error to the status code / detail the single route would use."""
+    if isinstance(exc, TranscriptNotFound):
+        return 404, "No transcript found for this video."
+    if isinstance(exc, TranscriptsDisabled):
+        return 404, "Transcripts are disabled for this video."
+    if isinstance(exc, YTNoTranscriptFound):
+        return 404, "No transcript available for this video."
+    if isinstance(exc, UpstreamOverloaded):
+        return 503, "Upstream is overloaded, please retry later."
+    if isinstance(exc, TooManyRequests):
+        return 503, "YouTube is rate limiting requests, please retry later."
+    if isinstance(exc, UpstreamTimeout):
+        return 504, "Upstream did not answer in time."
+    return 500, f"An unexpected error occurred: {exc}"
+
+
+def bulk_record(item: BulkItem, format: str) -> bytes:
+    """Per-video JSON record shared by the bulk and playlist streams."""
+    if item.error is None:
+        return render_ok_record(item.video_id, item.transcript, format)
+    status_code, detail = describe_error(item.error)
+    record = {"video_id": item.video_id, "status": "error", "status_code": status_code, "detail": detail}
+    return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+@router.post("/bulk", response_class=StreamingResponse, responses={
+    200: {
+        "content": {"application/x-ndjson": {}},
+        "description": "One JSON object per unique video ID, streamed as each completes.",
+    },
+})
+async def get_transcripts_bulk(
+    request: BulkTranscriptRequest,
+    service: TranscriptService = Depends(get_transcript_service),
+):
+    """
+    Retrieve transcripts for many video IDs at once, streamed as NDJSON.
+
+    Duplicate IDs are collapsed, cached transcripts are returned first and the
+    rest are fetched concurrently.  Per-video failures are reported inline
+    with ``status: "error"`` and never abort the stream.
+    """
+    logger.info("Bulk transcript request: %d video IDs, format='%s'", len(request.video_ids), request.format)
+
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        async for item in service.get_many(request.video_ids):
+            yield bulk_record(item, request.format) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,141 @@
+"""Persistent cold-storage tier for transcripts (embedded SQLite).
+
+Redis entries expire after ``cache_ttl_seconds`` plus the stale window and
+vanish on a flush or restart, yet transcripts almost never change.  The
+archive keeps every fetched transcript on local disk, keyed like the Redis
+entry and storing the very same payload (`CacheEntry` envelope + compressed
+`CompactTranscript`), so a hit costs one indexed lookup and no re-encoding.
+
+The table is ``WITHOUT ROWID`` on the key with journal mode WAL, so reads do
+not block the writer.  sqlite3 calls block, so the async methods run them on
+the default thread pool; one connection is shared behind a lock.
+
+Entries older than ``archive_max_age_seconds`` are never served again, so
+`prune_periodically` deletes them at start-up and then every
+``archive_prune_interval_seconds``; SQLite reuses the freed pages, which
+keeps the file from growing without bound.
+
+Like Redis, the archive is an optimisation: errors are logged, counted and
+treated as misses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    key        TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    payload    BLOB NOT NULL
+) WITHOUT ROWID
+"""
+
+# Stay well below SQLite's bound-parameter limit.
+_MAX_KEYS_PER_QUERY = 500
+
+
+class TranscriptArchive:
+    """Key → (fetched_at, payload) store in an SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.pruned = 0
+        self.errors = 0
+
+    # --- blocking API --------------------------------------------------------
+    def get_many_blocking(self, keys: List[str]) -> Dict[str, Tuple[float, bytes]]:
+        found: Dict[str, Tuple[float, bytes]] = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_KEYS_PER_QUERY):
+                chunk = keys[i:i + _MAX_KEYS_PER_QUERY]
+                rows = self._conn.execute(
+                    f"SELECT key, fetched_at, payload FROM transcripts WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update((key, (fetched_at, payload)) for key, fetched_at, payload in rows)
+        return found
+
+    def put_blocking(self, key: str, fetched_at: float, payload: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, fetched_at, payload) VALUES (?, ?, ?)",
+                (key, fetched_at, payload),
+            )
+
+    def prune_blocking(self, older_than: float) -> int:
+        """Delete entries fetched before ``older_than`` (unix seconds)."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM transcripts WHERE fetched_at < ?", (older_than,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- async API -----------------------------------------------------------
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Payloads of the archived subset of ``keys``."""
+        if not keys:
+            return {}
+        try:
+            rows = await asyncio.to_thread(self.get_many_blocking, keys)
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning("Archive read failed for %d keys: %s", len(keys), exc)
+            return {}
+        self.hits += len(rows)
+        self.misses += len(keys) - len(rows)
+        return {key: payload for key, (_, payload) in rows.items()}
+
+    async def put(self, key: str, fetched_at: float, payload: bytes) -> None:
+        try:
+            await asyncio.to_thread(self.put_blocking, key, fetched_at, payload)
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning("Archive write failed for %s: %s", key, exc)
+            return
+        self.writes += 1
+
+    async def prune(self, max_age_seconds: float) -> int:
+        """Delete entries fetched more than ``max_age_seconds`` ago; returns how many."""
+        try:
+            deleted = await asyncio.to_thread(self.prune_blocking, time.time() - max_age_seconds)
+        except sqlite3.Error as exc:
+            self.errors += 1
+            logger.warning("Archive prune failed: %s", exc)
+            return 0
+        self.pruned += deleted
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "pruned": self.pruned,
+            "errors": self.errors,
+        }
+
+
+async def prune_periodically(archive: TranscriptArchive, max_age_seconds: float, interval_seconds: float) -> None:
+    """Prune ``archive`` now and then every ``interval_seconds``, until cancelled."""
+    while True:
+        deleted = await archive.prune(max_age_seconds)
+        if deleted:
+            logger.info("Pruned %d archived transcripts older than %ds", deleted, max_age_seconds)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,223 @@
+"""In-process stand-in for the subset of `redis.asyncio` we use.
+
+Selected by `RedisCache` when ``REDIS_URL`` uses the ``memory://`` scheme.
+Useful for single-process deployments without a Redis container and for the
+test-suite.  Values live in a plain dict; expiry is evaluated lazily.
+
+Besides strings it covers the hash and list commands the job queue uses
+(see `app.services.jobs`) and a `pipeline` whose queued commands run
+back-to-back – trivially atomic, since nothing else runs in between.  For
+the same reason ``WATCH`` never fails: after `LocalPipeline.watch` commands
+run immediately, as with redis-py, until `LocalPipeline.multi`.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+def _bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return str(value).encode("utf-8")
+
+
+class LocalRedis:
+    """Tiny async, dict-backed subset of the redis-py client API."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    # --- helpers -----------------------------------------------------------
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _container(self, key: str, factory: type) -> Any:
+        value = self._live(key)
+        if value is None:
+            value = factory()
+            self._data[key] = (value, None)
+        elif not isinstance(value, factory):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _existing(self, key: str, factory: type) -> Any:
+        value = self._live(key)
+        if value is not None and not isinstance(value, factory):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _drop_if_empty(self, key: str, value: Any) -> None:
+        if not value:
+            self._data.pop(key, None)
+
+    # --- string commands ---------------------------------------------------
+    async def get(self, key: str) -> Optional[Any]:
+        return self._live(key)
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        # Like redis-py with ``decode_responses=False``: values read back as bytes.
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (value, expires_at)
+        return True
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        return [self._live(key) for key in keys]
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        value = self._live(key)
+        if value is None:
+            return False
+        self._data[key] = (value, time.monotonic() + seconds)
+        return True
+
+    # --- hash commands -----------------------------------------------------
+    async def hset(self, key: str, field: Optional[str] = None, value: Any = None,
+                   mapping: Optional[Dict[str, Any]] = None) -> int:
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        hash_ = self._container(key, dict)
+        added = sum(1 for name in items if _bytes(name) not in hash_)
+        hash_.update({_bytes(name): _bytes(v) for name, v in items.items()})
+        return added
+
+    async def hget(self, key: str, field: str) -> Optional[bytes]:
+        hash_ = self._existing(key, dict)
+        return None if hash_ is None else hash_.get(_bytes(field))
+
+    async def hgetall(self, key: str) -> Dict[bytes, bytes]:
+        return dict(self._existing(key, dict) or {})
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        hash_ = self._container(key, dict)
+        value = int(hash_.get(_bytes(field), b"0")) + amount
+        hash_[_bytes(field)] = _bytes(value)
+        return value
+
+    # --- list commands -----------------------------------------------------
+    async def rpush(self, key: str, *values: Any) -> int:
+        list_ = self._container(key, deque)
+        list_.extend(_bytes(v) for v in values)
+        return len(list_)
+
+    async def lpush(self, key: str, *values: Any) -> int:
+        list_ = self._container(key, deque)
+        list_.extendleft(_bytes(v) for v in values)
+        return len(list_)
+
+    async def llen(self, key: str) -> int:
+        return len(self._existing(key, deque) or ())
+
+    async def lrange(self, key: str, start: int, end: int) -> List[bytes]:
+        items = list(self._existing(key, deque) or ())
+        end = len(items) if end == -1 else end + 1
+        return items[start:end]
+
+    async def lrem(self, key: str, count: int, value: Any) -> int:
+        list_: Optional[Deque[bytes]] = self._existing(key, deque)
+        if not list_:
+            return 0
+        target, removed = _bytes(value), 0
+        kept: Deque[bytes] = deque()
+        for item in list_:
+            if item == target and (count == 0 or removed < abs(count)):
+                removed += 1
+            else:
+                kept.append(item)
+        list_.clear()
+        list_.extend(kept)
+        self._drop_if_empty(key, list_)
+        return removed
+
+    async def lmove(self, source: str, destination: str, src: str = "LEFT", dest: str = "RIGHT") -> Optional[bytes]:
+        list_: Optional[Deque[bytes]] = self._existing(source, deque)
+        if not list_:
+            return None
+        value = list_.popleft() if src == "LEFT" else list_.pop()
+        self._drop_if_empty(source, list_)
+        target = self._container(destination, deque)
+        if dest == "LEFT":
+            target.appendleft(value)
+        else:
+            target.append(value)
+        return value
+
+    def pipeline(self, transaction: bool = True) -> "LocalPipeline":
+        return LocalPipeline(self)
+
+    async def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    async def flushdb(self) -> bool:
+        self._data.clear()
+        return True
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        return None
+
+
+class LocalPipeline:
+    """Queues `LocalRedis` commands and runs them in order on `execute`."""
+
+    def __init__(self, client: LocalRedis) -> None:
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+        self._immediate = False
+
+    def __getattr__(self, name: str) -> Any:
+        if not hasattr(self._client, name):
+            raise AttributeError(name)
+        if self._immediate:
+            return getattr(self._client, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "LocalPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def watch(self, *keys: str) -> bool:
+        self._immediate = True
+        return True
+
+    def multi(self) -> None:
+        self._immediate = False
+
+    async def reset(self) -> None:
+        self._immediate = False
+        self._commands = []
+
+    async def execute(self) -> List[Any]:
+        self._immediate = False
+        commands, self._commands = self._commands, []
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self) -> "LocalPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.reset()
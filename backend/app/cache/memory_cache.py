@@ -0,0 +1,97 @@
+"""Size-bounded in-process LRU cache (L1).
+
+Entries are accounted by an explicit byte size supplied by the caller rather
+than by entry count: one 4-hour lecture and one 30-second clip should not
+cost the same share of the budget.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class ByteLRUCache(Generic[V]):
+    """LRU mapping bounded by the sum of entry sizes (in bytes).
+
+    Not thread-safe – it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, max_bytes: int, default_ttl_seconds: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[V, int, Optional[float]]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not None
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value (refreshing its recency) or ``None``."""
+        value = self.peek(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """Like `get` but without touching recency or counters."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, _size, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: V, size: int, ttl: Optional[float] = None) -> bool:
+        """Insert ``value``; returns ``False`` if it can never fit the budget."""
+        if size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._drop(key)
+
+        effective_ttl = ttl if ttl is not None else self.default_ttl_seconds
+        expires_at = time.monotonic() + effective_ttl if effective_ttl else None
+        self._entries[key] = (value, size, expires_at)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+        return True
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        _value, size, _expires_at = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,15 +1,19 @@
 """Tiny wrapper around redis-py to simplify caching logic.
 
-The real implementation will expose `get`, `set`, and helper methods with
-JSON serialisation.  For now, we only keep placeholders so that other modules
-can import the interface without breaking.
+Exposes `get` / `set` on raw values: ``set`` accepts ``str`` or ``bytes`` and
+reads always return ``bytes`` (binary transcript encodings are stored
+as-is).  Serialisation of richer objects is left to the callers (see
+`app.cache.transcript_cache`).  When ``REDIS_URL``
+uses the ``memory://`` scheme an in-process `LocalRedis` replaces the network
+client.
 """
 
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 import redis.asyncio as redis_async
+from app.cache.local_redis import LocalRedis
 from app.core.config import settings
 
 
@@ -24,17 +28,44 @@ class RedisCache:
         return cls._instance
 
     def __init__(self):
+        if getattr(self, "_initialised", False):
+            return
         self.redis_url = settings.redis_url
-        self.client = redis_async.from_url(
-            self.redis_url, encoding="utf-8", decode_responses=True
-        )
+        if self.redis_url.startswith("memory://"):
+            self.client = LocalRedis()
+        else:
+            self.client = redis_async.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_timeout=settings.redis_socket_timeout_seconds,
+                socket_connect_timeout=settings.redis_socket_timeout_seconds,
+            )
         self.default_ttl_seconds = settings.cache_ttl_seconds
+        self._initialised = True
 
-    async def get(self, key: str) -> Optional[str]:  # noqa: D401
+    @classmethod
+    def reset(cls) -> None:
+        """Forget the singleton (used by tests and on shutdown)."""
+        cls._instance = None
+
+    async def get(self, key: str) -> Optional[bytes]:  # noqa: D401
         """Retrieve a value from cache or return ``None``."""
         return await self.client.get(key)
 
-    async def set(self, key: str, value: str, ttl: int | None = None) -> None:  # noqa: D401
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:  # noqa: D401
+        """Retrieve several values in a single round trip."""
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+
+    async def set(self, key: str, value: str | bytes, ttl: int | None = None) -> None:  # noqa: D401
         """Store a value in cache with optional TTL."""
         effective_ttl = ttl if ttl is not None else self.default_ttl_seconds
         await self.client.set(key, value, ex=effective_ttl)
+
+    async def delete(self, key: str) -> None:  # noqa: D401
+        """Remove a value from cache (no error if absent)."""
+        await self.client.delete(key)
+
+    async def close(self) -> None:
+        await self.client.aclose()
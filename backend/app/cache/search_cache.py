@@ -0,0 +1,117 @@
+"""Memory → Redis cache of YouTube search result pages.
+
+A ``search.list`` call costs 100 quota units, so identical searches should
+be answered from here.  "Identical" is decided on a normalised form of the
+request: the query is case-folded and its whitespace collapsed, and the
+parameters are sorted, so ``?q=Cats%20 Videos&maxResults=10`` and
+``?maxResults=10&q=cats videos`` share one entry.
+
+First pages are kept for ``search_cache_ttl_seconds``; pages reached through
+a ``pageToken`` only for the shorter ``search_page_ttl_seconds``, because
+tokens are only meaningful for a while.
+
+Pages are stored in Redis as JSON together with their expiry time, so a page
+promoted into L1 keeps the remaining lifetime it was stored with; like
+`TranscriptCache`, Redis problems are logged and treated as misses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from redis.exceptions import RedisError
+
+from app.cache.memory_cache import ByteLRUCache
+from app.cache.redis_cache import RedisCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def search_key(query: str, **params: Any) -> str:
+    """Stable identity of a search request (normalised, order-independent)."""
+    normalized = {"q": normalize_query(query)}
+    normalized.update({name: str(value) for name, value in params.items() if value not in (None, "")})
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """Two-tier cache of search pages keyed by `search_key`."""
+
+    KEY_PREFIX = "search:v2:"
+
+    def __init__(self, l1: ByteLRUCache[Any] | None = None, l2: RedisCache | None = None):
+        self.ttl_seconds = settings.search_cache_ttl_seconds
+        self.page_ttl_seconds = settings.search_page_ttl_seconds
+        self.l1 = l1 if l1 is not None else ByteLRUCache(settings.search_cache_max_bytes, self.ttl_seconds)
+        self.l2 = l2 if l2 is not None else RedisCache()
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+
+    def key(self, search_id: str) -> str:
+        return f"{self.KEY_PREFIX}{search_id}"
+
+    async def get(self, search_id: str) -> Optional[Dict[str, Any]]:
+        key = self.key(search_id)
+        page = self.l1.get(key)
+        if page is not None:
+            return page
+        try:
+            payload = await self.l2.get(key)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis read failed for %s: %s", key, exc)
+            return None
+        if payload is None:
+            self.l2_misses += 1
+            return None
+        try:
+            stored = json.loads(payload)
+            page, expires_at = stored["page"], float(stored["expires_at"])
+        except (ValueError, KeyError, TypeError) as exc:
+            self.l2_errors += 1
+            logger.warning("Discarding undecodable cache entry %s: %s", key, exc)
+            return None
+        lifetime = expires_at - time.time()
+        if lifetime <= 0:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        self.l1.set(key, page, size=len(payload), ttl=lifetime)
+        return page
+
+    async def set(self, search_id: str, page: Dict[str, Any], paged: bool = False) -> None:
+        """Store ``page``; ``paged`` pages (reached via a token) get the short TTL."""
+        key = self.key(search_id)
+        ttl = self.page_ttl_seconds if paged else self.ttl_seconds
+        stored = {"expires_at": time.time() + ttl, "page": page}
+        payload = json.dumps(stored, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.l1.set(key, page, size=len(payload), ttl=ttl)
+        try:
+            await self.l2.set(key, payload, ttl=ttl)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis write failed for %s: %s", key, exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "l1": self.l1.stats(),
+            "l2": {"hits": self.l2_hits, "misses": self.l2_misses, "errors": self.l2_errors},
+        }
+
+
+@lru_cache()
+def get_search_cache() -> SearchCache:
+    """Process-wide search cache."""
+    return SearchCache()
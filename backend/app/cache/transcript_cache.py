@@ -0,0 +1,412 @@
+"""Tiered read-through cache for transcripts.
+
+L1 is a byte-budgeted in-process LRU (`ByteLRUCache`) so that popular videos
+are served without any network round trip; L2 is the shared `RedisCache`;
+an optional persistent `TranscriptArchive` (SQLite, enabled by
+``archive_path``) sits behind Redis.
+
+A transcript is cached once, as a `CompactTranscript`: L1 holds the object,
+Redis holds its versioned binary encoding (optionally zlib-compressed).
+Every output format is rendered from it.
+
+Each value is wrapped in a `CacheEntry` that records when it was fetched:
+
+* entries younger than ``cache_ttl_seconds`` are *fresh*;
+* for another ``cache_stale_ttl_seconds`` they are *stale* – still served,
+  but the caller is expected to refresh them in the background;
+* *negative* entries remember that a video has no transcript (disabled or
+  not found) for ``negative_cache_ttl_seconds``, so known-absent videos do
+  not cost an upstream round trip on every request.
+
+The list of a video's caption tracks (`Track` metadata) is cached as its own
+entry next to the transcripts, so choosing another language or listing the
+available ones does not require listing them upstream again.
+
+Every stored transcript also gets a tiny *digest* record in Redis (content
+hash and fetch time, see `get_digest`), so conditional requests can be
+answered without loading or decoding the transcript itself.
+
+Rendered response bodies of hot videos may additionally be kept in L1 as
+*derived* entries (see `get_rendered`); they share the byte budget, so cold videos' bodies are the
+first to go.  They are keyed by the transcript's digest as well as its key,
+so a body rendered from one version of a transcript is never served for
+another (e.g. one a different worker wrote to Redis); the derived entries
+of the version in L1 are also dropped whenever L1 takes a new entry.
+
+Every transcript written is also archived.  A lookup missing both L1 and
+Redis (expired, flushed, restarted, or Redis down) falls back to the archive;
+an archived transcript younger than ``archive_max_age_seconds`` is promoted
+into Redis and L1 as a freshly validated entry – transcripts practically
+never change, so this beats refetching it upstream.  Negative entries and
+track lists are not archived.
+
+Redis and the archive are treated as optimisations: their problems are
+logged and counted but never fail the request.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+
+from app.cache.archive import TranscriptArchive
+from app.cache.memory_cache import ByteLRUCache
+from app.cache.redis_cache import RedisCache
+from app.core.config import settings
+from app.models.compact import CompactTranscript, TranscriptDecodeError
+from app.models.tracks import Track, decode_tracks, encode_tracks
+from app.utils.profiling import span
+
+logger = logging.getLogger(__name__)
+
+# Redis value layout: kind (b"T" transcript / b"N" negative) | fetched_at
+# (unix seconds, float64) | compact transcript encoding or negative reason.
+_ENVELOPE = struct.Struct("<cd")
+_KIND_TRANSCRIPT = b"T"
+_KIND_NEGATIVE = b"N"
+# Digest record: fetched_at (float64) | content digest (ASCII hex).
+_DIGEST = struct.Struct("<d")
+
+
+@dataclass
+class CacheEntry:
+    """A cached upstream outcome: a transcript or a known absence."""
+
+    fetched_at: float
+    transcript: Optional[CompactTranscript] = None
+    negative: Optional[str] = None  # reason, e.g. "disabled" or "not_found"
+
+    @property
+    def size(self) -> int:
+        return self.transcript.nbytes if self.transcript is not None else 64
+
+    def age(self, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - self.fetched_at
+
+    def encode(self, compress: bool = True) -> bytes:
+        if self.transcript is not None:
+            return _ENVELOPE.pack(_KIND_TRANSCRIPT, self.fetched_at) + self.transcript.encode(compress=compress)
+        return _ENVELOPE.pack(_KIND_NEGATIVE, self.fetched_at) + (self.negative or "").encode("utf-8")
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "CacheEntry":
+        try:
+            kind, fetched_at = _ENVELOPE.unpack_from(payload)
+        except struct.error as exc:
+            raise TranscriptDecodeError("cache envelope too short") from exc
+        body = payload[_ENVELOPE.size:]
+        if kind == _KIND_TRANSCRIPT:
+            return cls(fetched_at, transcript=CompactTranscript.decode(body))
+        if kind == _KIND_NEGATIVE:
+            return cls(fetched_at, negative=body.decode("utf-8"))
+        raise TranscriptDecodeError(f"unknown cache entry kind {kind!r}")
+
+
+def _restamp(payload: bytes, fetched_at: float) -> bytes:
+    """``payload`` with the envelope's fetch time replaced (body untouched)."""
+    kind, _ = _ENVELOPE.unpack_from(payload)
+    return _ENVELOPE.pack(kind, fetched_at) + payload[_ENVELOPE.size:]
+
+
+class TranscriptCache:
+    """Memory → Redis → archive lookup of transcripts keyed by video ID."""
+
+    KEY_PREFIX = "transcript:v3:"
+    TRACKS_PREFIX = "tracks:v1:"
+    DIGEST_PREFIX = "digest:v1:"
+
+    def __init__(
+        self,
+        l1: ByteLRUCache[Any] | None = None,
+        l2: RedisCache | None = None,
+        ttl_seconds: int | None = None,
+        archive: TranscriptArchive | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.cache_ttl_seconds
+        self.stale_ttl_seconds = settings.cache_stale_ttl_seconds
+        self.negative_ttl_seconds = settings.negative_cache_ttl_seconds
+        self.l1 = l1 if l1 is not None else ByteLRUCache(settings.memory_cache_max_bytes, self.ttl_seconds)
+        self.l2 = l2 if l2 is not None else RedisCache()
+        if archive is None and settings.archive_path:
+            archive = TranscriptArchive(settings.archive_path)
+        self.archive = archive
+        self.archive_max_age_seconds = settings.archive_max_age_seconds
+        self.compress = settings.cache_compression
+        self._variants: Set[str] = set()
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.archive_promotions = 0
+
+    def key(self, video_id: str) -> str:
+        return f"{self.KEY_PREFIX}{video_id}"
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.negative is not None or entry.age() < self.ttl_seconds
+
+    def _lifetime(self, entry: CacheEntry) -> float:
+        """Seconds ``entry`` may still be served, measured from now."""
+        if entry.negative is not None:
+            return self.negative_ttl_seconds - entry.age()
+        return self.ttl_seconds + self.stale_ttl_seconds - entry.age()
+
+    def _count(self, entry: CacheEntry) -> CacheEntry:
+        if entry.negative is not None:
+            self.negative_hits += 1
+        elif not self.is_fresh(entry):
+            self.stale_hits += 1
+        return entry
+
+    def _decode(self, key: str, payload: bytes) -> Optional[CacheEntry]:
+        try:
+            with span("cache.decode"):
+                entry = CacheEntry.decode(payload)
+        except TranscriptDecodeError as exc:
+            self.l2_errors += 1
+            logger.warning("Discarding undecodable cache entry %s: %s", key, exc)
+            return None
+        lifetime = self._lifetime(entry)
+        if lifetime <= 0:  # outlived its stale window (e.g. clock skew between hosts)
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        # Promote so the next request is served from process memory.
+        self._drop_rendered(key)
+        self.l1.set(key, entry, size=entry.size, ttl=lifetime)
+        return self._count(entry)
+
+    async def get(self, video_id: str) -> Optional[CacheEntry]:
+        """Return the cached entry for ``video_id`` (possibly stale) or ``None``."""
+        key = self.key(video_id)
+        entry = self.l1.get(key)
+        if entry is not None:
+            return self._count(entry)
+
+        try:
+            with span("cache.redis"):
+                payload = await self.l2.get(key)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis read failed for %s: %s", key, exc)
+            payload = None
+        else:
+            if payload is None:
+                self.l2_misses += 1
+        if payload is not None:
+            entry = self._decode(key, payload)
+            if entry is not None:
+                return entry
+        return (await self._from_archive({video_id: key})).get(video_id)
+
+    async def get_many(self, video_ids: List[str]) -> Dict[str, CacheEntry]:
+        """Return the cached subset of ``video_ids`` (one Redis ``MGET``)."""
+        found: Dict[str, CacheEntry] = {}
+        remote: List[str] = []
+        for video_id in video_ids:
+            entry = self.l1.get(self.key(video_id))
+            if entry is not None:
+                found[video_id] = self._count(entry)
+            else:
+                remote.append(video_id)
+        if not remote:
+            return found
+
+        keys = [self.key(video_id) for video_id in remote]
+        try:
+            with span("cache.redis"):
+                payloads = await self.l2.mget(keys)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis MGET failed for %d keys: %s", len(keys), exc)
+            payloads = [None] * len(keys)
+        else:
+            self.l2_misses += payloads.count(None)
+
+        cold: Dict[str, str] = {}
+        for video_id, key, payload in zip(remote, keys, payloads):
+            entry = self._decode(key, payload) if payload is not None else None
+            if entry is not None:
+                found[video_id] = entry
+            else:
+                cold[video_id] = key
+        found.update(await self._from_archive(cold))
+        return found
+
+    async def _from_archive(self, keys: Dict[str, str]) -> Dict[str, CacheEntry]:
+        """Look ``{video_id: key}`` up in the archive and promote the hits."""
+        if self.archive is None or not keys:
+            return {}
+        with span("cache.archive"):
+            payloads = await self.archive.get_many(list(keys.values()))
+        found: Dict[str, CacheEntry] = {}
+        now = time.time()
+        for video_id, key in keys.items():
+            payload = payloads.get(key)
+            if payload is None:
+                continue
+            try:
+                archived = CacheEntry.decode(payload)
+            except TranscriptDecodeError as exc:
+                self.archive.errors += 1
+                logger.warning("Discarding undecodable archive entry %s: %s", key, exc)
+                continue
+            if archived.transcript is None or archived.age(now) > self.archive_max_age_seconds:
+                continue
+            # Served as freshly validated; the archive keeps the real fetch time.
+            entry = CacheEntry(now, transcript=archived.transcript)
+            await self._promote(key, entry, _restamp(payload, now))
+            self.archive_promotions += 1
+            found[video_id] = entry
+        return found
+
+    async def _promote(self, key: str, entry: CacheEntry, payload: bytes) -> None:
+        lifetime = self._lifetime(entry)
+        self._drop_rendered(key)
+        self.l1.set(key, entry, size=entry.size, ttl=lifetime)
+        try:
+            await self.l2.set(key, payload, ttl=max(1, round(lifetime)))
+            if entry.transcript is not None:
+                digest = _DIGEST.pack(entry.fetched_at) + entry.transcript.digest.encode("ascii")
+                await self.l2.set(self._digest_key(key), digest, ttl=max(1, round(lifetime)))
+            else:
+                await self.l2.delete(self._digest_key(key))
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis write failed for %s: %s", key, exc)
+
+    async def set(self, video_id: str, transcript: CompactTranscript) -> None:
+        """Store a freshly fetched ``transcript`` in both tiers."""
+        await self._store(video_id, CacheEntry(time.time(), transcript=transcript))
+
+    async def set_negative(self, video_id: str, reason: str) -> None:
+        """Remember that ``video_id`` has no transcript (for the negative TTL)."""
+        await self._store(video_id, CacheEntry(time.time(), negative=reason))
+
+    async def _store(self, video_id: str, entry: CacheEntry) -> None:
+        key = self.key(video_id)
+        with span("cache.encode"):
+            payload = entry.encode(compress=self.compress)
+        with span("cache.write"):
+            await self._promote(key, entry, payload)
+            if self.archive is not None and entry.transcript is not None:
+                await self.archive.put(key, entry.fetched_at, payload)
+
+    def _digest_key(self, key: str) -> str:
+        return f"{self.DIGEST_PREFIX}{key.removeprefix(self.KEY_PREFIX)}"
+
+    async def get_digest(self, video_id: str) -> Optional[Tuple[str, float]]:
+        """``(digest, fetched_at)`` of the cached transcript, without decoding it.
+
+        ``None`` when it is not cached (or cached as negative); callers then
+        fall back to `get`.
+        """
+        key = self.key(video_id)
+        entry = self.l1.get(key)
+        if entry is not None:
+            return (entry.transcript.digest, entry.fetched_at) if entry.transcript is not None else None
+        try:
+            with span("cache.redis"):
+                payload = await self.l2.get(self._digest_key(key))
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis read failed for %s: %s", key, exc)
+            return None
+        if payload is None or len(payload) <= _DIGEST.size:
+            return None
+        (fetched_at,) = _DIGEST.unpack_from(payload)
+        if self._lifetime(CacheEntry(fetched_at)) <= 0:
+            return None
+        return payload[_DIGEST.size:].decode("ascii"), fetched_at
+
+    # --- caption-track metadata ----------------------------------------
+    def tracks_key(self, video_id: str) -> str:
+        return f"{self.TRACKS_PREFIX}{video_id}"
+
+    async def get_tracks(self, video_id: str) -> Optional[List[Track]]:
+        """Return the cached track list of ``video_id`` or ``None``."""
+        key = self.tracks_key(video_id)
+        tracks = self.l1.get(key)
+        if tracks is not None:
+            return tracks
+        try:
+            with span("cache.redis"):
+                payload = await self.l2.get(key)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis read failed for %s: %s", key, exc)
+            return None
+        if payload is None:
+            self.l2_misses += 1
+            return None
+        try:
+            tracks = decode_tracks(payload)
+        except ValueError as exc:
+            self.l2_errors += 1
+            logger.warning("Discarding undecodable cache entry %s: %s", key, exc)
+            return None
+        self.l2_hits += 1
+        self.l1.set(key, tracks, size=len(payload))
+        return tracks
+
+    async def set_tracks(self, video_id: str, tracks: List[Track]) -> None:
+        key = self.tracks_key(video_id)
+        payload = encode_tracks(tracks)
+        self.l1.set(key, tracks, size=len(payload))
+        try:
+            await self.l2.set(key, payload, ttl=self.ttl_seconds)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis write failed for %s: %s", key, exc)
+
+    async def delete_tracks(self, video_id: str) -> None:
+        key = self.tracks_key(video_id)
+        self.l1.delete(key)
+        try:
+            await self.l2.delete(key)
+        except (RedisError, OSError) as exc:
+            self.l2_errors += 1
+            logger.warning("Redis delete failed for %s: %s", key, exc)
+
+    # --- derived, memory-only entries ------------------------------------
+    def _rendered_key(self, video_id: str, digest: str, variant: str) -> str:
+        return f"{self.key(video_id)}#{digest}#{variant}"
+
+    def get_rendered(self, video_id: str, digest: str, variant: str) -> Optional[bytes]:
+        """Return a body (e.g. ``"json"``) previously rendered from the transcript ``digest``."""
+        return self.l1.get(self._rendered_key(video_id, digest, variant))
+
+    def set_rendered(self, video_id: str, digest: str, variant: str, body: bytes) -> None:
+        self._variants.add(variant)
+        self.l1.set(self._rendered_key(video_id, digest, variant), body, size=len(body))
+
+    def _drop_rendered(self, key: str) -> None:
+        """Free the derived entries of the transcript currently in L1 under ``key``."""
+        previous = self.l1.peek(key)
+        if previous is None or previous.transcript is None:
+            return  # any older bodies are unreachable (other digest) and age out
+        video_id = key.removeprefix(self.KEY_PREFIX)
+        for variant in self._variants:
+            self.l1.delete(self._rendered_key(video_id, previous.transcript.digest, variant))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "l1": self.l1.stats(),
+            "l2": {"hits": self.l2_hits, "misses": self.l2_misses, "errors": self.l2_errors},
+            "archive": {**self.archive.stats(), "promotions": self.archive_promotions} if self.archive else None,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+        }
+
+
+@lru_cache()
+def get_transcript_cache() -> TranscriptCache:
+    """Process-wide transcript cache."""
+    return TranscriptCache()
@@ -25,16 +25,142 @@ class Settings(BaseSettings):
 
     # --- YouTube API ------------------------------------------------------
     youtube_api_key: str = Field("")
+    youtube_api_timeout_seconds: float = Field(10.0, description="Timeout for Data API requests (seconds)")
+    youtube_api_max_connections: int = Field(20, description="Size of the pooled Data API connection pool")
+    youtube_quota_daily_budget: int = Field(10_000, description="Data API quota units this process may spend per day")
+    youtube_api_batch_window_seconds: float = Field(
+        0.005, description="How long concurrent video lookups are collected into one videos.list call (seconds)"
+    )
+    youtube_api_etag_cache_bytes: int = Field(
+        8 * 1024 * 1024, description="Byte budget for Data API responses kept for If-None-Match revalidation"
+    )
 
     # --- Redis ------------------------------------------------------------
-    redis_url: str = Field("redis://redis:6379")
+    redis_url: str = Field("redis://redis:6379", description="Use memory:// for an in-process stand-in")
+    redis_socket_timeout_seconds: float = Field(0.5, description="Connect/read timeout for Redis calls")
+
+    # --- In-process cache -------------------------------------------------
+    memory_cache_max_bytes: int = Field(64 * 1024 * 1024, description="Byte budget of the L1 transcript cache")
+    cache_compression: bool = Field(True, description="zlib-compress transcripts stored in Redis")
+
+    # --- Persistent archive -----------------------------------------------
+    archive_path: Optional[str] = Field(
+        None, description="SQLite file archiving every fetched transcript behind Redis (unset: disabled)"
+    )
+    archive_max_age_seconds: int = Field(
+        30 * 86400, description="Archived transcripts older than this are fetched again instead (seconds)"
+    )
+    archive_prune_interval_seconds: int = Field(
+        6 * 3600, description="Pause between deletions of archived transcripts past their max age (seconds)"
+    )
+
+    # --- Search cache -----------------------------------------------------
+    search_cache_ttl_seconds: int = Field(900, description="TTL of cached first search pages (seconds)")
+    search_page_ttl_seconds: int = Field(300, description="TTL of cached pages reached via pageToken (seconds)")
+    search_cache_max_bytes: int = Field(8 * 1024 * 1024, description="Byte budget of the in-process search cache")
+    search_prefetch_next_page: bool = Field(False, description="Fetch page N+1 in the background after serving page N")
+    search_prefetch_quota_reserve: int = Field(
+        2000, description="Next-page prefetch is skipped while fewer Data API units than this remain for the day"
+    )
+
+    # --- Corpus index ---------------------------------------------------
+    corpus_index_enabled: bool = Field(True, description="Index every fetched transcript for /corpus/search")
+    corpus_index_path: Optional[str] = Field(
+        None, description="File the corpus index is loaded from at start-up and saved to at shutdown"
+    )
 
     # --- CORS -------------------------------------------------------------
     allowed_origins: List[AnyHttpUrl] = Field(default=["http://localhost:5173"])
 
+    # --- Upstream execution ----------------------------------------------
+    upstream_max_workers: int = Field(16, description="Threads available for blocking upstream calls")
+    upstream_max_concurrency: int = Field(8, description="Concurrent calls allowed per upstream")
+    upstream_max_queue_depth: int = Field(64, description="Callers allowed to wait per upstream before 503")
+    upstream_timeout_seconds: float = Field(15.0, description="Timeout for a single upstream call (seconds)")
+    upstream_min_concurrency: int = Field(1, description="Floor the adaptive per-upstream limit can shrink to")
+    upstream_latency_target_seconds: float = Field(
+        5.0, description="Calls slower than this shrink the adaptive limit like a failure (seconds)"
+    )
+    circuit_failure_threshold: int = Field(5, description="Consecutive upstream failures that open the circuit")
+    circuit_reset_seconds: float = Field(30.0, description="How long an open circuit refuses calls (seconds)")
+
+    # --- Bulk requests ----------------------------------------------------
+    bulk_max_video_ids: int = Field(5000, description="Maximum video IDs accepted per bulk request")
+    bulk_concurrency: int = Field(8, description="Concurrent upstream fetches per bulk request")
+    pipeline_depth: int = Field(50, description="Video IDs / results buffered between pipeline stages")
+
+    # --- Background jobs --------------------------------------------------
+    job_workers: int = Field(2, description="Job worker tasks per process (0 disables the worker pool)")
+    job_max_video_ids: int = Field(100_000, description="Maximum video IDs accepted per job")
+    job_chunk_size: int = Field(50, description="Videos processed between two progress checkpoints")
+    job_lease_seconds: float = Field(
+        60.0, description="A running job whose heartbeat is older than this is handed to another worker"
+    )
+    job_poll_interval_seconds: float = Field(0.5, description="Idle workers / progress streams poll this often")
+    job_result_ttl_seconds: int = Field(86400, description="How long finished jobs and their results are kept")
+
+    # --- Prefetch & warm-up ----------------------------------------------
+    prefetch_playlists: List[str] = Field(default=[], description="Playlists whose new videos are prefetched")
+    prefetch_channels: List[str] = Field(
+        default=[], description="Channels (UC… IDs) whose uploads are prefetched; listed via their uploads playlist"
+    )
+    prefetch_interval_seconds: float = Field(900.0, description="Pause between two prefetch cycles (seconds)")
+    prefetch_concurrency: int = Field(2, description="Concurrent transcript fetches of the prefetcher")
+    prefetch_max_videos: int = Field(200, description="Videos considered per watched playlist and cycle")
+    prefetch_quota_reserve: int = Field(
+        2000, description="Prefetching stops while fewer Data API units than this remain for the day"
+    )
+    prefetch_headroom: int = Field(
+        2, description="Upstream slots the prefetcher leaves free for live requests"
+    )
+    prefetch_max_wait_seconds: float = Field(
+        60.0, description="A prefetch cycle is deferred after waiting this long for upstream headroom (seconds)"
+    )
+    warmup_video_ids: List[str] = Field(default=[], description="Hot video IDs loaded into the cache at start-up")
+    warmup_file: Optional[str] = Field(None, description="File with more hot video IDs, one per line")
+    warmup_timeout_seconds: float = Field(300.0, description="Start-up warm-up gives up after this long (seconds)")
+
+    # --- Rate limiting ----------------------------------------------------
+    rate_limit_enabled: bool = Field(False, description="Enforce per-client token buckets")
+    rate_limit_backend: str = Field(
+        "redis", pattern="^(redis|local)$", description="Share buckets through Redis or keep them per process"
+    )
+    rate_limit_per_minute: float = Field(120.0, description="Requests per minute and client (default class)")
+    rate_limit_burst: int = Field(60, description="Requests a client may burst (default class)")
+    rate_limit_bulk_items_per_minute: float = Field(
+        3000.0, description="Videos per minute and client across bulk, export, job and playlist requests"
+    )
+    rate_limit_bulk_burst: int = Field(5000, description="Videos a client may request in a burst")
+    rate_limit_playlist_cost: int = Field(100, description="Videos charged up front for a playlist request")
+    rate_limit_search_per_minute: float = Field(30.0, description="Search requests per minute and client")
+    rate_limit_search_burst: int = Field(10, description="Search requests a client may burst")
+    rate_limit_trust_forwarded_for: bool = Field(
+        False, description="Identify clients without an API key by X-Forwarded-For (behind a trusted proxy)"
+    )
+    rate_limit_api_keys: List[str] = Field(
+        default=[], description="X-API-Key values that get buckets of their own; other clients are keyed by address"
+    )
+
+    # --- Profiling --------------------------------------------------------
+    profiling_enabled: bool = Field(False, description="Record timing spans, Server-Timing and slow requests")
+    profiling_sample_rate: float = Field(1.0, ge=0.0, le=1.0, description="Share of requests profiled")
+    profiling_slow_ms: float = Field(500.0, description="Profiled requests at least this slow are kept (ms)")
+    profiling_slow_capacity: int = Field(100, description="Slow requests kept for /admin/slow-requests")
+
     # --- Misc -------------------------------------------------------------
     log_level: str = Field("INFO")
+    log_queued: bool = Field(True, description="Format and write log records on a background thread")
+    log_queue_size: int = Field(10_000, description="Log records buffered for the writer thread before dropping")
+    log_info_sample_rate: float = Field(
+        1.0, ge=0.0, le=1.0, description="Fraction of INFO/DEBUG records kept (warnings and errors always are)"
+    )
     cache_ttl_seconds: int = Field(3600, description="Default TTL for cache entries (seconds)")
+    cache_stale_ttl_seconds: int = Field(
+        86400, description="How long past its TTL a transcript may be served while it is refreshed (seconds)"
+    )
+    negative_cache_ttl_seconds: int = Field(
+        300, description="TTL for cached 'transcripts disabled / not found' outcomes (seconds)"
+    )
 
     # Pydantic-settings configuration
     model_config = SettingsConfigDict(
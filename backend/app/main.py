@@ -1,31 +1,119 @@
 """FastAPI application factory & entry-point."""
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from app.api import register_routes
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware, RateLimitMiddleware
+from app.api.routes.transcripts import bulk_record
+from app.cache.archive import prune_periodically
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import get_transcript_cache
 from app.core.config import settings
-from app.utils.logger import configure_logging
+from app.services.corpus_index import get_corpus_index
+from app.services.jobs import JobRunner
+from app.services.prefetch import Prefetcher, load_hot_ids
+from app.services.rate_limit import configured_limits, get_rate_limiter
+from app.services.upstream import get_upstream_executor
+from app.services.youtube_client import get_youtube_client
+from app.utils.logger import configure_logging, shutdown_logging
+from app.utils.profiling import get_slow_request_log
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):  # pragma: no cover – exercised by Uvicorn
+    """Start-up / shutdown hooks for process-wide resources."""
+
+    jobs = JobRunner(render=bulk_record)
+    jobs.start()
+    # Warm-up runs in the background; /health answers 503 until it is done.
+    app.state.prefetcher = Prefetcher(hot_ids=load_hot_ids(settings.warmup_video_ids, settings.warmup_file))
+    app.state.prefetcher.start()
+    archive = get_transcript_cache().archive
+    pruning = None
+    if archive is not None:
+        pruning = asyncio.create_task(
+            prune_periodically(archive, settings.archive_max_age_seconds, settings.archive_prune_interval_seconds)
+        )
+    yield
+    await app.state.prefetcher.stop()
+    await jobs.stop()
+    if pruning is not None:
+        pruning.cancel()
+        await asyncio.gather(pruning, return_exceptions=True)
+    get_upstream_executor().shutdown()
+    if settings.corpus_index_enabled and settings.corpus_index_path:
+        get_corpus_index().save(settings.corpus_index_path)
+    await RedisCache().close()
+    if archive is not None:
+        archive.close()
+    await get_youtube_client().close()
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:  # noqa: D401
     """Build and configure the FastAPI application."""
 
-    configure_logging(settings.log_level)
+    configure_logging(
+        settings.log_level,
+        queued=settings.log_queued,
+        queue_size=settings.log_queue_size,
+        info_sample_rate=settings.log_info_sample_rate,
+    )
 
     app = FastAPI(
         title="YouTube Transcript Retrieval Service",
         version="0.1.0",
         debug=settings.debug,
+        lifespan=lifespan,
     )
 
+    if settings.rate_limit_enabled:
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=get_rate_limiter(),
+            limits=configured_limits(),
+            playlist_cost=settings.rate_limit_playlist_cost,
+            trust_forwarded_for=settings.rate_limit_trust_forwarded_for,
+            api_keys=settings.rate_limit_api_keys,
+        )
+    # Added after (so outside) the limiter: refused requests are measured too.
+    app.add_middleware(MetricsMiddleware)
+    if settings.profiling_enabled:
+        app.add_middleware(
+            ProfilingMiddleware, slow_log=get_slow_request_log(), sample_rate=settings.profiling_sample_rate
+        )
+
     # Register application routers
     register_routes(app)
 
     # Health check
     @app.get("/health", tags=["system"])
-    async def health():  # noqa: D401
+    async def health(request: Request):  # noqa: D401
+        prefetcher = getattr(request.app.state, "prefetcher", None)
+        if prefetcher is not None and prefetcher.warming_up:
+            return JSONResponse({"status": "warming_up"}, status_code=503)
         return {"status": "ok"}
 
+    @app.get("/health/prefetch", tags=["system"])
+    async def prefetch_health(request: Request):  # noqa: D401
+        """Warm-up state and prefetch counters."""
+        prefetcher = getattr(request.app.state, "prefetcher", None)
+        return prefetcher.stats() if prefetcher is not None else {"enabled": False}
+
+    @app.get("/health/upstream", tags=["system"])
+    async def upstream_health():  # noqa: D401
+        """Adaptive limits and circuit-breaker state of every upstream."""
+        return get_upstream_executor().stats()
+
+    @app.get("/health/quota", tags=["system"])
+    async def quota_health():  # noqa: D401
+        """YouTube Data API quota spent today and request/ETag counters."""
+        return get_youtube_client().stats()
+
     return app
 
 
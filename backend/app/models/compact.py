@@ -0,0 +1,221 @@
+"""Compact columnar transcript container and its binary wire format.
+
+A transcript with 10k segments as a list of dicts (or Pydantic objects) costs
+hundreds of bytes of interpreter overhead per segment.  `CompactTranscript`
+keeps the same information in four flat buffers:
+
+* ``starts_ms`` / ``durations_ms`` – ``array('I')`` of milliseconds
+  (YouTube timed-text carries millisecond precision, so this is lossless);
+* ``text`` – every segment's UTF-8 text, each followed by ``\\n``;
+* ``offsets`` – ``array('I')`` with the byte offset where each segment's
+  text starts, plus a final sentinel equal to ``len(text)``.
+
+Because segments are newline-terminated the plain-text rendering is a single
+``decode`` of the buffer.  Start times are sorted, so a time window maps to a
+segment range with two binary searches (`span`) and `slice` copies only that
+range.  This is deliberately not a Pydantic model: it is
+an internal storage format, and the API schema is unchanged.
+
+Binary encoding (little-endian)::
+
+    b"YTT" | version:u8 | flags:u8 | body
+    body = count:u32 | starts[count]:u32 | durations[count]:u32
+           | offsets[count + 1]:u32 | text
+
+With ``FLAG_ZLIB`` set, ``body`` is zlib-compressed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+MAGIC = b"YTT"
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+_HEADER = struct.Struct("<3sBB")
+_COUNT = struct.Struct("<I")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+# Python object + four buffer headers; keeps small entries from looking free.
+_OBJECT_OVERHEAD = 256
+
+
+class TranscriptDecodeError(ValueError):
+    """The payload is not a transcript encoding this version understands."""
+
+
+def _to_le_bytes(values: array) -> bytes:
+    if _LITTLE_ENDIAN:
+        return values.tobytes()
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _from_le_bytes(data: bytes | memoryview) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+class CompactTranscript:
+    """Immutable columnar transcript (see module docstring)."""
+
+    __slots__ = ("starts_ms", "durations_ms", "offsets", "text", "_digest")
+
+    def __init__(self, starts_ms: array, durations_ms: array, offsets: array, text: bytes):
+        self.starts_ms = starts_ms
+        self.durations_ms = durations_ms
+        self.offsets = offsets
+        self.text = text
+        self._digest: str | None = None
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict[str, Any]]) -> "CompactTranscript":
+        """Build from ``{"text", "start", "duration"}`` mappings (library output)."""
+        starts, durations, offsets = array("I"), array("I"), array("I")
+        chunks: List[bytes] = []
+        position = 0
+        for segment in segments:
+            starts.append(round(float(segment["start"]) * 1000))
+            durations.append(round(float(segment["duration"]) * 1000))
+            encoded = segment["text"].encode("utf-8") + b"\n"
+            offsets.append(position)
+            chunks.append(encoded)
+            position += len(encoded)
+        offsets.append(position)
+        return cls(starts, durations, offsets, b"".join(chunks))
+
+    # --- access ----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.starts_ms)
+
+    def text_at(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1] - 1].decode("utf-8")
+
+    def texts(self) -> List[str]:
+        view = memoryview(self.text)
+        offsets = self.offsets
+        return [
+            str(view[offsets[i]:offsets[i + 1] - 1], "utf-8")
+            for i in range(len(self.starts_ms))
+        ]
+
+    def iter_segments(self) -> Iterator[Tuple[str, float, float]]:
+        """Yield ``(text, start_seconds, duration_seconds)`` tuples."""
+        for text, start, duration in zip(self.texts(), self.starts_ms, self.durations_ms):
+            yield text, start / 1000, duration / 1000
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialise the classic list-of-dicts representation."""
+        return [
+            {"text": text, "start": start, "duration": duration}
+            for text, start, duration in self.iter_segments()
+        ]
+
+    # --- time windows ----------------------------------------------------
+    def span(self, start: float | None = None, end: float | None = None) -> Tuple[int, int]:
+        """Index range ``[i, j)`` of segments overlapping ``[start, end)`` (seconds).
+
+        The segment still on screen at ``start`` is included; ``None`` leaves
+        that side of the window open.
+        """
+        starts = self.starts_ms
+        i = 0
+        if start is not None:
+            start_ms = round(start * 1000)
+            i = bisect_right(starts, start_ms)
+            # earlier segments may still be showing (auto-captions overlap)
+            while i > 0 and starts[i - 1] + self.durations_ms[i - 1] > start_ms:
+                i -= 1
+        j = len(starts) if end is None else bisect_left(starts, round(end * 1000))
+        return i, max(i, j)
+
+    def slice(self, start: float | None = None, end: float | None = None) -> "CompactTranscript":
+        """Segments overlapping ``[start, end)`` (seconds); copies only that range."""
+        i, j = self.span(start, end)
+        if (i, j) == (0, len(self)):
+            return self
+        base = self.offsets[i]
+        offsets = array("I", (offset - base for offset in self.offsets[i:j + 1]))
+        return CompactTranscript(
+            self.starts_ms[i:j], self.durations_ms[i:j], offsets, self.text[base:self.offsets[j]]
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate resident size, used by the byte-budgeted L1 cache."""
+        itemsize = self.starts_ms.itemsize
+        columns = len(self.starts_ms) + len(self.durations_ms) + len(self.offsets)
+        return _OBJECT_OVERHEAD + columns * itemsize + len(self.text)
+
+    @property
+    def digest(self) -> str:
+        """Content hash (hex), stable across processes; computed once per instance."""
+        if self._digest is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for column in (self.starts_ms, self.durations_ms, self.offsets):
+                digest.update(_to_le_bytes(column))
+            digest.update(self.text)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    # --- wire format -----------------------------------------------------
+    def encode(self, compress: bool = True) -> bytes:
+        """Serialise to the versioned binary format."""
+        body = b"".join(
+            (
+                _COUNT.pack(len(self.starts_ms)),
+                _to_le_bytes(self.starts_ms),
+                _to_le_bytes(self.durations_ms),
+                _to_le_bytes(self.offsets),
+                self.text,
+            )
+        )
+        flags = 0
+        if compress:
+            body = zlib.compress(body, 6)
+            flags |= FLAG_ZLIB
+        return _HEADER.pack(MAGIC, VERSION, flags) + body
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "CompactTranscript":
+        """Inverse of `encode`; raises `TranscriptDecodeError` on bad input."""
+        try:
+            magic, version, flags = _HEADER.unpack_from(payload)
+        except struct.error as exc:
+            raise TranscriptDecodeError("payload too short") from exc
+        if magic != MAGIC or version != VERSION:
+            raise TranscriptDecodeError(f"unsupported transcript encoding {magic!r} v{version}")
+
+        body = memoryview(payload)[_HEADER.size:]
+        if flags & FLAG_ZLIB:
+            try:
+                body = memoryview(zlib.decompress(body))
+            except zlib.error as exc:
+                raise TranscriptDecodeError("corrupt compressed payload") from exc
+
+        try:
+            (count,) = _COUNT.unpack_from(body)
+            position = _COUNT.size
+            columns = []
+            for length in (count, count, count + 1):
+                end = position + length * 4
+                if end > len(body):
+                    raise TranscriptDecodeError("truncated payload")
+                columns.append(_from_le_bytes(body[position:end]))
+                position = end
+        except struct.error as exc:
+            raise TranscriptDecodeError("truncated payload") from exc
+        text = bytes(body[position:])
+        if len(text) != columns[2][-1]:
+            raise TranscriptDecodeError("text length does not match offsets")
+        return cls(columns[0], columns[1], columns[2], text)
@@ -0,0 +1,53 @@
+"""Pydantic models of the background job API (``/jobs``)."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.core.config import settings
+from app.models.transcript import check_video_ids, split_video_ids
+
+
+class JobRequest(BaseModel):
+    """Body of ``POST /jobs``: either ``video_ids`` or ``playlist_id``."""
+
+    video_ids: list[str] | None = None
+    playlist_id: str | None = Field(None, min_length=1)
+    format: Literal["json", "text"] = "json"
+
+    @field_validator("video_ids", mode="before")
+    @classmethod
+    def _split_comma_separated(cls, value):  # noqa: D401
+        return split_video_ids(value)
+
+    @field_validator("video_ids")
+    @classmethod
+    def _check_ids(cls, value: list[str] | None) -> list[str] | None:  # noqa: D401
+        return check_video_ids(value)
+
+    @model_validator(mode="after")
+    def _one_source(self) -> "JobRequest":  # noqa: D401
+        if (self.video_ids is None) == (self.playlist_id is None):
+            raise ValueError("give exactly one of video_ids or playlist_id")
+        if self.video_ids is not None:
+            if not self.video_ids:
+                raise ValueError("video_ids must not be empty")
+            if len(self.video_ids) > settings.job_max_video_ids:
+                raise ValueError(f"at most {settings.job_max_video_ids} video IDs per job")
+        return self
+
+
+class JobStatus(BaseModel):
+    """Progress of a job; ``total`` is ``None`` while a playlist is being listed."""
+
+    job_id: str
+    kind: Literal["bulk", "playlist"]
+    status: Literal["queued", "running", "done", "failed", "cancelled"]
+    format: str
+    total: int | None = None
+    processed: int = 0
+    ok: int = 0
+    failed: int = 0
+    created_at: float
+    updated_at: float
+    error: str | None = None
@@ -0,0 +1,123 @@
+"""Caption-track metadata of a video and track selection.
+
+`youtube-transcript-api` needs one request (the watch page) to list the
+available tracks and a second one to download a track.  Listing the tracks
+once and caching the result as `Track` records lets later requests – another
+language, a metadata lookup – skip the first request entirely.
+
+A `Track` keeps the track's timed-text ``url`` so that it can be downloaded
+without listing again; it is internal and never part of an API response.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PREFER_MANUAL = "manual"
+PREFER_GENERATED = "generated"
+
+
+@dataclass(frozen=True)
+class Track:
+    """One caption track as reported by YouTube."""
+
+    language: str
+    language_code: str
+    is_generated: bool
+    url: str
+    # ``[{"language": ..., "language_code": ...}]``, as the library reports them.
+    translation_languages: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def is_translatable(self) -> bool:
+        return bool(self.translation_languages)
+
+    def can_translate_to(self, language_code: str) -> bool:
+        return any(t["language_code"] == language_code for t in self.translation_languages)
+
+    @classmethod
+    def from_transcript(cls, transcript: Any) -> "Track":
+        """Build from a library `Transcript` (reads its private ``_url``)."""
+        return cls(
+            language=transcript.language,
+            language_code=transcript.language_code,
+            is_generated=bool(transcript.is_generated),
+            url=transcript._url,
+            translation_languages=list(transcript.translation_languages),
+        )
+
+    def public(self) -> Dict[str, Any]:
+        """The API representation (no download URL)."""
+        return {
+            "language": self.language,
+            "language_code": self.language_code,
+            "is_generated": self.is_generated,
+            "is_translatable": self.is_translatable,
+            "translation_languages": [t["language_code"] for t in self.translation_languages],
+        }
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Which track a caller asked for.
+
+    ``languages`` is a priority list of language codes (empty: any language);
+    ``prefer`` decides whether manual or generated tracks are tried first.
+    """
+
+    languages: Tuple[str, ...] = ()
+    prefer: str = PREFER_MANUAL
+
+    @property
+    def is_default(self) -> bool:
+        return not self.languages and self.prefer == PREFER_MANUAL
+
+    def cache_id(self, video_id: str) -> str:
+        """Cache identity of the transcript this selection resolves to."""
+        if self.is_default:
+            return video_id
+        return f"{video_id}@{','.join(self.languages)}~{self.prefer}"
+
+    def kinds(self) -> Tuple[bool, bool]:
+        """``is_generated`` values in the order they should be tried."""
+        return (True, False) if self.prefer == PREFER_GENERATED else (False, True)
+
+
+DEFAULT_SELECTION = Selection()
+
+
+def select_track(tracks: Sequence[Track], selection: Selection) -> Optional[Tuple[Track, Optional[str]]]:
+    """Pick the track for ``selection``; returns ``(track, translate_to)``.
+
+    Mirrors the library: for each kind (manual/generated, in preference
+    order) the first requested language that has a track wins.  If no track
+    matches natively, the first translatable track that offers the first
+    requested language is returned together with that language code.
+    """
+    codes = list(selection.languages) or list(dict.fromkeys(t.language_code for t in tracks))
+    for generated in selection.kinds():
+        by_code = {t.language_code: t for t in tracks if t.is_generated == generated}
+        for code in codes:
+            if code in by_code:
+                return by_code[code], None
+    if selection.languages:
+        target = selection.languages[0]
+        for generated in selection.kinds():
+            for track in tracks:
+                if track.is_generated == generated and track.can_translate_to(target):
+                    return track, target
+    return None
+
+
+def encode_tracks(tracks: Iterable[Track]) -> bytes:
+    return json.dumps([asdict(t) for t in tracks], separators=(",", ":")).encode("utf-8")
+
+
+def decode_tracks(payload: bytes) -> List[Track]:
+    """Inverse of `encode_tracks`; raises ``ValueError`` on bad input."""
+    try:
+        return [Track(**item) for item in json.loads(payload)]
+    except (TypeError, KeyError) as exc:
+        raise ValueError(f"malformed track list: {exc}") from exc
@@ -2,7 +2,12 @@ from __future__ import annotations
 
 """Pydantic model for transcript snippets (placeholder)."""
 
-from pydantic import BaseModel
+import re
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.core.config import settings
 
 
 class TranscriptSnippet(BaseModel):  # noqa: D101
@@ -14,3 +19,120 @@ class TranscriptSnippet(BaseModel):  # noqa: D101
 class TranscriptResponse(BaseModel):  # noqa: D101
     video_id: str
     snippets: list[TranscriptSnippet]
+
+
+def split_video_ids(value):
+    """Accept a JSON array or one comma-separated string; drop blanks."""
+    if isinstance(value, str):
+        value = value.split(",")
+    if isinstance(value, list):
+        value = [v.strip() for v in value if isinstance(v, str) and v.strip()]
+    return value
+
+
+VIDEO_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def check_video_ids(value: list[str] | None) -> list[str] | None:
+    """Reject IDs that are not plain ``[A-Za-z0-9_-]`` tokens; they end up in file names."""
+    for video_id in value or ():
+        if not VIDEO_ID_PATTERN.fullmatch(video_id):
+            raise ValueError(f"invalid video ID: {video_id[:80]!r}")
+    return value
+
+
+class BulkTranscriptRequest(BaseModel):
+    """Body of ``POST /transcripts/bulk``.
+
+    ``video_ids`` accepts a JSON array or a single comma-separated string.
+    """
+
+    video_ids: list[str] = Field(..., min_length=1)
+    format: Literal["json", "text"] = "json"
+
+    @field_validator("video_ids", mode="before")
+    @classmethod
+    def _split_comma_separated(cls, value):  # noqa: D401
+        return split_video_ids(value)
+
+    @field_validator("video_ids")
+    @classmethod
+    def _check_size(cls, value: list[str]) -> list[str]:  # noqa: D401
+        if len(value) > settings.bulk_max_video_ids:
+            raise ValueError(f"at most {settings.bulk_max_video_ids} video IDs per request")
+        return check_video_ids(value)
+
+
+class ExportRequest(BaseModel):
+    """Body of ``POST /export``: either ``video_ids`` or ``playlist_id``."""
+
+    video_ids: list[str] | None = None
+    playlist_id: str | None = Field(None, min_length=1)
+    format: Literal["json", "text", "srt", "vtt", "ndjson"] = "json"
+
+    @field_validator("video_ids", mode="before")
+    @classmethod
+    def _split_comma_separated(cls, value):  # noqa: D401
+        return split_video_ids(value)
+
+    @field_validator("video_ids")
+    @classmethod
+    def _check_ids(cls, value: list[str] | None) -> list[str] | None:  # noqa: D401
+        return check_video_ids(value)
+
+    @model_validator(mode="after")
+    def _one_source(self) -> "ExportRequest":  # noqa: D401
+        if (self.video_ids is None) == (self.playlist_id is None):
+            raise ValueError("give exactly one of video_ids or playlist_id")
+        if self.video_ids is not None:
+            if not self.video_ids:
+                raise ValueError("video_ids must not be empty")
+            if len(self.video_ids) > settings.bulk_max_video_ids:
+                raise ValueError(f"at most {settings.bulk_max_video_ids} video IDs per request")
+        return self
+
+
+class TranscriptTrack(BaseModel):
+    """One caption track available for a video."""
+
+    language: str
+    language_code: str
+    is_generated: bool
+    is_translatable: bool
+    translation_languages: list[str] = Field(default_factory=list, description="Language codes it can be translated to")
+
+
+class TranscriptTracksResponse(BaseModel):  # noqa: D101
+    video_id: str
+    tracks: list[TranscriptTrack]
+
+
+class CorpusSearchHit(BaseModel):
+    """One matching segment of an already-fetched transcript."""
+
+    video_id: str
+    segment: int = Field(..., description="Index of the segment within the transcript")
+    start: float = Field(..., description="Start of the segment (seconds)")
+    score: float
+    text: str | None = Field(None, description="Segment text, when the transcript is still cached")
+
+
+class CorpusSearchResponse(BaseModel):  # noqa: D101
+    query: str
+    hits: list[CorpusSearchHit]
+    took_ms: float
+
+
+class TranscriptMatch(BaseModel):
+    """One occurrence of the phrase and the segments around it."""
+
+    start: float = Field(..., description="Start of the first matching segment (seconds)")
+    end: float = Field(..., description="End of the last matching segment (seconds)")
+    text: str = Field(..., description="Text of the matching segment(s)")
+    context: list[TranscriptSnippet] = Field(..., description="Matching segments plus surrounding context")
+
+
+class TranscriptSearchResponse(BaseModel):  # noqa: D101
+    video_id: str
+    query: str
+    matches: list[TranscriptMatch]
@@ -10,3 +10,16 @@ class Video(BaseModel):  # noqa: D101
     title: str
     description: str | None = None
     published_at: str | None = None  # ISO date string; customise later
+    channel_id: str | None = None
+    channel_title: str | None = None
+    thumbnail_url: str | None = None
+
+
+class SearchResponse(BaseModel):
+    """Body of ``GET /search``: one page of matching videos."""
+
+    query: str
+    items: list[Video]
+    next_page_token: str | None = None
+    prev_page_token: str | None = None
+    total_results: int | None = None
@@ -0,0 +1,298 @@
+"""In-process full-text index over every transcript the service has fetched.
+
+Layout (built for memory density and fast intersections, not generality):
+
+* each indexed video gets a *document number*; re-indexing a video whose
+  content changed assigns a new number and tombstones the old one, so
+  numbers – and therefore posting lists – only ever grow in sorted order;
+  once tombstones make up a large enough share of the documents the live
+  index is compacted (renumbered without them);
+* a posting is one ``(document, segment)`` pair packed into a 64-bit key
+  ``doc << 24 | segment``; each term maps to an ``array('Q')`` of keys, in
+  ascending order, with one entry per segment containing the term;
+* a document keeps a reference to the transcript's ``starts_ms`` column, so
+  hit timestamps cost no extra memory.
+
+A query matches segments containing *all* of its terms.  The rarest term's
+postings drive the search and the other terms are checked by binary search,
+so the cost depends on the rarest term, not the corpus size.  Videos are
+ranked by the summed inverse segment frequency of the terms, weighted by how
+many of their segments match; within a video, hits are in time order.
+
+Writers are serialised by a lock (indexing runs on a worker thread); readers
+do not lock.  A writer registers a document before appending its postings,
+so every posting a reader sees refers to a known document; a video being
+indexed may briefly match only some of its segments.  Compaction builds new
+tables and swaps them in with a single assignment, and a search works on
+the tables it started with.
+
+The index persists to a local file with `save` / `load` (pickle; only load
+files this service wrote).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.models.compact import CompactTranscript
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_BITS = 24
+_SEGMENT_MASK = (1 << _SEGMENT_BITS) - 1
+_TOKEN = re.compile(r"\w+")
+FORMAT_VERSION = 2
+# Version 1 files lack the digests; their videos are simply re-indexed once.
+_READABLE_VERSIONS = (1, FORMAT_VERSION)
+# Compact the live index once at least this many documents are tombstones
+# and they make up at least a quarter of all document numbers.
+COMPACT_MIN_TOMBSTONES = 32
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+@dataclass
+class CorpusHit:
+    """One matching segment."""
+
+    video_id: str
+    segment: int
+    start: float
+    score: float
+
+
+class CorpusIndex:
+    """Term → (video, segment) inverted index; see module docstring."""
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, array] = {}
+        self._doc_ids: List[Optional[str]] = []  # document number → video ID (None: tombstone)
+        self._doc_starts: List[Optional[array]] = []
+        # The three tables above, published together for lock-free readers.
+        self._tables = (self._postings, self._doc_ids, self._doc_starts)
+        self._doc_of: Dict[str, int] = {}  # video ID → live document number
+        self._digests: Dict[str, str] = {}  # video ID → digest of the indexed transcript
+        self._segments = 0  # live segments, for inverse segment frequency
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._doc_of
+
+    # --- writing ---------------------------------------------------------
+    def add(self, video_id: str, transcript: CompactTranscript) -> None:
+        """Index (or re-index) ``video_id``; blocking, call from a worker thread.
+
+        Re-adding a transcript with the same content is a no-op.
+        """
+        if len(transcript) > _SEGMENT_MASK:
+            logger.warning("Not indexing %s: %d segments exceeds the index limit", video_id, len(transcript))
+            return
+        digest = transcript.digest
+        with self._lock:
+            if video_id in self._doc_of and self._digests.get(video_id) == digest:
+                return
+            self._remove_locked(video_id)
+            if self._should_compact_locked():
+                self._compact_locked()
+            doc = len(self._doc_ids)
+            # Register the document first: readers resolve every posting
+            # they find through _doc_ids.
+            self._doc_ids.append(video_id)
+            self._doc_starts.append(transcript.starts_ms)
+            base = doc << _SEGMENT_BITS
+            postings = self._postings
+            for segment, text in enumerate(transcript.texts()):
+                key = base | segment
+                for term in set(tokenize(text)):
+                    posting = postings.get(term)
+                    if posting is None:
+                        posting = postings[term] = array("Q")
+                    posting.append(key)
+            self._doc_of[video_id] = doc
+            self._digests[video_id] = digest
+            self._segments += len(transcript)
+
+    def remove(self, video_id: str) -> None:
+        with self._lock:
+            self._remove_locked(video_id)
+
+    def _remove_locked(self, video_id: str) -> None:
+        doc = self._doc_of.pop(video_id, None)
+        self._digests.pop(video_id, None)
+        if doc is not None:
+            self._segments -= len(self._doc_starts[doc])
+            self._doc_ids[doc] = None
+            self._doc_starts[doc] = None
+
+    def _should_compact_locked(self) -> bool:
+        tombstones = len(self._doc_ids) - len(self._doc_of)
+        return tombstones >= COMPACT_MIN_TOMBSTONES and tombstones * 4 >= len(self._doc_ids)
+
+    def _compacted_locked(self):
+        """Postings and document tables renumbered without tombstones."""
+        renumber = {old: new for new, old in enumerate(sorted(self._doc_of.values()))}
+        postings: Dict[str, array] = {}
+        for term, posting in self._postings.items():
+            kept = array(
+                "Q",
+                (renumber[key >> _SEGMENT_BITS] << _SEGMENT_BITS | (key & _SEGMENT_MASK)
+                 for key in posting if (key >> _SEGMENT_BITS) in renumber),
+            )
+            if kept:
+                postings[term] = kept
+        doc_ids = [self._doc_ids[old] for old in renumber]
+        doc_starts = [self._doc_starts[old] for old in renumber]
+        return postings, doc_ids, doc_starts
+
+    def _compact_locked(self) -> None:
+        postings, doc_ids, doc_starts = self._compacted_locked()
+        self._postings, self._doc_ids, self._doc_starts = postings, doc_ids, doc_starts
+        self._doc_of = {video_id: doc for doc, video_id in enumerate(doc_ids)}
+        self._tables = (postings, doc_ids, doc_starts)
+
+    def compact(self) -> None:
+        """Drop tombstoned documents and their postings from the live index."""
+        with self._lock:
+            self._compact_locked()
+
+    # --- reading ---------------------------------------------------------
+    def search(self, query: str, limit: int = 20, per_video: int = 3, max_candidates: int = 20_000) -> List[CorpusHit]:
+        """Ranked segments containing every term of ``query``.
+
+        At most ``max_candidates`` postings of the rarest term are examined,
+        which bounds the latency of queries made only of very common words.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        postings, doc_ids, doc_starts = self._tables
+        lists = []
+        for term in terms:
+            posting = postings.get(term)
+            if not posting:
+                return []
+            lists.append((len(posting), term, posting))
+        lists.sort()
+        total = max(self._segments, 1)
+        weight = sum(math.log(1 + total / count) for count, _, _ in lists)
+
+        # doc → matching segments, in segment order
+        matches: Dict[int, List[int]] = {}
+        driver = lists[0][2]
+        others = [posting for _, _, posting in lists[1:]]
+        for key in driver[:max_candidates]:
+            if all(_contains(posting, key) for posting in others):
+                doc = key >> _SEGMENT_BITS
+                if doc_ids[doc] is not None:
+                    matches.setdefault(doc, []).append(key & _SEGMENT_MASK)
+
+        ranked = sorted(matches.items(), key=lambda item: (-len(item[1]), item[0]))
+        hits: List[CorpusHit] = []
+        for doc, segments in ranked:
+            video_id, starts = doc_ids[doc], doc_starts[doc]
+            if video_id is None or starts is None:  # removed while we were searching
+                continue
+            score = weight * (1 + math.log(len(segments)))
+            for segment in segments[:per_video]:
+                hits.append(CorpusHit(video_id, segment, starts[segment] / 1000, round(score, 4)))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "videos": len(self._doc_of),
+            "segments": self._segments,
+            "terms": len(self._postings),
+            "postings": sum(len(p) for p in self._postings.values()),
+            "tombstones": len(self._doc_ids) - len(self._doc_of),
+        }
+
+    # --- persistence -----------------------------------------------------
+    def save(self, path: str) -> None:
+        """Write a compacted copy (tombstones dropped) atomically to ``path``."""
+        with self._lock:
+            postings, doc_ids, doc_starts = self._compacted_locked()
+            state = {
+                "version": FORMAT_VERSION,
+                "doc_ids": doc_ids,
+                "digests": [self._digests.get(video_id) for video_id in doc_ids],
+                "doc_starts": [starts.tobytes() for starts in doc_starts],
+                "postings": {term: posting.tobytes() for term, posting in postings.items()},
+            }
+        # A private temp file per call: several workers may save the same path.
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False
+        ) as fh:
+            try:
+                pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                fh.close()
+                os.unlink(fh.name)
+                raise
+        os.replace(fh.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CorpusIndex":
+        with open(path, "rb") as fh:
+            state = pickle.load(fh)  # noqa: S301 – our own file
+        if state.get("version") not in _READABLE_VERSIONS:
+            raise ValueError(f"unsupported corpus index version {state.get('version')!r}")
+        index = cls()
+        digests = state.get("digests") or [None] * len(state["doc_ids"])
+        for doc, (video_id, starts, digest) in enumerate(zip(state["doc_ids"], state["doc_starts"], digests)):
+            column = array("I")
+            column.frombytes(starts)
+            index._doc_ids.append(video_id)
+            index._doc_starts.append(column)
+            index._doc_of[video_id] = doc
+            if digest is not None:
+                index._digests[video_id] = digest
+            index._segments += len(column)
+        for term, raw in state["postings"].items():
+            posting = array("Q")
+            posting.frombytes(raw)
+            index._postings[term] = posting
+        return index
+
+
+def _contains(posting: array, key: int) -> bool:
+    i = bisect_left(posting, key)
+    return i < len(posting) and posting[i] == key
+
+
+def load_or_create(path: Optional[str]) -> CorpusIndex:
+    if path and os.path.exists(path):
+        started = time.perf_counter()
+        try:
+            index = CorpusIndex.load(path)
+        except (OSError, ValueError, pickle.UnpicklingError, KeyError) as exc:
+            logger.warning("Could not load corpus index from %s (%s); starting empty", path, exc)
+        else:
+            logger.info("Loaded corpus index (%d videos) in %.2fs", len(index), time.perf_counter() - started)
+            return index
+    return CorpusIndex()
+
+
+@lru_cache()
+def get_corpus_index() -> CorpusIndex:
+    """Process-wide corpus index, loaded from ``corpus_index_path`` if present."""
+    return load_or_create(settings.corpus_index_path)
@@ -0,0 +1,141 @@
+"""Render cached transcripts into response bodies.
+
+Every renderer works directly on a `CompactTranscript`.  The JSON renderers
+keep the `TranscriptResponse` schema (``{"video_id": ..., "transcript":
+[...]}``) but build the body with one C-level ``json.dumps`` over plain
+dicts instead of validating and serialising Pydantic models, and plain text
+is a single ``decode`` of the transcript's text buffer.
+
+The ``stream_*`` formatters (text, SRT, WebVTT, NDJSON) yield the body in
+chunks of `CHUNK_SEGMENTS` segments for a `StreamingResponse`, so the first
+bytes go out at once and the memory used while rendering does not grow with
+the transcript length.  Cue timestamps are built from a precomputed
+``MM:SS`` table plus integer arithmetic on the millisecond columns.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Callable, Dict, Iterator, Tuple
+
+from app.models.compact import CompactTranscript
+from app.utils.profiling import span
+
+CHUNK_SEGMENTS = 256
+
+_MM_SS = [f"{m:02d}:{s:02d}" for m in range(60) for s in range(60)]
+
+
+def _json_str(value: str) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def render_segments_json(transcript: CompactTranscript) -> bytes:
+    """The ``transcript`` array as compact UTF-8 JSON."""
+    with span("render.json"):
+        return json.dumps(transcript.to_dicts(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def render_json_response(video_id: str, transcript: CompactTranscript) -> bytes:
+    """Body of ``GET /transcripts/{video_id}?format=json``."""
+    return b'{"video_id":' + _json_str(video_id) + b',"transcript":' + render_segments_json(transcript) + b"}"
+
+
+def render_body(video_id: str, transcript: CompactTranscript, format: str) -> bytes:
+    """Complete response body in ``format`` (``json`` or one of the `STREAM_FORMATS`)."""
+    if format == "json":
+        return render_json_response(video_id, transcript)
+    stream, _ = STREAM_FORMATS[format]
+    return b"".join(stream(transcript))
+
+
+def render_text(transcript: CompactTranscript) -> str:
+    """Plain text, one segment per line (same output as the library's `TextFormatter`)."""
+    return transcript.text[:-1].decode("utf-8")
+
+
+def render_ok_record(video_id: str, transcript: CompactTranscript, fmt: str) -> bytes:
+    """One successful bulk/playlist record (a JSON object, no trailing newline)."""
+    if fmt == "text":
+        body = _json_str(render_text(transcript))
+    else:
+        body = render_segments_json(transcript)
+    return b'{"video_id":' + _json_str(video_id) + b',"status":"ok","transcript":' + body + b"}"
+
+
+# --- streaming formatters ---------------------------------------------------
+def _timestamp(ms: int, separator: str) -> str:
+    seconds, millis = divmod(ms, 1000)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours:02d}:{_MM_SS[rest]}{separator}{millis:03d}"
+
+
+def _chunks(transcript: CompactTranscript) -> Iterator[Tuple[int, int]]:
+    for i in range(0, len(transcript), CHUNK_SEGMENTS):
+        yield i, min(i + CHUNK_SEGMENTS, len(transcript))
+
+
+def stream_text(transcript: CompactTranscript) -> Iterator[bytes]:
+    """`render_text` in chunks: slices of the text buffer, no re-encoding."""
+    offsets, text = transcript.offsets, transcript.text
+    for i, j in _chunks(transcript):
+        end = offsets[j] - 1 if j == len(transcript) else offsets[j]  # no trailing newline
+        yield text[offsets[i]:end]
+
+
+def _cue_end(starts, durations, n: int) -> int:
+    """End of cue ``n``, clipped to the next cue's start when they overlap (as the library does)."""
+    end = starts[n] + durations[n]
+    if n + 1 < len(starts) and starts[n + 1] < end:
+        return starts[n + 1]
+    return end
+
+
+def stream_srt(transcript: CompactTranscript) -> Iterator[bytes]:
+    """SubRip cues (same output as the library's `SRTFormatter`)."""
+    starts, durations = transcript.starts_ms, transcript.durations_ms
+    for i, j in _chunks(transcript):
+        cues = [
+            f"{n + 1}\n{_timestamp(starts[n], ',')} --> {_timestamp(_cue_end(starts, durations, n), ',')}\n"
+            f"{transcript.text_at(n)}\n"
+            for n in range(i, j)
+        ]
+        yield "\n".join(cues).encode("utf-8") + (b"\n" if j < len(transcript) else b"")
+
+
+def _vtt_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def stream_vtt(transcript: CompactTranscript) -> Iterator[bytes]:
+    """WebVTT document (the library's `WebVTTFormatter` layout), with cue text
+    escaped so captions cannot inject markup."""
+    yield b"WEBVTT\n\n"
+    starts, durations = transcript.starts_ms, transcript.durations_ms
+    for i, j in _chunks(transcript):
+        cues = [
+            f"{_timestamp(starts[n], '.')} --> {_timestamp(_cue_end(starts, durations, n), '.')}\n"
+            f"{_vtt_escape(transcript.text_at(n))}\n"
+            for n in range(i, j)
+        ]
+        yield "\n".join(cues).encode("utf-8") + (b"\n" if j < len(transcript) else b"")
+
+
+def stream_ndjson(transcript: CompactTranscript) -> Iterator[bytes]:
+    """One ``{"text", "start", "duration"}`` object per line."""
+    starts, durations = transcript.starts_ms, transcript.durations_ms
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for i, j in _chunks(transcript):
+        yield "".join(
+            f'{{"text":{dumps(transcript.text_at(n))},"start":{starts[n] / 1000!r},"duration":{durations[n] / 1000!r}}}\n'
+            for n in range(i, j)
+        ).encode("utf-8")
+
+
+# format → (chunk generator, media type)
+STREAM_FORMATS: Dict[str, Tuple[Callable[[CompactTranscript], Iterator[bytes]], str]] = {
+    "text": (stream_text, "text/plain; charset=utf-8"),
+    "srt": (stream_srt, "application/x-subrip; charset=utf-8"),
+    "vtt": (stream_vtt, "text/vtt; charset=utf-8"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
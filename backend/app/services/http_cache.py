@@ -0,0 +1,81 @@
+"""HTTP caching helpers: ETags, conditional requests and precompressed bodies.
+
+A transcript response is fully determined by the transcript's content, the
+output format, the time window and the content-coding, so its ETag is
+derived from `CompactTranscript.digest` – computed once per cached
+transcript and also stored as a small cache record of its own – without
+rendering the body.  Each content-coding gets its own strong ETag (RFC 9110,
+8.8.3).  A matching ``If-None-Match`` is answered with 304 from the digest
+alone.
+
+Compressed variants are produced once per transcript and format and kept
+next to the transcript in L1 (see `TranscriptService.encoded_body`), so the
+compression cost is paid per transcript, not per request.  Brotli is used
+when the optional ``brotli`` package is installed; gzip otherwise.
+"""
+
+from __future__ import annotations
+
+import gzip
+from typing import Callable, Dict, Optional, Sequence
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover – depends on the environment
+    brotli = None
+
+# Content-Encoding -> compressor, in order of server preference.
+ENCODINGS: Dict[str, Callable[[bytes], bytes]] = {}
+if brotli is not None:
+    ENCODINGS["br"] = lambda body: brotli.compress(body, quality=9)
+ENCODINGS["gzip"] = lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+
+# Bodies this small are not worth a Content-Encoding.
+MIN_COMPRESS_BYTES = 512
+
+
+def etag(digest: str, *parts: object) -> str:
+    """Strong ETag for a representation of the content ``digest``."""
+    suffix = "-".join("" if part is None else str(part) for part in parts)
+    return f'"{digest}-{suffix}"' if suffix else f'"{digest}"'
+
+
+def matching_etag(if_none_match: Optional[str], current: Sequence[str]) -> Optional[str]:
+    """The tag in ``current`` that an ``If-None-Match`` header matches, if any.
+
+    ``current`` lists the tags of every variant of the resource as it is now
+    (e.g. one per content-coding); the 304 carries the matched one, so a
+    cache knows which stored variant it revalidated.  Weak comparison, as
+    RFC 9110 requires for ``If-None-Match``.
+    """
+    if not if_none_match or not current:
+        return None
+    if if_none_match.strip() == "*":
+        return current[0]
+    sent = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    for tag in current:
+        if tag.removeprefix("W/") in sent:
+            return tag
+    return None
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding the client accepts (q > 0), or ``None``."""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    candidates = [name for name in ENCODINGS if accepted.get(name, wildcard) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda name: accepted.get(name, wildcard))
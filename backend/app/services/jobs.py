@@ -0,0 +1,454 @@
+"""Background jobs for bulk and playlist transcript retrieval.
+
+Requests too large for one HTTP response are submitted as jobs, processed
+by a pool of worker tasks and read back in pages.  Redis is both the queue
+and the result store, so any process sharing the Redis instance can serve
+the job API (``memory://`` works for a single process and the tests).
+
+Keys (``{id}`` is the job ID)::
+
+    job:v1:{id}           hash  – status, kind, format, counters, heartbeat
+    job:v1:{id}:input     list  – video IDs to process, in order
+    job:v1:{id}:results   list  – one JSON record per processed video
+    jobs:v1:queue         list  – job IDs waiting for a worker
+    jobs:v1:processing    list  – job IDs claimed by a worker
+
+A worker moves a job from the queue to ``processing`` (``LMOVE``) and works
+through the input in chunks of ``job_chunk_size``.  After each chunk the
+chunk's records and the new ``processed`` offset are written in one
+transaction – the checkpoint.  Workers refresh the job's heartbeat while
+they run; a job in ``processing`` whose heartbeat is older than
+``job_lease_seconds`` belonged to a worker that died, and is put back on
+the queue to be resumed from its last checkpoint.  Checkpoints and the
+final status are only written while the job's ``owner`` is still the
+writing worker (checked under ``WATCH``), so a worker that merely stalled
+past its lease cannot clobber the job its successor is running.
+
+Playlist jobs first list the playlist into the input list (1 quota unit per
+50 videos); a job interrupted while listing lists again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from redis.exceptions import WatchError
+
+from app.cache.redis_cache import RedisCache
+from app.core.config import settings
+from app.services.transcript_service import BulkItem, TranscriptService, get_transcript_service
+from app.services.youtube_client import YouTubeClient, get_youtube_client
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL = frozenset({DONE, FAILED, CANCELLED})
+
+KIND_BULK = "bulk"
+KIND_PLAYLIST = "playlist"
+
+# Renders one processed video as a JSON record (see `app.api.routes.transcripts.bulk_record`).
+RecordRenderer = Callable[[BulkItem, str], bytes]
+
+
+class JobNotFound(Exception):
+    """No job with this ID (or it has expired)."""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"No job with ID {job_id}")
+        self.job_id = job_id
+
+
+@dataclass
+class Job:
+    """Snapshot of a job's hash."""
+
+    job_id: str
+    kind: str
+    status: str
+    format: str
+    playlist_id: Optional[str]
+    total: Optional[int]
+    processed: int
+    ok: int
+    failed: int
+    created_at: float
+    updated_at: float
+    heartbeat: float
+    owner: Optional[str]
+    listed: bool
+    error: Optional[str]
+
+    @classmethod
+    def from_hash(cls, job_id: str, raw: Dict[bytes, bytes]) -> "Job":
+        fields = {key.decode(): value.decode("utf-8") for key, value in raw.items()}
+        return cls(
+            job_id=job_id,
+            kind=fields["kind"],
+            status=fields["status"],
+            format=fields["format"],
+            playlist_id=fields.get("playlist_id") or None,
+            total=int(fields["total"]) if fields.get("total") else None,
+            processed=int(fields.get("processed", 0)),
+            ok=int(fields.get("ok", 0)),
+            failed=int(fields.get("failed", 0)),
+            created_at=float(fields["created_at"]),
+            updated_at=float(fields["updated_at"]),
+            heartbeat=float(fields.get("heartbeat", 0)),
+            owner=fields.get("owner") or None,
+            listed=fields.get("listed") == "1",
+            error=fields.get("error") or None,
+        )
+
+    def public(self) -> Dict[str, Any]:
+        """The fields exposed by the API (`app.models.job.JobStatus`)."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "format": self.format,
+            "total": self.total,
+            "processed": self.processed,
+            "ok": self.ok,
+            "failed": self.failed,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """Job state, queue and results in Redis (see module docstring)."""
+
+    PREFIX = "job:v1:"
+    QUEUE = "jobs:v1:queue"
+    PROCESSING = "jobs:v1:processing"
+
+    def __init__(self, client: Any = None, result_ttl_seconds: int | None = None):
+        self.client = client if client is not None else RedisCache().client
+        self.result_ttl_seconds = result_ttl_seconds or settings.job_result_ttl_seconds
+
+    def key(self, job_id: str) -> str:
+        return f"{self.PREFIX}{job_id}"
+
+    def input_key(self, job_id: str) -> str:
+        return f"{self.PREFIX}{job_id}:input"
+
+    def results_key(self, job_id: str) -> str:
+        return f"{self.PREFIX}{job_id}:results"
+
+    # --- API side ----------------------------------------------------------
+    async def submit(
+        self, format: str, video_ids: Optional[List[str]] = None, playlist_id: Optional[str] = None
+    ) -> Job:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        fields: Dict[str, Any] = {
+            "kind": KIND_PLAYLIST if playlist_id else KIND_BULK,
+            "status": QUEUED,
+            "format": format,
+            "playlist_id": playlist_id or "",
+            "processed": 0,
+            "ok": 0,
+            "failed": 0,
+            "created_at": now,
+            "updated_at": now,
+            "heartbeat": now,
+        }
+        async with self.client.pipeline(transaction=True) as pipe:
+            if video_ids is not None:
+                unique = list(dict.fromkeys(video_ids))
+                fields.update(total=len(unique), listed=1)
+                pipe.rpush(self.input_key(job_id), *unique)
+            pipe.hset(self.key(job_id), mapping=fields)
+            pipe.lpush(self.QUEUE, job_id)
+            await pipe.execute()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Job:
+        raw = await self.client.hgetall(self.key(job_id))
+        if not raw:
+            raise JobNotFound(job_id)
+        return Job.from_hash(job_id, raw)
+
+    async def results(self, job_id: str, offset: int, limit: int) -> List[bytes]:
+        return await self.client.lrange(self.results_key(job_id), offset, offset + limit - 1)
+
+    async def cancel(self, job_id: str) -> Job:
+        job = await self.get(job_id)
+        if job.status not in TERMINAL:
+            await self.client.hset(self.key(job_id), mapping={"status": CANCELLED, "updated_at": time.time()})
+            if job.status == QUEUED:
+                # never claimed: clean up now, no worker will
+                await self.client.lrem(self.QUEUE, 0, job_id)
+                await self._expire(job_id)
+        return await self.get(job_id)
+
+    # --- worker side -------------------------------------------------------
+    async def claim(self) -> Optional[str]:
+        """Move the oldest queued job to ``processing``; ``None`` if the queue is empty."""
+        job_id = await self.client.lmove(self.QUEUE, self.PROCESSING, "RIGHT", "LEFT")
+        return job_id.decode() if job_id is not None else None
+
+    async def start(self, job_id: str, owner: str) -> Job:
+        now = time.time()
+        job = await self.get(job_id)
+        if job.status in (QUEUED, RUNNING):
+            await self.client.hset(
+                self.key(job_id), mapping={"status": RUNNING, "owner": owner, "heartbeat": now, "updated_at": now}
+            )
+            job = await self.get(job_id)
+        return job
+
+    async def heartbeat(self, job_id: str) -> None:
+        await self.client.hset(self.key(job_id), "heartbeat", time.time())
+
+    async def list_input(self, job_id: str, pages: Any) -> int:
+        """Replace the job's input with the (de-duplicated) IDs of ``pages``."""
+        await self.client.delete(self.input_key(job_id))
+        seen: set[str] = set()
+        async for page in pages:
+            fresh = [video_id for video_id in dict.fromkeys(page) if video_id not in seen]
+            seen.update(fresh)
+            if fresh:
+                await self.client.rpush(self.input_key(job_id), *fresh)
+            await self.heartbeat(job_id)
+        await self.client.hset(self.key(job_id), mapping={"total": len(seen), "listed": 1})
+        return len(seen)
+
+    async def next_chunk(self, job_id: str, offset: int, size: int) -> List[str]:
+        ids = await self.client.lrange(self.input_key(job_id), offset, offset + size - 1)
+        return [video_id.decode() for video_id in ids]
+
+    async def _write_if_owner(self, job_id: str, owner: Optional[str], write: Callable[[Any], None]) -> bool:
+        """Run ``write(pipe)`` in a transaction if ``owner`` still holds the job.
+
+        ``owner=None`` writes unconditionally.  Returns ``False`` (writing
+        nothing) when another worker has taken the job over.
+        """
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    if owner is not None:
+                        await pipe.watch(self.key(job_id))
+                        current = await pipe.hget(self.key(job_id), "owner")
+                        if current is None or current.decode() != owner:
+                            await pipe.reset()
+                            return False
+                        pipe.multi()
+                    write(pipe)
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue  # the job hash changed under us (e.g. a heartbeat); check again
+
+    async def checkpoint(
+        self, job_id: str, records: List[bytes], ok: int, failed: int, owner: Optional[str] = None
+    ) -> bool:
+        """Append a chunk's records and advance the counters in one transaction.
+
+        Returns ``False`` without writing if ``owner`` lost the job.
+        """
+        now = time.time()
+
+        def write(pipe: Any) -> None:
+            if records:
+                pipe.rpush(self.results_key(job_id), *records)
+            pipe.hincrby(self.key(job_id), "processed", ok + failed)
+            pipe.hincrby(self.key(job_id), "ok", ok)
+            pipe.hincrby(self.key(job_id), "failed", failed)
+            pipe.hset(self.key(job_id), mapping={"heartbeat": now, "updated_at": now})
+
+        return await self._write_if_owner(job_id, owner, write)
+
+    async def finish(
+        self, job_id: str, status: str, error: Optional[str] = None, owner: Optional[str] = None
+    ) -> bool:
+        """Record the final status and clean up; ``False`` (nothing written) if ``owner`` lost the job."""
+        fields: Dict[str, Any] = {"updated_at": time.time()}
+        job = await self.get(job_id)
+        if job.status != CANCELLED:
+            fields["status"] = status
+        if error:
+            fields["error"] = error
+
+        def write(pipe: Any) -> None:
+            pipe.hset(self.key(job_id), mapping=fields)
+            pipe.lrem(self.PROCESSING, 0, job_id)
+            self._queue_expire(pipe, job_id)
+
+        return await self._write_if_owner(job_id, owner, write)
+
+    async def release(self, job_id: str) -> None:
+        """Hand an unfinished job back to the queue (worker shutting down)."""
+        if await self.client.lrem(self.PROCESSING, 0, job_id):
+            await self.client.rpush(self.QUEUE, job_id)
+
+    async def requeue_stale(self, lease_seconds: float) -> List[str]:
+        """Queue again the jobs whose worker stopped sending heartbeats."""
+        requeued: List[str] = []
+        cutoff = time.time() - lease_seconds
+        for raw in await self.client.lrange(self.PROCESSING, 0, -1):
+            job_id = raw.decode()
+            heartbeat = await self.client.hget(self.key(job_id), "heartbeat")
+            if heartbeat is not None and float(heartbeat) > cutoff:
+                continue
+            # LREM decides the race between several workers reaping at once.
+            if not await self.client.lrem(self.PROCESSING, 1, job_id) or heartbeat is None:
+                continue  # another worker got there first, or the job has expired
+            # A fresh heartbeat keeps the job from being reaped again before it is claimed.
+            await self.heartbeat(job_id)
+            await self.client.rpush(self.QUEUE, job_id)
+            requeued.append(job_id)
+        if requeued:
+            logger.warning("Requeued %d job(s) whose worker stopped: %s", len(requeued), requeued)
+        return requeued
+
+    async def _expire(self, job_id: str) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            self._queue_expire(pipe, job_id)
+            await pipe.execute()
+
+    def _queue_expire(self, pipe: Any, job_id: str) -> None:
+        pipe.delete(self.input_key(job_id))
+        for key in (self.key(job_id), self.results_key(job_id)):
+            pipe.expire(key, self.result_ttl_seconds)
+
+
+class JobRunner:
+    """Pool of worker tasks executing jobs from a `JobStore`."""
+
+    def __init__(
+        self,
+        render: RecordRenderer,
+        store: JobStore | None = None,
+        service: TranscriptService | None = None,
+        client: YouTubeClient | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        lease_seconds: float | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.render = render
+        self.store = store or get_job_store()
+        self.service = service or get_transcript_service()
+        self._client = client
+        self.workers = settings.job_workers if workers is None else workers
+        self.chunk_size = chunk_size or settings.job_chunk_size
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.poll_interval = poll_interval or settings.job_poll_interval_seconds
+        self._tasks: List[asyncio.Task] = []
+        self.completed = 0
+
+    @property
+    def client(self) -> YouTubeClient:
+        return self._client or get_youtube_client()
+
+    def start(self) -> None:
+        self._tasks = [asyncio.ensure_future(self._work(n)) for n in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, number: int) -> None:
+        while True:
+            try:
+                await self.store.requeue_stale(self.lease_seconds)
+                if await self.process_next() is None:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # keep the worker alive; the job itself records its failure
+                logger.exception("Job worker %d hit an unexpected error", number)
+                await asyncio.sleep(self.poll_interval)
+
+    async def process_next(self) -> Optional[str]:
+        """Claim and run one job; returns its ID, or ``None`` if none was queued."""
+        job_id = await self.store.claim()
+        if job_id is not None:
+            await self.run(job_id)
+        return job_id
+
+    async def run(self, job_id: str) -> None:
+        owner = uuid.uuid4().hex
+        try:
+            job = await self.store.start(job_id, owner)
+        except JobNotFound:
+            await self.store.client.lrem(self.store.PROCESSING, 0, job_id)
+            return
+        beat = asyncio.ensure_future(self._heartbeat(job_id))
+        try:
+            if job.status == RUNNING:
+                if not await self._execute(job):
+                    logger.warning("Job %s: lease lost to another worker, leaving it to them", job_id)
+                    return
+                finished = await self.store.finish(job_id, DONE, owner=owner)
+            else:  # cancelled (or finished) before a worker got to it
+                finished = await self.store.finish(job_id, job.status, owner=owner)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.store.release(job_id))
+            raise
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            finished = await self.store.finish(job_id, FAILED, error=f"{type(exc).__name__}: {exc}", owner=owner)
+        finally:
+            beat.cancel()
+            with suppress(asyncio.CancelledError):
+                await beat
+        if finished:
+            self.completed += 1
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self.store.heartbeat(job_id)
+
+    async def _execute(self, job: Job) -> bool:
+        """Process the job from its last checkpoint; ``False`` if another worker took it over."""
+        if job.kind == KIND_PLAYLIST and not job.listed:
+            total = await self.store.list_input(job.job_id, self.client.playlist_pages(job.playlist_id))
+            logger.info("Job %s: playlist %s has %d videos", job.job_id, job.playlist_id, total)
+
+        processed = job.processed  # resume from the last checkpoint
+        if processed:
+            logger.info("Job %s: resuming at video %d", job.job_id, processed)
+        while True:
+            current = await self.store.get(job.job_id)
+            if current.owner != job.owner:
+                return False
+            if current.status != RUNNING:
+                return True  # cancelled
+            video_ids = await self.store.next_chunk(job.job_id, processed, self.chunk_size)
+            if not video_ids:
+                return True
+            records: List[bytes] = []
+            ok = failed = 0
+            async for item in self.service.get_many(video_ids):
+                records.append(self.render(item, job.format))
+                if item.error is None:
+                    ok += 1
+                else:
+                    failed += 1
+            if not await self.store.checkpoint(job.job_id, records, ok, failed, owner=job.owner):
+                return False
+            processed += len(video_ids)
+
+
+@lru_cache()
+def get_job_store() -> JobStore:
+    """Process-wide job store on the shared Redis client."""
+    return JobStore()
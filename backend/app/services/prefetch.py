@@ -0,0 +1,248 @@
+"""Start-up cache warm-up and scheduled prefetch of watched playlists.
+
+`Prefetcher` runs as one background task:
+
+1. **Warm-up** – the configured hot video IDs are loaded into the cache
+   through `TranscriptService.get_many` (cache hits cost nothing).  Until it
+   finishes, or ``warmup_timeout_seconds`` pass, `warming_up` is true and
+   ``/health`` answers 503, so a load balancer keeps the instance out of
+   rotation while its cache is cold.
+2. **Prefetch cycles** – every ``prefetch_interval_seconds`` the watched
+   playlists (and the uploads playlists of watched channels) are listed
+   through `YouTubeClient`, and transcripts of videos not yet cached are
+   fetched.
+
+Prefetching is background work and yields to live traffic:
+
+* before every fetch it waits until the upstream executor has headroom
+  (`UpstreamExecutor.has_headroom`) – no queued callers and
+  ``prefetch_headroom`` slots left free – and defers the rest of the cycle
+  if none opens up within ``prefetch_max_wait_seconds``;
+* a cycle stops early on upstream overload, throttling or timeouts, and
+  when the Data API quota left for the day drops below
+  ``prefetch_quota_reserve``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from youtube_transcript_api import NoTranscriptFound, TooManyRequests, TranscriptsDisabled
+
+from app.core.config import settings
+from app.models.tracks import DEFAULT_SELECTION
+from app.services.transcript_service import TranscriptNotFound, TranscriptService, get_transcript_service
+from app.services.upstream import UpstreamOverloaded, UpstreamTimeout
+from app.services.youtube_client import YouTubeAPIError, YouTubeClient, get_youtube_client
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the rest of a cycle is deferred: upstream is busy or unhappy.
+_BACK_OFF = (UpstreamOverloaded, UpstreamTimeout, TooManyRequests)
+# Answers that are final for a video (and cached as negative entries).
+_NO_TRANSCRIPT = (TranscriptsDisabled, TranscriptNotFound, NoTranscriptFound)
+
+
+def uploads_playlist(channel_id: str) -> str:
+    """The uploads playlist of a channel (``UC…`` → ``UU…``); costs no quota to derive."""
+    return "UU" + channel_id[2:] if channel_id.startswith("UC") else channel_id
+
+
+def load_hot_ids(video_ids: Iterable[str], path: Optional[str] = None) -> List[str]:
+    """Configured hot IDs plus those in ``path`` (one per line, ``#`` comments), deduplicated."""
+    ids = list(video_ids)
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            ids.extend(line.split("#", 1)[0].strip() for line in fh)
+    return list(dict.fromkeys(video_id for video_id in ids if video_id))
+
+
+class _Deferred(Exception):
+    """Raised inside a cycle to stop it until the next interval."""
+
+
+class Prefetcher:
+    """Warm-up followed by periodic prefetch cycles; see module docstring."""
+
+    def __init__(
+        self,
+        service: TranscriptService | None = None,
+        client: YouTubeClient | None = None,
+        playlists: Iterable[str] | None = None,
+        hot_ids: Iterable[str] = (),
+        interval: float | None = None,
+        concurrency: int | None = None,
+        max_videos: int | None = None,
+        quota_reserve: int | None = None,
+        headroom: int | None = None,
+        warmup_timeout: float | None = None,
+        max_wait: float | None = None,
+        poll_interval: float = 0.2,
+    ):
+        self.service = service or get_transcript_service()
+        self._client = client
+        if playlists is None:
+            playlists = [*settings.prefetch_playlists, *map(uploads_playlist, settings.prefetch_channels)]
+        self.playlists = list(dict.fromkeys(playlists))
+        self.hot_ids = list(hot_ids)
+        self.interval = interval if interval is not None else settings.prefetch_interval_seconds
+        self.concurrency = concurrency or settings.prefetch_concurrency
+        self.max_videos = max_videos or settings.prefetch_max_videos
+        self.quota_reserve = settings.prefetch_quota_reserve if quota_reserve is None else quota_reserve
+        self.headroom = settings.prefetch_headroom if headroom is None else headroom
+        self.warmup_timeout = warmup_timeout or settings.warmup_timeout_seconds
+        self.max_wait = settings.prefetch_max_wait_seconds if max_wait is None else max_wait
+        self.poll_interval = poll_interval
+        self.warming_up = bool(self.hot_ids)
+        self._seen: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.counters: Dict[str, int] = {
+            "warmed": 0, "cycles": 0, "listed": 0, "already_cached": 0,
+            "prefetched": 0, "no_transcript": 0, "failed": 0, "deferred": 0,
+        }
+        self.last_cycle_at: Optional[float] = None
+
+    @property
+    def client(self) -> YouTubeClient:
+        return self._client or get_youtube_client()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hot_ids or self.playlists)
+
+    def start(self) -> None:
+        if self.enabled:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.warming_up = False
+
+    async def _run(self) -> None:
+        if self.hot_ids:
+            try:
+                await asyncio.wait_for(self.warm_up(self.hot_ids), self.warmup_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Warm-up did not finish within %.0fs; reporting healthy anyway", self.warmup_timeout)
+            finally:
+                self.warming_up = False
+        while self.playlists:
+            try:
+                await self.run_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # keep the scheduler alive; the next cycle retries
+                logger.exception("Prefetch cycle failed")
+            await asyncio.sleep(self.interval)
+
+    # --- warm-up -------------------------------------------------------------
+    async def warm_up(self, video_ids: List[str]) -> None:
+        started = time.monotonic()
+        failed = 0
+        async for item in self.service.get_many(video_ids):
+            if item.error is None:
+                self.counters["warmed"] += 1
+            else:
+                failed += 1
+        logger.info(
+            "Warm-up loaded %d of %d hot transcripts in %.1fs (%d failed)",
+            self.counters["warmed"], len(video_ids), time.monotonic() - started, failed,
+        )
+
+    # --- prefetch cycles -----------------------------------------------------
+    async def run_cycle(self) -> None:
+        """List every watched playlist once and prefetch its uncached videos."""
+        self.counters["cycles"] += 1
+        self.last_cycle_at = time.time()
+        try:
+            for playlist_id in self.playlists:
+                await self._prefetch_playlist(playlist_id)
+        except _Deferred as exc:
+            self.counters["deferred"] += 1
+            logger.info("Prefetch cycle deferred: %s", exc)
+
+    async def _prefetch_playlist(self, playlist_id: str) -> None:
+        considered = 0
+        pages = self.client.playlist_pages(playlist_id)
+        try:
+            while considered < self.max_videos:
+                if self.client.quota.remaining < self.quota_reserve:
+                    raise _Deferred("Data API quota reserve reached")
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    return
+                except YouTubeAPIError as exc:
+                    if exc.status_code in (403, 429) or exc.status_code >= 500:
+                        raise _Deferred(f"listing {playlist_id} failed: {exc}") from None
+                    logger.warning("Not prefetching playlist %s: %s", playlist_id, exc)
+                    return
+                page = page[: self.max_videos - considered]
+                considered += len(page)
+                self.counters["listed"] += len(page)
+                await self._prefetch_videos(page)
+        finally:
+            await pages.aclose()
+
+    async def _prefetch_videos(self, video_ids: List[str]) -> None:
+        fresh = [video_id for video_id in dict.fromkeys(video_ids) if video_id not in self._seen]
+        cached = await self.service.cache.get_many([DEFAULT_SELECTION.cache_id(v) for v in fresh])
+        self.counters["already_cached"] += len(cached)
+        self._seen.update(cached)
+        missing = [video_id for video_id in fresh if video_id not in cached]
+        if not missing:
+            return
+        todo = iter(missing)
+        deferred: List[_Deferred] = []
+
+        async def worker() -> None:
+            for video_id in todo:
+                if deferred:
+                    return
+                try:
+                    await self._prefetch(video_id)
+                except _Deferred as exc:
+                    deferred.append(exc)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        if deferred:
+            raise deferred[0]
+
+    async def _wait_for_headroom(self) -> None:
+        deadline = time.monotonic() + self.max_wait
+        while not self.service.executor.has_headroom(self.service.UPSTREAM, self.headroom):
+            if time.monotonic() >= deadline:
+                raise _Deferred(f"no upstream headroom within {self.max_wait:.0f}s")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _prefetch(self, video_id: str) -> None:
+        await self._wait_for_headroom()
+        try:
+            await self.service.get(video_id)
+        except _NO_TRANSCRIPT:
+            self.counters["no_transcript"] += 1
+        except _BACK_OFF as exc:
+            raise _Deferred(f"upstream busy ({type(exc).__name__})") from None
+        except Exception as exc:
+            self.counters["failed"] += 1
+            logger.warning("Prefetching %s failed: %r", video_id, exc)
+            return
+        else:
+            self.counters["prefetched"] += 1
+        self._seen.add(video_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "warming_up": self.warming_up,
+            "playlists": len(self.playlists),
+            "hot_ids": len(self.hot_ids),
+            "last_cycle_at": self.last_cycle_at,
+            **self.counters,
+        }
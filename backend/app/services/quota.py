@@ -0,0 +1,112 @@
+"""Daily quota accounting for the YouTube Data API.
+
+Every Data API method has a fixed cost in quota units (``search.list`` 100,
+most ``*.list`` calls 1) and a project gets 10,000 units per day by default.
+The budget resets at midnight Pacific time.  `QuotaLedger` charges each call
+just before it is sent, so once the budget is exhausted the client refuses
+locally instead of spending the remaining day collecting ``quotaExceeded``
+errors.  Calls refused locally for any other reason (open circuit, full
+queue) are never charged.
+
+The ledger is per process; with several workers, configure each one with
+its share of the project budget.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+try:
+    _QUOTA_TZ: Optional[dt.tzinfo] = ZoneInfo("America/Los_Angeles")
+except ZoneInfoNotFoundError:  # pragma: no cover – minimal images without tzdata
+    _QUOTA_TZ = None  # fall back to UTC days
+
+# Units charged per request, by resource (https://developers.google.com/youtube/v3/determine_quota_cost).
+QUOTA_COSTS: Dict[str, int] = {
+    "search": 100,
+    "videos": 1,
+    "playlistItems": 1,
+    "playlists": 1,
+    "channels": 1,
+}
+
+
+class QuotaExhausted(Exception):
+    """The call would exceed the remaining daily budget."""
+
+    def __init__(self, resource: str, cost: int, remaining: int):
+        super().__init__(f"Daily quota budget exhausted: {resource} costs {cost}, {remaining} units left")
+        self.resource = resource
+        self.cost = cost
+        self.remaining = remaining
+
+
+def _quota_day(now: dt.datetime) -> dt.date:
+    return now.astimezone(_QUOTA_TZ).date() if _QUOTA_TZ is not None else now.date()
+
+
+class QuotaLedger:
+    """Charges Data API calls against a daily unit budget."""
+
+    def __init__(
+        self,
+        daily_budget: int = 10_000,
+        costs: Optional[Dict[str, int]] = None,
+        clock: Callable[[], dt.datetime] = lambda: dt.datetime.now(dt.timezone.utc),
+    ):
+        self.daily_budget = daily_budget
+        self.costs = costs if costs is not None else QUOTA_COSTS
+        self._clock = clock
+        self._day = _quota_day(clock())
+        self.used = 0
+        self.by_resource: Counter[str] = Counter()
+        self.refused = 0
+
+    def cost(self, resource: str) -> int:
+        return self.costs.get(resource, 1)
+
+    def _roll_over(self) -> None:
+        day = _quota_day(self._clock())
+        if day != self._day:
+            logger.info("Quota day %s closed with %d/%d units used", self._day, self.used, self.daily_budget)
+            self._day = day
+            self.used = 0
+            self.by_resource.clear()
+
+    @property
+    def remaining(self) -> int:
+        self._roll_over()
+        return max(0, self.daily_budget - self.used)
+
+    def check(self, resource: str) -> int:
+        """Raise `QuotaExhausted` if one call of ``resource`` does not fit; books nothing."""
+        cost = self.cost(resource)
+        remaining = self.remaining
+        if cost > remaining:
+            self.refused += 1
+            raise QuotaExhausted(resource, cost, remaining)
+        return cost
+
+    def charge(self, resource: str) -> int:
+        """Book one call of ``resource``; raises `QuotaExhausted` if it does not fit."""
+        cost = self.check(resource)
+        self.used += cost
+        self.by_resource[resource] += cost
+        return cost
+
+    def snapshot(self) -> Dict[str, Any]:
+        remaining = self.remaining
+        return {
+            "day": self._day.isoformat(),
+            "budget": self.daily_budget,
+            "used": self.used,
+            "remaining": remaining,
+            "by_resource": dict(self.by_resource),
+            "refused": self.refused,
+        }
@@ -0,0 +1,185 @@
+"""Token-bucket rate limiting, shared across workers through Redis.
+
+Every (client, route class) pair owns a bucket holding up to ``burst``
+tokens and refilling at ``rate`` tokens per second; a request takes ``cost``
+tokens (one per request, or one per video for bulk endpoints) or is refused
+with the time until enough tokens will be available.
+
+`RedisRateLimiter` keeps buckets in Redis and updates them with one Lua
+script, so the read-refill-take-write sequence is atomic across Uvicorn
+workers and costs a single round trip (``EVALSHA``).  `LocalRateLimiter`
+applies the same arithmetic to an in-process dict, for single-process
+deployments and for ``REDIS_URL=memory://``.
+
+Limiting protects upstream capacity but must not take the API down with it:
+when Redis fails, requests are let through (and counted).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from redis.exceptions import RedisError
+
+from app.cache.local_redis import LocalRedis
+from app.cache.redis_cache import RedisCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] bucket; ARGV rate (tokens/s), burst, cost, now (s).  Returns
+# {allowed, tokens left, retry after (s)}; floats as strings, since Lua
+# numbers are truncated to integers on the way back.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+if now > ts then
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    ts = now
+end
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(ts))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+# Route classes, each with its own bucket per client.
+DEFAULT = "default"
+BULK = "bulk"  # charged per video
+SEARCH = "search"  # every call spends Data API quota
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Bucket parameters: ``rate`` tokens per second, at most ``burst`` stored."""
+
+    rate: float
+    burst: int
+
+    @classmethod
+    def per_minute(cls, per_minute: float, burst: int) -> "Limit":
+        return cls(per_minute / 60.0, burst)
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    remaining: float
+    retry_after: float  # seconds; 0 when allowed
+
+
+def take(tokens: float, ts: float, now: float, limit: Limit, cost: float) -> Tuple[Decision, float, float]:
+    """Refill a bucket to ``now`` and try to take ``cost``; returns the decision and new state.
+
+    Mirrors `_TAKE_SCRIPT`.
+    """
+    if now > ts:
+        tokens = min(limit.burst, tokens + (now - ts) * limit.rate)
+        ts = now
+    if tokens >= cost:
+        return Decision(True, tokens - cost, 0.0), tokens - cost, ts
+    return Decision(False, tokens, (cost - tokens) / limit.rate), tokens, ts
+
+
+class LocalRateLimiter:
+    """In-process buckets (single event loop, so no locking is needed)."""
+
+    MAX_BUCKETS = 100_000
+
+    def __init__(self, limits: Iterable[Limit] = ()) -> None:
+        self._buckets: Dict[str, List[float]] = {}
+        # A bucket idle this long is full again under every configured limit.
+        self._full_after = max((limit.burst / limit.rate for limit in limits), default=0.0)
+        self.refused = 0
+
+    async def hit(self, key: str, limit: Limit, cost: float) -> Decision:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        tokens, ts = (bucket[0], bucket[1]) if bucket is not None else (float(limit.burst), now)
+        decision, tokens, ts = take(tokens, ts, now, limit, cost)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._prune(now, limit)
+            self._buckets[key] = [tokens, ts]
+        else:
+            bucket[0], bucket[1] = tokens, ts
+        if not decision.allowed:
+            self.refused += 1
+        return decision
+
+    def _prune(self, now: float, limit: Limit) -> None:
+        """Forget buckets that would be full again by now (they hold no state).
+
+        Buckets of every route class share the dict, so the horizon is the
+        slowest configured refill, not that of the request that triggered
+        the prune.
+        """
+        full_after = max(self._full_after, limit.burst / limit.rate)
+        self._buckets = {key: b for key, b in self._buckets.items() if now - b[1] < full_after}
+
+    def stats(self) -> Dict[str, int]:
+        return {"backend": "local", "buckets": len(self._buckets), "refused": self.refused}
+
+
+class RedisRateLimiter:
+    """Buckets in Redis under ``ratelimit:v1:<key>``, updated by `_TAKE_SCRIPT`."""
+
+    PREFIX = "ratelimit:v1:"
+
+    def __init__(self, client=None) -> None:
+        self.client = client or RedisCache().client
+        self._script = self.client.register_script(_TAKE_SCRIPT)
+        self.refused = 0
+        self.errors = 0
+
+    async def hit(self, key: str, limit: Limit, cost: float) -> Decision:
+        try:
+            allowed, remaining, retry_after = await self._script(
+                keys=[self.PREFIX + key], args=[limit.rate, limit.burst, cost, time.time()]
+            )
+        except (RedisError, OSError) as exc:
+            self.errors += 1
+            logger.warning("Rate limit check failed, letting the request through: %s", exc)
+            return Decision(True, math.inf, 0.0)
+        if not allowed:
+            self.refused += 1
+        return Decision(bool(allowed), float(remaining), float(retry_after))
+
+    def stats(self) -> Dict[str, int]:
+        return {"backend": "redis", "refused": self.refused, "errors": self.errors}
+
+
+def configured_limits() -> Dict[str, Limit]:
+    """Per route class limits from `settings`."""
+    return {
+        DEFAULT: Limit.per_minute(settings.rate_limit_per_minute, settings.rate_limit_burst),
+        BULK: Limit.per_minute(settings.rate_limit_bulk_items_per_minute, settings.rate_limit_bulk_burst),
+        SEARCH: Limit.per_minute(settings.rate_limit_search_per_minute, settings.rate_limit_search_burst),
+    }
+
+
+@lru_cache()
+def get_rate_limiter():
+    """Process-wide limiter; local when configured so or when Redis is the in-memory stand-in."""
+    client = RedisCache().client
+    if settings.rate_limit_backend == "local" or isinstance(client, LocalRedis):
+        return LocalRateLimiter(configured_limits().values())
+    return RedisRateLimiter(client)
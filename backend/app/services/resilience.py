@@ -0,0 +1,158 @@
+"""Failure handling primitives for upstream lanes.
+
+Two small state machines, both driven by the outcome of each upstream call
+(see `UpstreamExecutor`):
+
+* `AIMDLimiter` – adaptive concurrency.  The allowed number of concurrent
+  calls grows by roughly one per "window" of successful calls (additive
+  increase) and is halved on a failure or a latency spike (multiplicative
+  decrease), between ``min_limit`` and ``max_limit``.
+* `CircuitBreaker` – after ``failure_threshold`` consecutive failures the
+  circuit *opens* and calls are refused immediately for ``reset_seconds``;
+  then a single trial call is let through (*half-open*) which either closes
+  the circuit again or re-opens it.
+
+Neither class is thread-safe; both are only touched from the event loop.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit."""
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        latency_target: Optional[float] = None,
+        backoff: float = 0.5,
+        cooldown_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._limit = float(max_limit)
+        self._last_decrease = -math.inf
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self, latency: float) -> None:
+        if self.latency_target is not None and latency > self.latency_target:
+            self._decrease()
+            return
+        if self._limit < self.max_limit:
+            # +1 after about `limit` successes, i.e. once per round of calls.
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self.increases += 1
+
+    def on_failure(self) -> None:
+        self._decrease()
+
+    def _decrease(self) -> None:
+        # Calls that were already in flight when trouble started fail
+        # together; count them as one congestion signal, not many.
+        now = self._clock()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        self.decreases += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+            self._state = HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial call through."""
+        return max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now (claims the probe when half-open)."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def on_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probing = False
+        self._state = CLOSED
+
+    def on_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._probing or self.consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def on_ignored(self) -> None:
+        """The call finished without telling us anything about upstream health."""
+        if self._probing:
+            self._probing = False
+
+    def _trip(self) -> None:
+        if self._state != OPEN:
+            self.opened += 1
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probing = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "short_circuited": self.short_circuited,
+            "retry_after": round(self.retry_after(), 1) if state == OPEN else 0.0,
+        }
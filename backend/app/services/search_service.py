@@ -0,0 +1,119 @@
+"""YouTube search backed by `SearchCache`.
+
+Each ``search.list`` call costs 100 quota units, so pages are served from the
+search cache whenever an equivalent request (see `search_key`) was answered
+recently, concurrent identical searches share one call, and – with
+``search_prefetch_next_page`` (off by default: every prefetch is a
+speculative 100-unit call) – the page after the one just served is
+fetched in the background so that "next page" clicks are cache hits.
+Prefetching pauses while less than ``search_prefetch_quota_reserve`` units
+of the day's quota remain.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.cache.search_cache import SearchCache, get_search_cache, search_key
+from app.core.config import settings
+from app.services.singleflight import SingleFlight
+from app.services.youtube_client import YouTubeClient, get_youtube_client
+
+logger = logging.getLogger(__name__)
+
+Page = Dict[str, Any]
+
+
+def _video(item: Dict[str, Any]) -> Dict[str, Any]:
+    snippet = item.get("snippet", {})
+    thumbnails = snippet.get("thumbnails", {})
+    thumbnail = thumbnails.get("high") or thumbnails.get("medium") or thumbnails.get("default") or {}
+    return {
+        "id": item["id"]["videoId"],
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description"),
+        "published_at": snippet.get("publishedAt"),
+        "channel_id": snippet.get("channelId"),
+        "channel_title": snippet.get("channelTitle"),
+        "thumbnail_url": thumbnail.get("url"),
+    }
+
+
+class SearchService:  # noqa: D101
+    def __init__(self, client: YouTubeClient | None = None, cache: SearchCache | None = None):
+        self.client = client or get_youtube_client()
+        self.cache = cache or get_search_cache()
+        self.prefetch_next_page = settings.search_prefetch_next_page
+        self.prefetch_quota_reserve = settings.search_prefetch_quota_reserve
+        self.inflight: SingleFlight[Page] = SingleFlight()
+        self._prefetching: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+
+    async def search(self, query: str, max_results: int = 25, page_token: Optional[str] = None) -> Page:
+        """One page of results: ``items``, ``next_page_token``, ``prev_page_token``, ``total_results``."""
+        search_id = search_key(query, maxResults=max_results, pageToken=page_token)
+        page = await self.cache.get(search_id)
+        if page is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            page = await self.inflight.do(
+                search_id, lambda: self._fetch_and_cache(search_id, query, max_results, page_token)
+            )
+        if self.prefetch_next_page and page.get("next_page_token"):
+            self._prefetch(query, max_results, page["next_page_token"])
+        return page
+
+    async def _fetch_and_cache(
+        self, search_id: str, query: str, max_results: int, page_token: Optional[str]
+    ) -> Page:
+        payload = await self.client.search(query, max_results=max_results, page_token=page_token)
+        page = {
+            "items": [_video(item) for item in payload.get("items", []) if item.get("id", {}).get("videoId")],
+            "next_page_token": payload.get("nextPageToken"),
+            "prev_page_token": payload.get("prevPageToken"),
+            "total_results": payload.get("pageInfo", {}).get("totalResults"),
+        }
+        await self.cache.set(search_id, page, paged=page_token is not None)
+        return page
+
+    def _prefetch(self, query: str, max_results: int, page_token: str) -> None:
+        quota = self.client.quota
+        if quota.remaining - quota.cost("search") < self.prefetch_quota_reserve:
+            return  # keep what is left of the day's budget for searches users actually make
+        search_id = search_key(query, maxResults=max_results, pageToken=page_token)
+        if search_id in self._prefetching:
+            return
+        task = asyncio.ensure_future(self._prefetch_page(search_id, query, max_results, page_token))
+        self._prefetching[search_id] = task
+        task.add_done_callback(lambda done, search_id=search_id: self._prefetched(search_id, done))
+
+    async def _prefetch_page(self, search_id: str, query: str, max_results: int, page_token: str) -> None:
+        if await self.cache.get(search_id) is not None:
+            return
+        self.prefetches += 1
+        await self.inflight.do(search_id, lambda: self._fetch_and_cache(search_id, query, max_results, page_token))
+
+    def _prefetched(self, search_id: str, task: asyncio.Task) -> None:
+        self._prefetching.pop(search_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.info("Prefetch of search page %s failed: %r", search_id, task.exception())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "prefetches": self.prefetches,
+            "cache": self.cache.stats(),
+        }
+
+
+@lru_cache()
+def get_search_service() -> SearchService:
+    """Process-wide search service (FastAPI dependency)."""
+    return SearchService()
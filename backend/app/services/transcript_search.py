@@ -0,0 +1,62 @@
+"""Phrase search inside one cached transcript.
+
+The phrase is matched case-insensitively against the transcript's text
+buffer as a whole, with any run of whitespace or punctuation between its
+words, so a phrase split across two caption lines is still found.  Match
+positions are mapped back to segments by binary search over the segment
+offsets; for ASCII transcripts the buffer's byte offsets are used as they
+are, otherwise character offsets are derived once per search.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.models.compact import CompactTranscript
+
+
+@dataclass
+class PhraseMatch:
+    """Segments ``first``..``last`` (inclusive) contain one occurrence of the phrase."""
+
+    first: int
+    last: int
+
+
+def phrase_pattern(phrase: str) -> Optional[re.Pattern[str]]:
+    """Regex for ``phrase``, or ``None`` if it has no words."""
+    words = re.findall(r"\w+", phrase)
+    if not words:
+        return None
+    return re.compile(r"\b" + r"\W+".join(map(re.escape, words)) + r"\b", re.IGNORECASE)
+
+
+def _char_offsets(transcript: CompactTranscript, haystack: str) -> array:
+    if len(haystack) == len(transcript.text):  # ASCII: bytes == characters
+        return transcript.offsets
+    offsets, position = array("I", [0]), 0
+    for text in transcript.texts():
+        position += len(text) + 1
+        offsets.append(position)
+    return offsets
+
+
+def find_phrase(transcript: CompactTranscript, phrase: str, limit: int = 50) -> List[PhraseMatch]:
+    """Non-overlapping occurrences of ``phrase``, in time order."""
+    pattern = phrase_pattern(phrase)
+    if pattern is None or not len(transcript):
+        return []
+    haystack = transcript.text.decode("utf-8")
+    offsets = _char_offsets(transcript, haystack)
+    matches: List[PhraseMatch] = []
+    for found in pattern.finditer(haystack):
+        first = bisect_right(offsets, found.start()) - 1
+        last = bisect_right(offsets, found.end() - 1) - 1
+        matches.append(PhraseMatch(first, last))
+        if len(matches) >= limit:
+            break
+    return matches
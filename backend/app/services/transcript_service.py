@@ -1,17 +1,505 @@
-"""Wrapper around `youtube-transcript-api` (placeholder)."""
+"""Wrapper around `youtube-transcript-api`.
+
+All blocking library calls are executed through the shared
+`UpstreamExecutor` so that route handlers never block the event loop, and
+results are served read-through from the two-tier `TranscriptCache`.
+Concurrent cache misses for the same video share one upstream fetch through
+`SingleFlight`.
+
+Videos known to have no transcript are answered from a negative cache entry,
+and stale entries are served immediately while a single background task
+refreshes them (stale-while-revalidate).
+
+The caption-track list of every video seen is cached as well (see
+`app.models.tracks`): a request for another language downloads the chosen
+track directly instead of listing the tracks again.
+
+Every transcript fetched with the default selection is also added to the
+`CorpusIndex` (on a worker thread, after the response is on its way), which
+backs ``/corpus/search``.
+"""
 
 from __future__ import annotations
 
-from typing import List, Dict
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import requests
+from youtube_transcript_api import (
+    NoTranscriptAvailable,
+    TooManyRequests,
+    Transcript,
+    TranscriptsDisabled,
+    YouTubeRequestFailed,
+    YouTubeTranscriptApi,
+)
+from youtube_transcript_api import NoTranscriptFound as YTNoTranscriptFound
+
+from app.cache.transcript_cache import CacheEntry, TranscriptCache, get_transcript_cache
+from app.core.config import settings
+from app.models.compact import CompactTranscript
+from app.models.tracks import DEFAULT_SELECTION, PREFER_GENERATED, Selection, Track, select_track
+from app.services.corpus_index import CorpusIndex, get_corpus_index
+from app.services.formatters import STREAM_FORMATS, render_body, render_segments_json
+from app.services.http_cache import ENCODINGS, MIN_COMPRESS_BYTES
+from app.services.singleflight import SingleFlight
+from app.services.resilience import OPEN
+from app.services.upstream import UpstreamExecutor, get_upstream_executor
+from app.utils.metrics import TRANSCRIPT_BYTES, TRANSCRIPT_SEGMENTS, UPSTREAM_CALL_DURATION
+from app.utils.profiling import span
+
+logger = logging.getLogger(__name__)
+
+Segment = Dict[str, Any]
+
+NEGATIVE_DISABLED = "disabled"
+NEGATIVE_NOT_FOUND = "not_found"
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Errors that mean YouTube is throttling us or unreachable.
+
+    Everything else the library raises (transcripts disabled, no transcript
+    in that language, ...) is a normal answer and must not trip the breaker.
+    """
+    return isinstance(exc, (TooManyRequests, YouTubeRequestFailed, requests.RequestException))
+
+
+class TranscriptNotFound(Exception):
+    """Neither a manually created nor a generated transcript exists."""
+
+    def __init__(self, video_id: str):
+        super().__init__(f"No transcript found for video ID: {video_id}")
+        self.video_id = video_id
+
+
+@dataclass
+class BulkItem:
+    """Outcome for one video of a bulk request: the transcript or the error raised."""
+
+    video_id: str
+    transcript: Optional[CompactTranscript] = None
+    error: Optional[BaseException] = None
 
 
 class TranscriptService:  # noqa: D101
-    SUPPORTED_FORMATS = {"json", "text", "srt"}
+    SUPPORTED_FORMATS = {"json", *STREAM_FORMATS}
+    UPSTREAM = "youtube_transcripts"
+
+    def __init__(
+        self,
+        executor: UpstreamExecutor | None = None,
+        cache: TranscriptCache | None = None,
+        index: CorpusIndex | None = None,
+    ):
+        self.executor = executor or get_upstream_executor()
+        self.executor.classify(self.UPSTREAM, is_upstream_failure)
+        self.cache = cache or get_transcript_cache()
+        self.inflight: SingleFlight[CompactTranscript] = SingleFlight()
+        self.listing: SingleFlight[List[Track]] = SingleFlight()
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        self.revalidations = 0
+        if index is None and settings.corpus_index_enabled:
+            index = get_corpus_index()
+        self.index = index
+        self._indexing: set[asyncio.Future] = set()
+
+    async def get(self, video_id: str, selection: Selection = DEFAULT_SELECTION) -> CompactTranscript:
+        """Return the transcript in its cached form, fetching it if needed.
+
+        Every output format is rendered from the same cached transcript, so
+        the single-flight key only identifies the upstream resource;
+        concurrent ``json`` and ``text`` requests for one video share a
+        single fetch.
+
+        A cached negative outcome re-raises `TranscriptsDisabled` /
+        `TranscriptNotFound` without contacting YouTube; a stale transcript
+        is returned as-is and refreshed in the background.
+
+        ``selection`` picks the language / track kind; every distinct
+        selection is cached (and coalesced) on its own.
+        """
+        cache_id = selection.cache_id(video_id)
+        entry = await self.cache.get(cache_id)
+        if entry is None:
+            return await self.inflight.do(cache_id, lambda: self._fetch_and_cache(video_id, selection))
+        return self._resolve(video_id, entry, selection)
+
+    async def digest(self, video_id: str, selection: Selection = DEFAULT_SELECTION) -> Optional[str]:
+        """Content digest of the cached transcript, if known without loading it.
+
+        A stale entry is refreshed in the background, as in `get`.  ``None``
+        when nothing is cached; the caller then goes through `get`.
+        """
+        found = await self.cache.get_digest(selection.cache_id(video_id))
+        if found is None:
+            return None
+        digest, fetched_at = found
+        if time.time() - fetched_at >= self.cache.ttl_seconds:
+            self._revalidate(video_id, selection)
+        return digest
+
+    def _resolve(
+        self, video_id: str, entry: CacheEntry, selection: Selection = DEFAULT_SELECTION
+    ) -> CompactTranscript:
+        self._raise_negative(video_id, entry)
+        if not self.cache.is_fresh(entry):
+            self._revalidate(video_id, selection)
+        return entry.transcript
+
+    @staticmethod
+    def _raise_negative(video_id: str, entry: CacheEntry) -> None:
+        if entry.negative == NEGATIVE_DISABLED:
+            raise TranscriptsDisabled(video_id)
+        if entry.negative is not None:
+            raise TranscriptNotFound(video_id)
+
+    def _revalidate(self, video_id: str, selection: Selection) -> None:
+        """Refresh a stale entry in the background (one task per entry)."""
+        cache_id = selection.cache_id(video_id)
+        if cache_id in self._revalidating or self.executor.circuit_state(self.UPSTREAM) == OPEN:
+            # While the circuit is open the stale copy is the best answer we have.
+            return
+        self.revalidations += 1
+        task = asyncio.ensure_future(
+            self.inflight.do(cache_id, lambda: self._fetch_and_cache(video_id, selection))
+        )
+        self._revalidating[cache_id] = task
+        task.add_done_callback(lambda done, cache_id=cache_id: self._revalidated(cache_id, done))
+
+    def _revalidated(self, cache_id: str, task: asyncio.Task) -> None:
+        if self._revalidating.get(cache_id) is task:
+            del self._revalidating[cache_id]
+        if not task.cancelled() and task.exception() is not None:
+            # The stale copy keeps being served until it ages out.
+            logger.warning("Background refresh of %s failed: %r", cache_id, task.exception())
+
+    async def get_tracks(self, video_id: str) -> List[Track]:
+        """Return the caption tracks of ``video_id``, listing them if needed.
+
+        Any earlier transcript request for the video has already cached the
+        list, in which case this costs no upstream call.
+        """
+        tracks = await self.cache.get_tracks(video_id)
+        if tracks is not None:
+            return tracks
+        entry = await self.cache.get(video_id)
+        if entry is not None:
+            self._raise_negative(video_id, entry)
+        return await self.listing.do(video_id, lambda: self._list_and_cache(video_id))
+
+    async def _list_and_cache(self, video_id: str) -> List[Track]:
+        try:
+            with span("upstream"):
+                tracks = await self.executor.run(self.UPSTREAM, self._list_tracks_blocking, video_id)
+        except TranscriptsDisabled:
+            await self.cache.set_negative(video_id, NEGATIVE_DISABLED)
+            raise
+        except TranscriptNotFound:
+            await self.cache.set_negative(video_id, NEGATIVE_NOT_FOUND)
+            raise
+        await self.cache.set_tracks(video_id, tracks)
+        return tracks
+
+    async def get_segments(self, video_id: str, selection: Selection = DEFAULT_SELECTION) -> List[Segment]:
+        """Return parsed transcript segments, from cache when possible."""
+        return (await self.get(video_id, selection)).to_dicts()
+
+    async def get_json_body(self, video_id: str, selection: Selection = DEFAULT_SELECTION) -> bytes:
+        """Complete ``format=json`` response body for ``video_id``.
+
+        Rendered bodies of recently requested videos are kept as derived L1
+        entries, so repeated hits return stored bytes without re-encoding.
+        """
+        # Resolve first so negative and stale entries are handled as in `get`.
+        transcript = await self.get(video_id, selection)
+        return self.rendered_body(video_id, transcript, selection, "json")
+
+    def rendered_body(
+        self, video_id: str, transcript: CompactTranscript, selection: Selection, format: str
+    ) -> bytes:
+        """``format`` body of the cached ``transcript``, kept in L1 next to it.
+
+        Stored under the transcript's digest, so the body always matches the
+        ETag the route derives from that same digest.
+        """
+        cache_id = selection.cache_id(video_id)
+        body = self.cache.get_rendered(cache_id, transcript.digest, format)
+        if body is None:
+            body = render_body(video_id, transcript, format)
+            self.cache.set_rendered(cache_id, transcript.digest, format, body)
+        return body
+
+    def encoded_body(
+        self, video_id: str, transcript: CompactTranscript, selection: Selection, format: str, encoding: str
+    ) -> Optional[bytes]:
+        """``format`` body compressed with ``encoding`` (a key of `ENCODINGS`).
+
+        Compressed once per transcript and kept in L1 as a derived entry
+        under the transcript's digest, like `rendered_body`.  ``None`` when the body
+        is too small to be worth compressing.
+        """
+        cache_id = selection.cache_id(video_id)
+        variant = f"{format}.{encoding}"
+        body = self.cache.get_rendered(cache_id, transcript.digest, variant)
+        if body is None:
+            # Only JSON keeps its uncompressed body too; the streamed formats
+            # are served uncompressed without ever being joined.
+            if format == "json":
+                raw = self.rendered_body(video_id, transcript, selection, format)
+            else:
+                with span(f"render.{format}"):
+                    raw = render_body(video_id, transcript, format)
+            if len(raw) < MIN_COMPRESS_BYTES:
+                return None
+            with span(f"compress.{encoding}"):
+                body = ENCODINGS[encoding](raw)
+            self.cache.set_rendered(cache_id, transcript.digest, variant, body)
+        return body
+
+    async def _fetch_and_cache(self, video_id: str, selection: Selection = DEFAULT_SELECTION) -> CompactTranscript:
+        cache_id = selection.cache_id(video_id)
+        try:
+            segments = await self.fetch_segments(video_id, selection)
+        except TranscriptsDisabled:
+            await self.cache.set_negative(cache_id, NEGATIVE_DISABLED)
+            raise
+        except (TranscriptNotFound, YTNoTranscriptFound):
+            await self.cache.set_negative(cache_id, NEGATIVE_NOT_FOUND)
+            raise
+        with span("compact"):
+            transcript = CompactTranscript.from_segments(segments)
+        TRANSCRIPT_BYTES.observe(transcript.nbytes)
+        TRANSCRIPT_SEGMENTS.observe(len(transcript))
+        await self.cache.set(cache_id, transcript)
+        if self.index is not None and selection.is_default:
+            self._index(video_id, transcript)
+        return transcript
+
+    def _index(self, video_id: str, transcript: CompactTranscript) -> None:
+        """Add ``transcript`` to the corpus index without delaying the caller."""
+        future = asyncio.get_running_loop().run_in_executor(None, self.index.add, video_id, transcript)
+        self._indexing.add(future)
+        future.add_done_callback(self._indexed)
+
+    def _indexed(self, future: asyncio.Future) -> None:
+        self._indexing.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Indexing a transcript failed: %r", future.exception())
+
+    async def fetch_segments(self, video_id: str, selection: Selection = DEFAULT_SELECTION) -> List[Segment]:
+        """Fetch the raw transcript segments for ``video_id`` from YouTube.
+
+        With the video's track list cached the chosen track is downloaded
+        directly (one request); otherwise the tracks are listed first and
+        the list is cached for next time.
+
+        Raises the library's `TranscriptsDisabled` / `NoTranscriptFound`
+        unchanged, `TranscriptNotFound` when no track matches ``selection``,
+        and `UpstreamOverloaded` / `UpstreamTimeout` from the executor.
+        """
+        tracks = await self.cache.get_tracks(video_id)
+        if tracks:
+            choice = select_track(tracks, selection)
+            if choice is None:
+                raise TranscriptNotFound(video_id)
+            track, translate_to = choice
+            try:
+                with span("upstream"):
+                    return await self.executor.run(
+                        self.UPSTREAM, self._fetch_track_blocking, video_id, track, translate_to
+                    )
+            except YouTubeRequestFailed as exc:
+                # Track URLs are signed and eventually expire; list again.
+                logger.info("Cached track of %s could not be fetched (%s); listing again", video_id, exc)
+                await self.cache.delete_tracks(video_id)
+
+        with span("upstream"):
+            tracks, segments = await self.executor.run(
+                self.UPSTREAM, self._list_and_fetch_blocking, video_id, selection
+            )
+        if tracks:
+            await self.cache.set_tracks(video_id, tracks)
+        return segments
 
     async def get_transcript(self, video_id: str, fmt: str = "json") -> str:  # noqa: D401
         if fmt not in self.SUPPORTED_FORMATS:
             raise ValueError("Unsupported format")
-        raise NotImplementedError
+        transcript = await self.get(video_id)
+        if fmt == "json":
+            return render_segments_json(transcript).decode("utf-8")
+        stream, _ = STREAM_FORMATS[fmt]
+        return b"".join(stream(transcript)).decode("utf-8")
+
+    async def get_many(
+        self, video_ids: List[str], concurrency: int | None = None
+    ) -> AsyncIterator[BulkItem]:
+        """Yield a `BulkItem` per unique video ID as soon as it is available.
+
+        Cache hits are resolved with a single batched lookup and yielded
+        first; misses are fetched concurrently and yielded in completion
+        order.
+        """
+
+        async def single_page() -> AsyncIterator[List[str]]:
+            yield video_ids
+
+        async for item in self.stream_many(single_page(), concurrency=concurrency):
+            yield item
+
+    async def stream_many(
+        self,
+        id_pages: AsyncIterator[List[str]],
+        concurrency: int | None = None,
+        depth: int | None = None,
+    ) -> AsyncIterator[BulkItem]:
+        """Pipeline transcript retrieval over pages of video IDs.
+
+        Three stages run concurrently: a producer pulls the next page of IDs,
+        resolves its cache hits with one batched lookup and queues the
+        misses; ``concurrency`` workers fetch the misses; the caller consumes
+        results in completion order.  Both inter-stage queues hold at most
+        ``depth`` entries, so a slow consumer pauses listing and fetching and
+        memory stays flat no matter how many IDs the pages contain.
+
+        Duplicate IDs (within and across pages) are yielded once.  An error
+        raised by ``id_pages`` itself is re-raised after every item already
+        queued has been yielded.  Closing the generator early cancels all
+        outstanding work.
+        """
+        concurrency = concurrency or settings.bulk_concurrency
+        depth = depth or settings.pipeline_depth
+        todo: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=depth)
+        results: asyncio.Queue[Optional[BulkItem]] = asyncio.Queue(maxsize=depth)
+        listing_error: List[BaseException] = []
+
+        async def producer() -> None:
+            seen: set[str] = set()
+            try:
+                async for page in id_pages:
+                    fresh = [v for v in dict.fromkeys(page) if v not in seen]
+                    seen.update(fresh)
+                    cached = await self.cache.get_many(fresh)
+                    for video_id in fresh:
+                        if video_id not in cached:
+                            await todo.put(video_id)
+                            continue
+                        try:
+                            transcript = self._resolve(video_id, cached[video_id])
+                        except Exception as exc:
+                            await results.put(BulkItem(video_id, error=exc))
+                        else:
+                            await results.put(BulkItem(video_id, transcript=transcript))
+            except Exception as exc:
+                listing_error.append(exc)
+            finally:
+                for _ in range(concurrency):
+                    await todo.put(None)
+
+        async def worker() -> None:
+            while (video_id := await todo.get()) is not None:
+                try:
+                    transcript = await self.inflight.do(video_id, lambda: self._fetch_and_cache(video_id))
+                except Exception as exc:  # reported per item, never aborts the batch
+                    await results.put(BulkItem(video_id, error=exc))
+                else:
+                    await results.put(BulkItem(video_id, transcript=transcript))
+
+        async def supervisor() -> None:
+            await asyncio.gather(producer(), *(worker() for _ in range(concurrency)))
+            await results.put(None)
+
+        pipeline = asyncio.ensure_future(supervisor())
+        try:
+            while (item := await results.get()) is not None:
+                yield item
+            await pipeline
+            if listing_error:
+                raise listing_error[0]
+        finally:
+            pipeline.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the layers wrapped by this service (for monitoring)."""
+        return {
+            "cache": self.cache.stats(),
+            "singleflight": self.inflight.stats(),
+            "revalidations": self.revalidations,
+            "index": self.index.stats() if self.index is not None else None,
+            "upstream": self.executor.stats(),
+        }
+
+    # --- blocking helpers (run inside the executor) ---------------------
+    @staticmethod
+    def _list_blocking(video_id: str) -> Any:
+        try:
+            # This call itself can raise TranscriptsDisabled or other specific errors for invalid video IDs.
+            with UPSTREAM_CALL_DURATION.time("list_transcripts"), span("upstream.list"):
+                return YouTubeTranscriptApi.list_transcripts(video_id)
+        except NoTranscriptAvailable:
+            raise TranscriptNotFound(video_id) from None
+
+    @staticmethod
+    def _list_tracks_blocking(video_id: str) -> List[Track]:
+        return [Track.from_transcript(t) for t in TranscriptService._list_blocking(video_id)]
+
+    @staticmethod
+    def _fetch_track_blocking(video_id: str, track: Track, translate_to: Optional[str]) -> List[Segment]:
+        """Download a known track without listing the video's tracks again."""
+        transcript = Transcript(
+            requests.Session(),
+            video_id,
+            track.url,
+            track.language,
+            track.language_code,
+            track.is_generated,
+            track.translation_languages,
+        )
+        if translate_to is not None:
+            transcript = transcript.translate(translate_to)
+        with UPSTREAM_CALL_DURATION.time("fetch"), span("upstream.fetch"):
+            return transcript.fetch()
+
+    @staticmethod
+    def _list_and_fetch_blocking(video_id: str, selection: Selection) -> Tuple[List[Track], List[Segment]]:
+        """List the tracks, then resolve and download a transcript."""
+        transcript_list = TranscriptService._list_blocking(video_id)
+        tracks = [Track.from_transcript(t) for t in transcript_list]
+        codes = list(selection.languages) or list(dict.fromkeys(t.language_code for t in tracks))
+        finders = [transcript_list.find_manually_created_transcript, transcript_list.find_generated_transcript]
+        if selection.prefer == PREFER_GENERATED:
+            finders.reverse()
+
+        try:
+            # Attempt to find a transcript of the preferred kind (manual by default) first
+            transcript_to_fetch = finders[0](codes)
+        except YTNoTranscriptFound:
+            logger.info("No %s transcript found for video ID: %s. Trying the other kind.", selection.prefer, video_id)
+            try:
+                # If there is none, try the other kind
+                transcript_to_fetch = finders[1](codes)
+            except YTNoTranscriptFound:
+                # Finally, a translation into the first requested language
+                choice = select_track(tracks, selection)
+                if choice is None:
+                    raise TranscriptNotFound(video_id) from None
+                track, translate_to = choice
+                return tracks, TranscriptService._fetch_track_blocking(video_id, track, translate_to)
+
+        logger.info(
+            "Transcript found (type: %s) for video_id='%s'",
+            "generated" if transcript_to_fetch.is_generated else "manual",
+            video_id,
+        )
+        with UPSTREAM_CALL_DURATION.time("fetch"), span("upstream.fetch"):
+            return tracks, transcript_to_fetch.fetch()
+
 
-    async def get_many(self, video_ids: List[str], fmt: str = "json") -> Dict[str, str]:  # noqa: D401
-        raise NotImplementedError
+@lru_cache()
+def get_transcript_service() -> TranscriptService:
+    """Process-wide service instance (FastAPI dependency)."""
+    return TranscriptService()
@@ -0,0 +1,348 @@
+"""Bounded execution layer for blocking upstream calls.
+
+`youtube-transcript-api` is a synchronous library built on `requests`.  Calling
+it directly from an ``async def`` route stalls the whole event loop until
+YouTube answers, so every upstream call is funnelled through an
+`UpstreamExecutor` instead:
+
+* a dedicated thread pool (``upstream_max_workers``) runs the blocking calls;
+* each named upstream gets its own concurrency limit so one slow dependency
+  cannot monopolise the pool;
+* callers waiting for a slot are counted and rejected immediately with
+  `UpstreamOverloaded` once ``upstream_max_queue_depth`` is reached;
+* every call is bounded by a timeout and raises `UpstreamTimeout` when it
+  expires;
+* the per-upstream limit adapts to upstream health (`AIMDLimiter`): it is
+  halved on failures and latency spikes and grows back on success;
+* a `CircuitBreaker` per upstream refuses calls with `CircuitOpen` after
+  repeated failures, so a throttled upstream costs callers nothing until it
+  is probed again.
+
+Async upstreams (the Data API via `httpx`) share the same lanes through
+`UpstreamExecutor.call`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.services.resilience import OPEN, AIMDLimiter, CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UpstreamOverloaded(Exception):
+    """Raised when too many callers are already queued for an upstream."""
+
+    retry_after: float = 1.0
+
+    def __init__(self, upstream: str, queued: int):
+        super().__init__(f"Upstream '{upstream}' is overloaded ({queued} calls queued)")
+        self.upstream = upstream
+        self.queued = queued
+
+
+class CircuitOpen(UpstreamOverloaded):
+    """Raised without calling upstream while its circuit breaker is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        Exception.__init__(self, f"Upstream '{upstream}' is unavailable (circuit open, retry in {retry_after:.0f}s)")
+        self.upstream = upstream
+        self.queued = 0
+        self.retry_after = retry_after
+
+
+class UpstreamTimeout(Exception):
+    """Raised when a single upstream call exceeds its timeout."""
+
+    def __init__(self, upstream: str, timeout: float):
+        super().__init__(f"Upstream '{upstream}' did not answer within {timeout:.1f}s")
+        self.upstream = upstream
+        self.timeout = timeout
+
+
+def _every_error(exc: BaseException) -> bool:
+    return True
+
+
+@dataclass
+class _Lane:
+    """Concurrency, health and bookkeeping for a single named upstream."""
+
+    limiter: AIMDLimiter
+    breaker: CircuitBreaker
+    is_failure: Callable[[BaseException], bool] = _every_error
+    in_flight: int = 0
+    queued: int = 0
+    completed: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    _waiters: Deque["asyncio.Future[None]"] = field(default_factory=deque)
+
+    @property
+    def limit(self) -> int:
+        return self.limiter.limit
+
+    def saturated(self) -> bool:
+        return self.in_flight >= self.limit or bool(self._waiters)
+
+    async def acquire(self) -> None:
+        """Wait for a slot; slots are handed to waiters in FIFO order."""
+        if not self.saturated():
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()  # the slot was already ours; pass it on
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+        finally:
+            self.queued -= 1
+
+    def release(self, _future: Any = None) -> None:
+        self.completed += 1
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def record(self, latency: float, exc: Optional[BaseException]) -> None:
+        """Feed one call's outcome to the limiter and the breaker."""
+        if exc is not None and (isinstance(exc, UpstreamTimeout) or self.is_failure(exc)):
+            self.failures += 1
+            self.limiter.on_failure()
+            self.breaker.on_failure()
+        else:
+            # Includes "expected" errors such as a video without transcripts:
+            # upstream answered, so it is healthy.
+            self.limiter.on_success(latency)
+            self.breaker.on_success()
+        self._wake()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "limiter": self.limiter.snapshot(),
+            "circuit": self.breaker.snapshot(),
+        }
+
+
+class UpstreamExecutor:
+    """Run upstream calls with back-pressure, adaptive limits and a circuit breaker."""
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_concurrency: int = 8,
+        max_queue_depth: int = 64,
+        timeout_seconds: float = 15.0,
+        min_concurrency: int = 1,
+        latency_target_seconds: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+    ):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.timeout_seconds = timeout_seconds
+        self.min_concurrency = min_concurrency
+        self.latency_target_seconds = latency_target_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upstream")
+        self._lanes: Dict[str, _Lane] = {}
+        self._classifiers: Dict[str, Callable[[BaseException], bool]] = {}
+
+    def _lane(self, upstream: str) -> _Lane:
+        lane = self._lanes.get(upstream)
+        if lane is None:
+            lane = self._lanes[upstream] = _Lane(
+                limiter=AIMDLimiter(
+                    self.max_concurrency,
+                    min_limit=self.min_concurrency,
+                    latency_target=self.latency_target_seconds,
+                ),
+                breaker=CircuitBreaker(self.failure_threshold, self.reset_seconds),
+                is_failure=self._classifiers.get(upstream, _every_error),
+            )
+        return lane
+
+    def classify(self, upstream: str, is_failure: Callable[[BaseException], bool]) -> None:
+        """Declare which exceptions of ``upstream`` indicate an unhealthy upstream.
+
+        By default every exception counts; upstreams whose calls routinely
+        raise for ordinary answers (e.g. "this video has no transcript")
+        should narrow this down so those answers do not trip the breaker.
+        """
+        self._classifiers[upstream] = is_failure
+        if upstream in self._lanes:
+            self._lanes[upstream].is_failure = is_failure
+
+    def circuit_state(self, upstream: str) -> str:
+        return self._lane(upstream).breaker.state
+
+    def has_headroom(self, upstream: str, reserve: int = 1) -> bool:
+        """Whether a call could start now and still leave ``reserve`` slots free.
+
+        Background work checks this before each call so that it only uses
+        capacity live traffic is not asking for.  The reserve is clamped to
+        ``limit - 1``: on a lane narrower than the reserve an idle lane still
+        counts as headroom, otherwise background work could never start.
+        """
+        lane = self._lane(upstream)
+        reserve = max(0, min(reserve, lane.limit - 1))
+        return lane.breaker.state != OPEN and not lane.queued and lane.in_flight + 1 + reserve <= lane.limit
+
+    async def _admit(self, upstream: str) -> _Lane:
+        """Apply queue-depth and circuit checks, then wait for a slot."""
+        lane = self._lane(upstream)
+        if lane.saturated() and lane.queued >= self.max_queue_depth:
+            lane.rejected += 1
+            raise UpstreamOverloaded(upstream, lane.queued)
+        if not lane.breaker.allow():
+            lane.rejected += 1
+            raise CircuitOpen(upstream, lane.breaker.retry_after())
+        try:
+            await lane.acquire()
+        except BaseException:
+            lane.breaker.on_ignored()
+            raise
+        return lane
+
+    async def run(
+        self,
+        upstream: str,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Execute ``fn(*args, **kwargs)`` in the pool on behalf of ``upstream``.
+
+        The concurrency slot is held until the worker thread actually returns,
+        even if the caller already gave up because of a timeout – otherwise a
+        hung upstream could accumulate unbounded threads.
+        """
+
+        lane = await self._admit(upstream)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        timed_out = False
+
+        def finished(done: "asyncio.Future[T]") -> None:
+            if done.cancelled():
+                lane.breaker.on_ignored()
+            elif not timed_out:  # a timeout was already recorded as a failure
+                lane.record(loop.time() - started, done.exception())
+            lane.release()
+
+        try:
+            # Like asyncio.to_thread: the call sees the caller's context variables.
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(self._pool, functools.partial(context.run, fn, *args, **kwargs))
+        except BaseException:
+            lane.breaker.on_ignored()
+            lane.release()
+            raise
+        future.add_done_callback(finished)
+
+        effective_timeout = timeout if timeout is not None else self.timeout_seconds
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), effective_timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            raise self._timed_out(lane, upstream, effective_timeout) from None
+
+    async def call(
+        self,
+        upstream: str,
+        fn: Callable[..., Awaitable[T]],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Like `run`, for an upstream reached through a coroutine (e.g. `httpx`)."""
+
+        lane = await self._admit(upstream)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        effective_timeout = timeout if timeout is not None else self.timeout_seconds
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), effective_timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out(lane, upstream, effective_timeout) from None
+        except asyncio.CancelledError:
+            lane.breaker.on_ignored()
+            raise
+        except Exception as exc:
+            lane.record(loop.time() - started, exc)
+            raise
+        else:
+            lane.record(loop.time() - started, None)
+            return result
+        finally:
+            lane.release()
+
+    @staticmethod
+    def _timed_out(lane: _Lane, upstream: str, timeout: float) -> UpstreamTimeout:
+        exc = UpstreamTimeout(upstream, timeout)
+        lane.timeouts += 1
+        lane.record(timeout, exc)
+        logger.warning("Upstream call to %s timed out after %.1fs", upstream, timeout)
+        return exc
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return a snapshot of per-upstream counters (for monitoring)."""
+        return {name: lane.snapshot() for name, lane in self._lanes.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+@lru_cache()
+def get_upstream_executor() -> UpstreamExecutor:
+    """Process-wide executor built from `settings`."""
+    return UpstreamExecutor(
+        max_workers=settings.upstream_max_workers,
+        max_concurrency=settings.upstream_max_concurrency,
+        max_queue_depth=settings.upstream_max_queue_depth,
+        timeout_seconds=settings.upstream_timeout_seconds,
+        min_concurrency=settings.upstream_min_concurrency,
+        latency_target_seconds=settings.upstream_latency_target_seconds,
+        failure_threshold=settings.circuit_failure_threshold,
+        reset_seconds=settings.circuit_reset_seconds,
+    )
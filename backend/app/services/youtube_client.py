@@ -1,19 +1,278 @@
-"""Async YouTube Data API v3 client (placeholder).
+"""Async YouTube Data API v3 client.
 
-Will encapsulate authentication, quota monitoring, paging, and error
-handling.  The class is intentionally **not** implemented yet; call sites
-should import the class and expect `NotImplementedError` until Phase 2.
+Encapsulates authentication, paging and error handling on top of `httpx`.
+Pages are exposed as async generators so that callers can start working on
+the first page while the next one is still being listed.
+
+Requests go through the shared `UpstreamExecutor` (``youtube_data_api``
+lane), so they are subject to its adaptive concurrency limit and circuit
+breaker like transcript fetches are.
+
+Quota is the scarce resource, so the client economises on calls:
+
+* one pooled `httpx.AsyncClient` is kept for the life of the process;
+* every call is charged to a `QuotaLedger` once the executor has admitted
+  it, just before it is sent – calls refused locally (open circuit, full
+  queue) cost nothing, and a call that would not fit the remaining budget
+  is refused before it even queues;
+* ``videos.list`` lookups are batched up to the API's 50-ID maximum – both
+  explicitly (`get_videos`) and by coalescing concurrent `get_video` calls
+  made within ``youtube_api_batch_window_seconds``;
+* responses are remembered with their ETag and re-requested with
+  ``If-None-Match``, so an unchanged resource comes back as an empty 304.
 """
 
 from __future__ import annotations
 
+import asyncio
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from app.cache.memory_cache import ByteLRUCache
+from app.core.config import settings
+from app.services.quota import QuotaExhausted, QuotaLedger
+from app.services.upstream import UpstreamExecutor, UpstreamOverloaded, UpstreamTimeout, get_upstream_executor
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+MAX_PAGE_SIZE = 50  # hard limit of the Data API for list endpoints
+
+
+class YouTubeAPIError(Exception):
+    """Non-success answer from the Data API, a transport error or a missing key."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"YouTube Data API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+def is_data_api_failure(exc: BaseException) -> bool:
+    """Transport errors, throttling and server errors count against the breaker."""
+    if isinstance(exc, YouTubeAPIError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return isinstance(exc, httpx.HTTPError)
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        return response.json()["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        return response.text[:200]
+
 
 class YouTubeClient:  # noqa: D101
-    def __init__(self, api_key: str):
+    UPSTREAM = "youtube_data_api"
+    VIDEO_PARTS = "snippet,contentDetails,statistics"
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = API_BASE_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        executor: UpstreamExecutor | None = None,
+        quota: QuotaLedger | None = None,
+        batch_window_seconds: float | None = None,
+    ):
         self.api_key = api_key
+        self.executor = executor or get_upstream_executor()
+        self.executor.classify(self.UPSTREAM, is_data_api_failure)
+        self.quota = quota or QuotaLedger(settings.youtube_quota_daily_budget)
+        self.batch_window_seconds = (
+            batch_window_seconds if batch_window_seconds is not None else settings.youtube_api_batch_window_seconds
+        )
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=settings.youtube_api_timeout_seconds,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=settings.youtube_api_max_connections,
+                max_keepalive_connections=settings.youtube_api_max_connections,
+            ),
+        )
+        # (ETag, parsed payload) of previous answers, keyed by request.
+        self._etags: ByteLRUCache[Tuple[str, Dict[str, Any]]] = ByteLRUCache(settings.youtube_api_etag_cache_bytes)
+        # part -> video ID -> futures of the `get_video` callers waiting for it
+        self._pending: Dict[str, Dict[str, List["asyncio.Future[Optional[Dict[str, Any]]]"]]] = {}
+        self._flush_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._batches: Set["asyncio.Task[None]"] = set()
+        self.requests = 0
+        self.not_modified = 0
+
+    async def _get(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET ``resource``; the returned payload may be shared – do not mutate it."""
+        if not self.api_key:
+            raise YouTubeAPIError(503, "YouTube API key is not configured")
+        try:
+            self.quota.check(resource)
+        except QuotaExhausted as exc:
+            raise YouTubeAPIError(403, str(exc)) from exc
+
+        cache_key = f"{resource}?{urlencode(sorted(params.items()))}"
+        cached = self._etags.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached is not None else {}
+        try:
+            response = await self.executor.call(self.UPSTREAM, self._request, resource, params, headers)
+        except httpx.HTTPError as exc:
+            raise YouTubeAPIError(503, f"{type(exc).__name__}: {exc}") from exc
+        except (UpstreamOverloaded, UpstreamTimeout) as exc:
+            raise YouTubeAPIError(503, str(exc)) from exc
+        except QuotaExhausted as exc:  # spent by a concurrent call while this one queued
+            raise YouTubeAPIError(403, str(exc)) from exc
+
+        if response.status_code == 304 and cached is not None:
+            self.not_modified += 1
+            return cached[1]
+        if response.status_code != 200:
+            raise YouTubeAPIError(response.status_code, _error_message(response))
+        payload = response.json()
+        etag = response.headers.get("ETag") or payload.get("etag")
+        if etag:
+            self._etags.set(cache_key, (etag, payload), size=len(response.content))
+        return payload
+
+    async def _request(self, resource: str, params: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        # Charged only here, once admitted: locally refused calls cost nothing.
+        self.quota.charge(resource)
+        self.requests += 1
+        response = await self._http.get(f"/{resource}", params={**params, "key": self.api_key}, headers=headers)
+        if response.status_code == 429 or response.status_code >= 500:
+            # Raised inside the executor call so the breaker sees it.
+            raise YouTubeAPIError(response.status_code, _error_message(response))
+        return response
+
+    # --- search ----------------------------------------------------------
+    async def search(
+        self,
+        query: str,
+        max_results: int = 25,
+        page_token: Optional[str] = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """One ``search.list`` page of videos (100 quota units)."""
+        params: Dict[str, Any] = {
+            "part": "snippet",
+            "type": "video",
+            "q": query,
+            "maxResults": min(max_results, MAX_PAGE_SIZE),
+            **filters,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        return await self._get("search", params)
+
+    async def search_videos(
+        self,
+        query: str,
+        max_results: int = 25,
+        page_token: Optional[str] = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """A search page with full video resources (one extra unit, not one per video)."""
+        page = await self.search(query, max_results=max_results, page_token=page_token, **filters)
+        ids = [item["id"]["videoId"] for item in page.get("items", []) if item.get("id", {}).get("videoId")]
+        videos = await self.get_videos(ids)
+        return {
+            "items": [videos[video_id] for video_id in ids if video_id in videos],
+            "nextPageToken": page.get("nextPageToken"),
+            "prevPageToken": page.get("prevPageToken"),
+            "totalResults": page.get("pageInfo", {}).get("totalResults"),
+        }
+
+    # --- videos ----------------------------------------------------------
+    async def get_videos(self, video_ids: List[str], part: str = VIDEO_PARTS) -> Dict[str, Dict[str, Any]]:
+        """Video resources by ID, fetched in ``videos.list`` batches of 50.
+
+        Unknown or private videos are simply missing from the result.
+        """
+        unique = list(dict.fromkeys(video_ids))
+        chunks = [unique[i:i + MAX_PAGE_SIZE] for i in range(0, len(unique), MAX_PAGE_SIZE)]
+        pages = await asyncio.gather(
+            *(self._get("videos", {"part": part, "id": ",".join(chunk), "maxResults": MAX_PAGE_SIZE}) for chunk in chunks)
+        )
+        return {item["id"]: item for page in pages for item in page.get("items", [])}
+
+    async def get_video(self, video_id: str, part: str = VIDEO_PARTS) -> Optional[Dict[str, Any]]:
+        """One video resource; concurrent calls share ``videos.list`` batches."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Optional[Dict[str, Any]]]" = loop.create_future()
+        batch = self._pending.setdefault(part, {})
+        batch.setdefault(video_id, []).append(future)
+        if len(batch) >= MAX_PAGE_SIZE:
+            self._flush(part)
+        elif part not in self._flush_timers:
+            self._flush_timers[part] = loop.call_later(self.batch_window_seconds, self._flush, part)
+        return await future
+
+    def _flush(self, part: str) -> None:
+        timer = self._flush_timers.pop(part, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(part, None)
+        if batch:
+            task = asyncio.ensure_future(self._resolve_batch(part, batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _resolve_batch(
+        self, part: str, batch: Dict[str, List["asyncio.Future[Optional[Dict[str, Any]]]"]]
+    ) -> None:
+        try:
+            found = await self.get_videos(list(batch), part)
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+        else:
+            for video_id, futures in batch.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(found.get(video_id))
+
+    async def playlist_pages(self, playlist_id: str) -> AsyncIterator[List[str]]:
+        """Yield the video IDs of ``playlist_id`` one API page at a time."""
+        page_token: Optional[str] = None
+        while True:
+            params: Dict[str, Any] = {
+                "part": "contentDetails",
+                "playlistId": playlist_id,
+                "maxResults": MAX_PAGE_SIZE,
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            payload = await self._get("playlistItems", params)
+            yield [item["contentDetails"]["videoId"] for item in payload.get("items", [])]
+
+            page_token = payload.get("nextPageToken")
+            if not page_token:
+                return
+
+    async def playlist_items(self, playlist_id: str) -> AsyncIterator[str]:  # noqa: D401
+        """Yield every video ID of ``playlist_id``."""
+        async for page in self.playlist_pages(playlist_id):
+            for video_id in page:
+                yield video_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "etag_cache": self._etags.stats(),
+            "quota": self.quota.snapshot(),
+        }
+
+    async def close(self) -> None:
+        for timer in self._flush_timers.values():
+            timer.cancel()
+        for task in self._batches:
+            task.cancel()
+        await self._http.aclose()
 
-    async def search(self, query: str, max_results: int = 25):  # noqa: D401
-        raise NotImplementedError
 
-    async def playlist_items(self, playlist_id: str):  # noqa: D401
-        raise NotImplementedError
+@lru_cache()
+def get_youtube_client() -> YouTubeClient:
+    """Process-wide client using the configured API key (FastAPI dependency)."""
+    return YouTubeClient(settings.youtube_api_key)
@@ -0,0 +1,66 @@
+"""Write a ZIP archive as a stream of chunks.
+
+`zipfile` already supports unseekable outputs: each entry is followed by a
+data descriptor carrying its CRC and sizes, so nothing has to be patched
+after the fact.  `ZipStream` points a `ZipFile` at an in-memory sink and
+drains the sink after every chunk it writes.  As a result only the current
+chunk plus the central directory (about 100 bytes per entry) are ever held.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from typing import Iterable, Iterator, List
+
+
+class _Sink:
+    """Write-only, unseekable file object collecting bytes until drained."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class ZipStream:
+    """Incrementally built ZIP archive; see module docstring.
+
+    Usage::
+
+        archive = ZipStream()
+        yield from archive.add("a.txt", chunks)
+        yield from archive.finish()
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED, compresslevel: int = 6):
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=compression, compresslevel=compresslevel)
+        self.entries = 0
+
+    def add(self, name: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Write entry ``name`` from ``chunks``, yielding archive bytes as they are produced."""
+        with self._zip.open(name, "w") as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+                data = self._sink.drain()
+                if data:
+                    yield data
+        self.entries += 1
+        data = self._sink.drain()
+        if data:
+            yield data
+
+    def finish(self) -> Iterator[bytes]:
+        """Write the central directory; the archive is complete afterwards."""
+        self._zip.close()
+        yield self._sink.drain()
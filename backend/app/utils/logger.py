@@ -1,11 +1,25 @@
 """Application-wide structured logging helper.
 
 Uses python-json-logger for structured JSON logging.
+
+By default records do not get formatted or written on the thread that logs
+them (usually the event loop).  A `DroppingQueueHandler` puts them on a
+bounded queue and a `logging.handlers.QueueListener` thread serialises them
+to JSON and writes them to stdout.  When the queue is full, new records are
+dropped and counted instead of blocking the caller.  INFO and DEBUG records
+can additionally be sampled (``log_info_sample_rate``); warnings and errors
+are always kept.
 """
 
+import atexit
 import logging
+import queue
+import random
 import sys
-from python_json_logger import jsonlogger
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from pythonjsonlogger import jsonlogger
 
 # Custom fields to include in JSON logs
 # See https://github.com/madzak/python-json-logger?tab=readme-ov-file#custom-fields
@@ -37,9 +51,87 @@ SUPPORTED_JSON_FIELDS = (
 LOG_RECORD_FORMAT_STR = " ".join(f"%({field})" for field in SUPPORTED_JSON_FIELDS)
 
 
-def configure_logging(level: str = "INFO") -> None:  # pragma: no cover
-    """Configure logging to use JSON format."""
-    
+class SamplingFilter(logging.Filter):
+    """Keep only a ``rate`` fraction of records at INFO level and below."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1.0 or random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """`QueueHandler` that never blocks and leaves formatting to the listener.
+
+    The stock handler formats the message (and any traceback) in `prepare`,
+    on the logging thread; here the record is enqueued as is.  A full queue
+    drops the record and counts it.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+_sampler: Optional[SamplingFilter] = None
+
+
+def _json_formatter() -> logging.Formatter:
+    # The `format` kwarg to JsonFormatter defines which LogRecord attributes are captured.
+    # The `rename_fields` kwarg (defaulting to {'levelname': 'level', 'asctime': 'timestamp'})
+    # controls renaming of fields in the final JSON output.
+    # `json_ensure_ascii=False` allows non-ASCII characters.
+    return jsonlogger.JsonFormatter(
+        fmt=LOG_RECORD_FORMAT_STR,
+        rename_fields={'levelname': 'level', 'asctime': 'timestamp'},
+        json_ensure_ascii=False
+    )
+
+
+def shutdown_logging() -> None:
+    """Stop the listener thread after it has written every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    """Counters of the queued logging pipeline (zeros in synchronous mode)."""
+    return {
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": _sampler.sampled_out if _sampler else 0,
+    }
+
+
+def configure_logging(
+    level: str = "INFO",
+    queued: bool = True,
+    queue_size: int = 10_000,
+    info_sample_rate: float = 1.0,
+) -> None:  # pragma: no cover
+    """Configure logging to use JSON format, written by a background thread when ``queued``."""
+    global _listener, _queue_handler, _sampler
+    shutdown_logging()
+
     # Get the root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
@@ -52,20 +144,20 @@ def configure_logging(level: str = "INFO") -> None:  # pragma: no cover
 
     # Use a standard StreamHandler to output to stdout
     log_handler = logging.StreamHandler(sys.stdout)
+    log_handler.setFormatter(_json_formatter())
 
-    # Use JsonFormatter
-    # The `format` kwarg to JsonFormatter defines which LogRecord attributes are captured.
-    # The `rename_fields` kwarg (defaulting to {'levelname': 'level', 'asctime': 'timestamp'})
-    # controls renaming of fields in the final JSON output.
-    # `json_ensure_ascii=False` allows non-ASCII characters.
-    formatter = jsonlogger.JsonFormatter(
-        fmt=LOG_RECORD_FORMAT_STR,
-        rename_fields={'levelname': 'level', 'asctime': 'timestamp'},
-        json_ensure_ascii=False
-    )
-    
-    log_handler.setFormatter(formatter)
-    root_logger.addHandler(log_handler)
+    # Sampling runs before enqueueing, so discarded records cost no queue slot.
+    _sampler = SamplingFilter(info_sample_rate)
+    if queued:
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        _queue_handler.addFilter(_sampler)
+        root_logger.addHandler(_queue_handler)
+        _listener = QueueListener(_queue_handler.queue, log_handler)
+        _listener.start()
+    else:
+        _queue_handler = None
+        log_handler.addFilter(_sampler)
+        root_logger.addHandler(log_handler)
 
     # Configure loggers for common libraries to be less verbose if needed
     # logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -73,6 +165,9 @@ def configure_logging(level: str = "INFO") -> None:  # pragma: no cover
     # logging.getLogger("fastapi").setLevel(logging.INFO)
 
 
+atexit.register(shutdown_logging)
+
+
 # Expose a convenience logger for modules that do not need their own
 # This will inherit the root logger's configuration.
 logger = logging.getLogger("app")
@@ -0,0 +1,164 @@
+"""Minimal Prometheus instrumentation without a shared lock on the hot path.
+
+Two kinds of metrics:
+
+* `Histogram` – observed on the hot path.  Every thread writes to its own
+  *shard* (a dict of bucket counters found through a ``threading.local``),
+  so an observation is a dict lookup, a ``bisect`` and three increments; no
+  lock is shared with other threads.  A lock is taken only once per thread,
+  to register its shard.  Scraping merges the shards.
+* *collectors* – callbacks run at scrape time that turn counters the
+  components already keep (cache ``stats()``, executor lanes, ...) into
+  samples.  They cost nothing per request.
+
+`REGISTRY.render()` produces the Prometheus text exposition format (0.0.4).
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = tuple(float(4 ** i) for i in range(4, 14))  # 256 B … 64 MiB
+COUNT_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+# (metric name, type, help, [(labels, value)]) – as returned by collectors
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+Collector = Callable[[], Iterable[Family]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Histogram:
+    """Thread-sharded histogram; see module docstring."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[str, ...], List[float]]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Tuple[str, ...], List[float]]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # per-bucket counts (+Inf last), then sum and count
+            series = shard[labels] = [0.0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the ``with`` block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _merged(self) -> Dict[Tuple[str, ...], List[float]]:
+        with self._lock:
+            shards = list(self._shards)
+        merged: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in shards:
+            for labels, series in list(shard.items()):
+                total = merged.setdefault(labels, [0.0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+        return merged
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._merged().items()):
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_number(series[-1])}")
+        return lines
+
+
+class Registry:
+    """Histograms plus scrape-time collectors."""
+
+    def __init__(self) -> None:
+        self._histograms: List[Histogram] = []
+        self._collectors: List[Collector] = []
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        histogram = Histogram(*args, **kwargs)
+        self._histograms.append(histogram)
+        return histogram
+
+    def collector(self, fn: Collector) -> Collector:
+        """Register ``fn`` (usable as a decorator)."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, including streaming the body",
+    ("method", "route", "format", "status"),
+)
+UPSTREAM_CALL_DURATION = REGISTRY.histogram(
+    "upstream_call_duration_seconds",
+    "Duration of blocking upstream library calls",
+    ("call",),
+)
+TRANSCRIPT_BYTES = REGISTRY.histogram(
+    "transcript_size_bytes", "In-memory size of fetched transcripts", buckets=SIZE_BUCKETS
+)
+TRANSCRIPT_SEGMENTS = REGISTRY.histogram(
+    "transcript_segments", "Segments per fetched transcript", buckets=COUNT_BUCKETS
+)
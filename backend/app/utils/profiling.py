@@ -0,0 +1,166 @@
+"""Opt-in per-request timing spans and a slow-request recorder.
+
+`ProfilingMiddleware` (``app.api.middleware``) attaches a `RequestProfile`
+to the request's context for a sampled share of requests.  Code on the
+request path wraps interesting steps in ``with span("cache.redis"):``;
+afterwards the profile feeds the ``Server-Timing`` response header and, for
+slow requests, `SlowRequestLog`.
+
+With no profile in the context – profiling disabled or the request not
+sampled – `span` is one ``ContextVar.get`` returning a shared no-op context
+manager, so instrumented code pays next to nothing.
+
+Blocking upstream calls run on executor threads; `UpstreamExecutor` copies
+the caller's context into them, so their spans land in the right profile.
+Spans recorded concurrently (bulk requests) are appended to a list, an
+atomic operation, rather than summed under a lock.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+_NO_SPAN = nullcontext()
+
+
+class RequestProfile:
+    """Spans recorded while serving one request."""
+
+    __slots__ = ("started", "spans")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def totals(self) -> Dict[str, Tuple[float, int]]:
+        """Span name → (total seconds, count), in first-seen order."""
+        totals: Dict[str, Tuple[float, int]] = {}
+        for name, seconds in list(self.spans):
+            total, count = totals.get(name, (0.0, 0))
+            totals[name] = (total + seconds, count + 1)
+        return totals
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """``Server-Timing`` header value; ``total`` is reported as ``app``."""
+        metrics = [f"{name};dur={seconds * 1000:.2f}" for name, (seconds, _) in self.totals().items()]
+        if total is not None:
+            metrics.append(f"app;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+class _Span:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profile.spans.append((self.name, time.perf_counter() - self.started))
+
+
+def span(name: str):
+    """Time the ``with`` block as ``name`` in the current request's profile."""
+    profile = _profile.get()
+    return _NO_SPAN if profile is None else _Span(profile, name)
+
+
+def timed_chunks(name: str, chunks: Iterable[bytes]) -> Iterable[bytes]:
+    """Charge the time spent producing ``chunks`` to span ``name``.
+
+    For lazily rendered bodies; the profile is looked up now, so the chunks
+    may be consumed from another task or thread.
+    """
+    profile = _profile.get()
+    if profile is None:
+        return chunks
+    return _timed(profile, name, iter(chunks))
+
+
+def _timed(profile: RequestProfile, name: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    spent = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                spent += time.perf_counter() - started
+            yield chunk
+    finally:
+        profile.spans.append((name, spent))
+
+
+def start_profile() -> Tuple[RequestProfile, Any]:
+    """Attach a new profile to the current context; returns it and a reset token."""
+    profile = RequestProfile()
+    return profile, _profile.set(profile)
+
+
+def end_profile(token: Any) -> None:
+    _profile.reset(token)
+
+
+class SlowRequestLog:
+    """Ring buffer of the most recent requests slower than ``threshold``."""
+
+    def __init__(self, capacity: int, threshold_seconds: float):
+        self.threshold_seconds = threshold_seconds
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, profile: RequestProfile, duration: float, method: str, path: str, status: int) -> bool:
+        if duration < self.threshold_seconds:
+            return False
+        entry = {
+            "method": method,
+            "path": path,
+            "status": status,
+            "at": time.time(),
+            "duration_ms": round(duration * 1000, 2),
+            "spans": [
+                {"name": name, "duration_ms": round(seconds * 1000, 2), "count": count}
+                for name, (seconds, count) in profile.totals().items()
+            ],
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+        return True
+
+    def slowest(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Buffered requests, slowest first."""
+        with self._lock:
+            entries = list(self._entries)
+        entries.sort(key=lambda entry: entry["duration_ms"], reverse=True)
+        return entries[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache()
+def get_slow_request_log() -> SlowRequestLog:
+    """Process-wide slow-request buffer."""
+    return SlowRequestLog(settings.profiling_slow_capacity, settings.profiling_slow_ms / 1000)
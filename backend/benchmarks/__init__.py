@@ -0,0 +1,11 @@
+"""Benchmarks: a fake YouTube upstream, micro-benchmarks and a load driver.
+
+Run from ``backend/``::
+
+    python -m benchmarks.micro --out results/micro.json
+    python -m benchmarks.load --out results/load.json
+    python -m benchmarks.compare results/base.json results/load.json
+
+Every run writes a JSON file (see `benchmarks.common.write_results`) so
+results from two commits can be compared with `benchmarks.compare`.
+"""
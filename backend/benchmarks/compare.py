@@ -0,0 +1,68 @@
+"""Compare two benchmark result files and flag regressions.
+
+Results are matched by ``name``.  A micro result regresses when ``us_per_op``
+grows, a load result when ``p95_ms`` / ``p99_ms`` grow or ``throughput_rps``
+drops, by more than ``--threshold`` (relative).  Exits with status 1 if any
+result regressed, so the script can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+# metric -> True when bigger is better
+METRICS = {
+    "micro": {"us_per_op": False},
+    "load": {"throughput_rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False},
+}
+# Only these metrics fail the comparison; the rest are informational.
+GATED = {"us_per_op", "throughput_rps", "p95_ms", "p99_ms"}
+
+
+def _load(path: str) -> Tuple[str, Dict[str, Dict]]:
+    with open(path, encoding="utf-8") as fh:
+        document = json.load(fh)
+    return document["kind"], {result["name"]: result for result in document["results"]}
+
+
+def compare(base_path: str, head_path: str, threshold: float) -> List[str]:
+    """Print a comparison table; return the names of regressed results."""
+    kind, base = _load(base_path)
+    head_kind, head = _load(head_path)
+    if kind != head_kind:
+        raise SystemExit(f"cannot compare a {kind!r} run with a {head_kind!r} run")
+    regressed = []
+    for name in sorted(base.keys() & head.keys()):
+        cells = []
+        worse = False
+        for metric, higher_is_better in METRICS[kind].items():
+            old, new = base[name][metric], head[name][metric]
+            change = (new - old) / old if old else 0.0
+            bad = (-change if higher_is_better else change) > threshold
+            worse |= bad and metric in GATED
+            cells.append(f"{metric} {old:.1f} -> {new:.1f} ({change:+.1%}){' !' if bad else ''}")
+        print(f"{'REGRESSED' if worse else 'ok':9} {name:40} " + "  ".join(cells))
+        if worse:
+            regressed.append(name)
+    for name in sorted(base.keys() ^ head.keys()):
+        print(f"{'missing':9} {name} (only in {'base' if name in base else 'head'})")
+    return regressed
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", help="Result file of the reference commit")
+    parser.add_argument("head", help="Result file to check")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Tolerated relative change (default 10%%)")
+    args = parser.parse_args(argv)
+    regressed = compare(args.base, args.head, args.threshold)
+    if regressed:
+        print(f"{len(regressed)} result(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""A local stand-in for YouTube: both youtube-transcript-api and the Data API.
+
+`FakeUpstream` replaces ``YouTubeTranscriptApi.list_transcripts`` (the only
+entry point the service uses; track downloads go through the returned
+objects) and serves ``playlistItems`` / ``videos`` / ``search`` through an
+`httpx.MockTransport`, so a real `YouTubeClient` – quota ledger, ETags,
+executor and all – runs against it.
+
+Latency, error rates and transcript sizes are configurable.  Transcripts are
+deterministic per video ID and ``seed``, so two runs see the same data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+import httpx
+from youtube_transcript_api import (
+    NoTranscriptFound,
+    TooManyRequests,
+    TranscriptsDisabled,
+    YouTubeTranscriptApi,
+)
+
+from app.services.youtube_client import YouTubeClient
+
+_WORDS = (
+    "the quick brown fox jumps over lazy dog and then we talk about python async "
+    "caching latency throughput video transcript segment stream überall naïve café"
+).split()
+
+
+@dataclass
+class FakeUpstreamConfig:
+    """Behaviour of the fake upstream (latencies in milliseconds)."""
+
+    list_latency_ms: float = 40.0
+    fetch_latency_ms: float = 60.0
+    data_api_latency_ms: float = 30.0
+    jitter: float = 0.25  # ± fraction applied to every latency
+    error_rate: float = 0.0  # share of calls failing with TooManyRequests / HTTP 500
+    disabled_rate: float = 0.0  # share of videos whose transcripts are disabled
+    segments: int = 300
+    segments_spread: float = 0.5  # transcript lengths vary by ± this fraction
+    words_per_segment: int = 8
+    playlist_size: int = 100
+    seed: int = 0
+
+
+def _rng(*parts: Any) -> random.Random:
+    return random.Random(zlib.crc32(":".join(map(str, parts)).encode()))
+
+
+class _FakeTranscript:
+    """Duck-types the library's `Transcript` as far as the service uses it."""
+
+    def __init__(self, upstream: "FakeUpstream", video_id: str, is_generated: bool):
+        self._upstream = upstream
+        self.video_id = video_id
+        self.language = "English (auto-generated)" if is_generated else "English"
+        self.language_code = "en"
+        self.is_generated = is_generated
+        self.translation_languages: List[Dict[str, str]] = []
+        self._url = f"https://fake.invalid/timedtext?v={video_id}&kind={'asr' if is_generated else ''}"
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        self._upstream._blocking_call("fetch", self._upstream.config.fetch_latency_ms, self.video_id)
+        return self._upstream.segments(self.video_id)
+
+
+class _FakeTranscriptList:
+    def __init__(self, upstream: "FakeUpstream", video_id: str):
+        self.video_id = video_id
+        self._manual = _FakeTranscript(upstream, video_id, is_generated=False)
+
+    def __iter__(self):
+        return iter([self._manual])
+
+    def find_manually_created_transcript(self, codes: List[str]) -> _FakeTranscript:
+        if "en" in codes:
+            return self._manual
+        raise NoTranscriptFound(self.video_id, codes, self)
+
+    def find_generated_transcript(self, codes: List[str]) -> _FakeTranscript:
+        raise NoTranscriptFound(self.video_id, codes, self)
+
+
+class FakeUpstream:
+    """See module docstring.
+
+    ``playlist_videos`` maps a playlist ID to its video IDs; by default a
+    playlist has ``playlist_size`` videos named ``<playlist>-<n>``.
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeUpstreamConfig] = None,
+        playlist_videos: Optional[Callable[[str], List[str]]] = None,
+    ):
+        self.config = config or FakeUpstreamConfig()
+        self.playlist_videos = playlist_videos or self._default_playlist
+        self._errors = random.Random(self.config.seed)
+        self.calls = {"list_transcripts": 0, "fetch": 0, "data_api": 0}
+
+    # --- data --------------------------------------------------------------
+    def _default_playlist(self, playlist_id: str) -> List[str]:
+        return [f"{playlist_id}-{i:05d}" for i in range(self.config.playlist_size)]
+
+    def segments(self, video_id: str) -> List[Dict[str, Any]]:
+        config = self.config
+        rng = _rng(config.seed, video_id)
+        count = max(1, round(config.segments * (1 + rng.uniform(-config.segments_spread, config.segments_spread))))
+        segments = []
+        start = 0.0
+        for _ in range(count):
+            duration = round(rng.uniform(1.0, 5.0), 3)
+            text = " ".join(rng.choice(_WORDS) for _ in range(config.words_per_segment))
+            segments.append({"text": text, "start": round(start, 3), "duration": duration})
+            start += duration
+        return segments
+
+    def _delay(self, latency_ms: float) -> float:
+        jitter = self.config.jitter
+        return max(0.0, latency_ms * (1 + self._errors.uniform(-jitter, jitter))) / 1000
+
+    def _fails(self) -> bool:
+        return self._errors.random() < self.config.error_rate
+
+    # --- youtube-transcript-api --------------------------------------------
+    def _blocking_call(self, call: str, latency_ms: float, video_id: str) -> None:
+        self.calls[call] += 1
+        time.sleep(self._delay(latency_ms))
+        if self._fails():
+            raise TooManyRequests(video_id)
+
+    def list_transcripts(self, video_id: str) -> _FakeTranscriptList:
+        self._blocking_call("list_transcripts", self.config.list_latency_ms, video_id)
+        if _rng(self.config.seed, "disabled", video_id).random() < self.config.disabled_rate:
+            raise TranscriptsDisabled(video_id)
+        return _FakeTranscriptList(self, video_id)
+
+    # --- Data API ----------------------------------------------------------
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls["data_api"] += 1
+        await asyncio.sleep(self._delay(self.config.data_api_latency_ms))
+        if self._fails():
+            return httpx.Response(500, json={"error": {"message": "fake backend error"}})
+        resource = request.url.path.rsplit("/", 1)[-1]
+        params = request.url.params
+        if resource == "playlistItems":
+            return self._playlist_page(params["playlistId"], int(params.get("pageToken") or 0), int(params["maxResults"]))
+        if resource == "videos":
+            items = [{"id": vid, "snippet": {"title": f"Video {vid}"}} for vid in params["id"].split(",")]
+            return httpx.Response(200, json={"items": items})
+        if resource == "search":
+            items = [{"id": {"videoId": f"search-{params.get('q', '')}-{i}"}} for i in range(int(params.get("maxResults", 10)))]
+            return httpx.Response(200, json={"items": items})
+        return httpx.Response(404, json={"error": {"message": f"unknown resource {resource}"}})
+
+    def _playlist_page(self, playlist_id: str, offset: int, size: int) -> httpx.Response:
+        videos = self.playlist_videos(playlist_id)
+        page = videos[offset:offset + size]
+        payload: Dict[str, Any] = {"items": [{"contentDetails": {"videoId": vid}} for vid in page]}
+        if offset + size < len(videos):
+            payload["nextPageToken"] = str(offset + size)
+        return httpx.Response(200, json=payload)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    def client(self) -> YouTubeClient:
+        """A real `YouTubeClient` talking to this fake."""
+        return YouTubeClient("fake-key", transport=self.transport())
+
+    @contextmanager
+    def installed(self) -> Iterator["FakeUpstream"]:
+        """Route ``YouTubeTranscriptApi.list_transcripts`` to this fake."""
+        with patch.object(YouTubeTranscriptApi, "list_transcripts", side_effect=self.list_transcripts):
+            yield self
@@ -0,0 +1,193 @@
+"""End-to-end load driver for the single, bulk and playlist endpoints.
+
+The app runs in-process behind `httpx.ASGITransport`, with Redis replaced by
+the in-memory stand-in and YouTube replaced by `FakeUpstream`, so numbers
+include the whole request path (routing, cache tiers, upstream executor,
+rendering, streaming) but no network.
+
+For every scenario × warm ratio, the caches are rebuilt and a
+``warm_ratio`` share of a video pool is fetched once up front; requests then
+pick cached videos with probability ``warm_ratio`` and never-seen ones
+otherwise.  Reported per run: throughput, p50/p95/p99/max latency, non-200
+responses and, for the streamed endpoints, per-video error records (e.g.
+upstream overload), which arrive inside a 200 response.
+"""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("REDIS_URL", "memory://")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import itertools  # noqa: E402
+import random  # noqa: E402
+import time  # noqa: E402
+from typing import Any, Awaitable, Callable, Dict, List  # noqa: E402
+
+import httpx  # noqa: E402
+
+from app.cache.redis_cache import RedisCache  # noqa: E402
+from app.cache.search_cache import get_search_cache  # noqa: E402
+from app.cache.transcript_cache import get_transcript_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.corpus_index import get_corpus_index  # noqa: E402
+from app.services.search_service import get_search_service  # noqa: E402
+from app.services.transcript_service import get_transcript_service  # noqa: E402
+from app.services.upstream import get_upstream_executor  # noqa: E402
+from app.services.youtube_client import get_youtube_client  # noqa: E402
+from benchmarks.common import latency_summary, write_results  # noqa: E402
+from benchmarks.fake_upstream import FakeUpstream, FakeUpstreamConfig  # noqa: E402
+
+SCENARIOS = ("single", "bulk", "playlist")
+
+
+def _reset_singletons() -> None:
+    """Fresh executor, caches and services (same as the test suite's fixture)."""
+    if get_upstream_executor.cache_info().currsize:
+        get_upstream_executor().shutdown()
+    for provider in (
+        get_upstream_executor, get_transcript_cache, get_transcript_service,
+        get_youtube_client, get_search_cache, get_search_service, get_corpus_index,
+    ):
+        provider.cache_clear()
+    RedisCache.reset()
+
+
+class VideoPicker:
+    """Hands out warm (pre-fetched) or cold (never requested) video IDs."""
+
+    def __init__(self, warm_ratio: float, pool_size: int, seed: int):
+        self.warm_ratio = warm_ratio
+        self.warm = [f"warm-{i:05d}" for i in range(round(pool_size * warm_ratio))]
+        self._cold = (f"cold-{i:07d}" for i in itertools.count())
+        self._rng = random.Random(seed)
+
+    def pick(self) -> str:
+        if self.warm and self._rng.random() < self.warm_ratio:
+            return self._rng.choice(self.warm)
+        return next(self._cold)
+
+    def playlist(self, playlist_id: str, size: int) -> List[str]:
+        return [self.pick() for _ in range(size)]
+
+
+async def _drive(
+    send: Callable[[], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    records = {"items": 0, "item_errors": 0}
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await send()
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.headers.get("content-type", "").startswith("application/x-ndjson"):
+                records["items"] += response.content.count(b"\n")
+                records["item_errors"] += response.content.count(b'"status": "error"')
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2),
+        **latency_summary(latencies),
+        "errors": sum(count for status, count in statuses.items() if status != 200),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        **records,
+    }
+
+
+async def run_scenario(scenario: str, warm_ratio: float, args: argparse.Namespace) -> Dict[str, Any]:
+    _reset_singletons()
+    picker = VideoPicker(warm_ratio, args.pool, args.seed)
+    config = FakeUpstreamConfig(
+        list_latency_ms=args.list_latency_ms,
+        fetch_latency_ms=args.fetch_latency_ms,
+        data_api_latency_ms=args.data_api_latency_ms,
+        error_rate=args.error_rate,
+        disabled_rate=args.disabled_rate,
+        segments=args.segments,
+        playlist_size=args.batch,
+        seed=args.seed,
+    )
+    upstream = FakeUpstream(config, playlist_videos=lambda pid: picker.playlist(pid, args.batch))
+    client = upstream.client()
+    app.dependency_overrides[get_youtube_client] = lambda: client
+    playlists = (f"PL{i:06d}" for i in itertools.count())
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+    ) as http:
+        with upstream.installed():
+            # Warm-up: fetch the warm pool once, outside the measurement.
+            for start in range(0, len(picker.warm), 500):
+                await http.post("/transcripts/bulk", json={"video_ids": picker.warm[start:start + 500]})
+            calls_before = dict(upstream.calls)
+
+            async def send() -> httpx.Response:
+                if scenario == "single":
+                    return await http.get(f"/transcripts/{picker.pick()}", params={"format": args.format})
+                if scenario == "bulk":
+                    ids = [picker.pick() for _ in range(args.batch)]
+                    return await http.post("/transcripts/bulk", json={"video_ids": ids})
+                return await http.get(f"/playlists/{next(playlists)}/transcripts")
+
+            result = await _drive(send, args.requests, args.concurrency)
+    await client.close()
+    app.dependency_overrides.pop(get_youtube_client, None)
+    upstream_calls = {call: count - calls_before[call] for call, count in upstream.calls.items()}
+    return {"name": f"{scenario}[warm={warm_ratio:g}]", "scenario": scenario, "warm_ratio": warm_ratio,
+            **result, "upstream_calls": upstream_calls}
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    for scenario in args.scenarios.split(","):
+        for warm_ratio in (float(r) for r in args.warm_ratios.split(",")):
+            result = await run_scenario(scenario, warm_ratio, args)
+            print(
+                f"{result['name']:24} {result['throughput_rps']:>9.1f} req/s  "
+                f"p50 {result['p50_ms']:>8.1f}  p95 {result['p95_ms']:>8.1f}  p99 {result['p99_ms']:>8.1f} ms  "
+                f"errors {result['errors']}/{result['item_errors']}",
+                flush=True,
+            )
+            results.append(result)
+    _reset_singletons()
+    return results
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="JSON result file (stdout if omitted)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--warm-ratios", default="0,0.9", help="Comma-separated cache-hit ratios, e.g. 0,0.5,0.9")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and warm ratio")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=20, help="Videos per bulk request / playlist")
+    parser.add_argument("--pool", type=int, default=500, help="Video pool the warm share is taken from")
+    parser.add_argument("--format", default="json", help="Format of single-video requests")
+    parser.add_argument("--segments", type=int, default=300, help="Average segments per transcript")
+    parser.add_argument("--list-latency-ms", type=float, default=40.0)
+    parser.add_argument("--fetch-latency-ms", type=float, default=60.0)
+    parser.add_argument("--data-api-latency-ms", type=float, default=30.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--disabled-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    config = {key: value for key, value in vars(args).items() if key != "out"}
+    write_results(args.out, "load", config, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Micro-benchmarks for formatting, serialisation and the cache codecs.
+
+Each case runs in batches until ``--min-time`` has elapsed; the reported
+``ops_per_sec`` / ``us_per_op`` come from the fastest-half median batch, which
+is stable against the occasional GC pause.  Transcripts come from
+`FakeUpstream`, so sizes match the load driver's.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from app.cache.transcript_cache import CacheEntry
+from app.models.compact import CompactTranscript
+from app.services.formatters import STREAM_FORMATS, render_json_response, render_ok_record
+from app.services.transcript_search import find_phrase
+from benchmarks.common import write_results
+from benchmarks.fake_upstream import FakeUpstream, FakeUpstreamConfig
+
+SIZES = {"small": 50, "medium": 500, "large": 5000}
+
+
+def _consume(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+def cases(transcript: CompactTranscript, segments: List[Dict[str, Any]]) -> Dict[str, Callable[[], Any]]:
+    entry = CacheEntry(time.time(), transcript=transcript)
+    encoded = transcript.encode()
+    encoded_raw = transcript.encode(compress=False)
+    entry_payload = entry.encode()
+    found = {
+        "compact.from_segments": lambda: CompactTranscript.from_segments(segments),
+        "compact.encode": lambda: transcript.encode(),
+        "compact.encode_uncompressed": lambda: transcript.encode(compress=False),
+        "compact.decode": lambda: CompactTranscript.decode(encoded),
+        "compact.decode_uncompressed": lambda: CompactTranscript.decode(encoded_raw),
+        "cache_entry.encode": lambda: entry.encode(),
+        "cache_entry.decode": lambda: CacheEntry.decode(entry_payload),
+        "render.json_response": lambda: render_json_response("bench", transcript),
+        "render.bulk_record_json": lambda: render_ok_record("bench", transcript, "json"),
+        "render.bulk_record_text": lambda: render_ok_record("bench", transcript, "text"),
+        "search.phrase": lambda: find_phrase(transcript, "lazy dog", limit=100),
+    }
+    for name, (stream, _) in STREAM_FORMATS.items():
+        found[f"stream.{name}"] = lambda stream=stream: _consume(stream(transcript))
+    return found
+
+
+def measure(fn: Callable[[], Any], min_time: float) -> Dict[str, float]:
+    # Size a batch to take about 10 ms, then repeat until min_time is spent.
+    batch = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        if time.perf_counter() - started >= 0.01:
+            break
+        batch *= 2
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline or len(timings) < 5:
+        started = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        timings.append((time.perf_counter() - started) / batch)
+    timings.sort()
+    per_op = statistics.median(timings[: max(1, len(timings) // 2)])
+    return {"us_per_op": round(per_op * 1e6, 3), "ops_per_sec": round(1 / per_op, 1), "batches": len(timings)}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="JSON result file (stdout if omitted)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent per case")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="Comma-separated subset of " + ", ".join(SIZES))
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes.split(","):
+        upstream = FakeUpstream(FakeUpstreamConfig(segments=SIZES[size], segments_spread=0))
+        segments = upstream.segments(f"micro-{size}")
+        transcript = CompactTranscript.from_segments(segments)
+        for case, fn in cases(transcript, segments).items():
+            name = f"{case}[{size}]"
+            if args.filter not in name:
+                continue
+            result = {"name": name, "segments": len(transcript), "bytes": transcript.nbytes, **measure(fn, args.min_time)}
+            print(f"{name:45} {result['us_per_op']:>12.1f} us/op", flush=True)
+            results.append(result)
+    write_results(args.out, "micro", {"min_time": args.min_time, "sizes": args.sizes}, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Tests for the POST /transcripts/bulk NDJSON endpoint."""
+
+import json
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from youtube_transcript_api import TranscriptsDisabled
+
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, get_transcript_cache
+from app.main import app
+from app.models.compact import CompactTranscript
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+    {"text": "This is a test", "start": 2.0, "duration": 2.5},
+]
+
+
+def _fake_list_transcripts(video_id):
+    if video_id == "disabledVideo":
+        raise TranscriptsDisabled(video_id)
+    transcript = MagicMock()
+    transcript.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+def _parse_ndjson(body: str):
+    return [json.loads(line) for line in body.splitlines() if line]
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_bulk_dedupes_and_reports_per_item_status(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+    body = {"video_ids": ["a", "b", "a", "disabledVideo", "b"]}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/transcripts/bulk", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = {r["video_id"]: r for r in _parse_ndjson(response.text)}
+    assert set(records) == {"a", "b", "disabledVideo"}
+    assert records["a"] == {"video_id": "a", "status": "ok", "transcript": SAMPLE_TRANSCRIPT_SEGMENTS}
+    assert records["disabledVideo"]["status"] == "error"
+    assert records["disabledVideo"]["status_code"] == 404
+    assert mock_list_transcripts.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_bulk_serves_cache_hits_with_one_mget(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+    cache = get_transcript_cache()
+    for video_id in ("a", "b"):
+        await RedisCache().set(cache.key(video_id), CacheEntry(time.time(), CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)).encode())
+
+    with patch.object(RedisCache, "mget", wraps=RedisCache().mget) as spy_mget:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/transcripts/bulk", json={"video_ids": "a,b,c", "format": "text"})
+
+    records = _parse_ndjson(response.text)
+    assert [r["video_id"] for r in records[:2]] == ["a", "b"]
+    assert all(r["transcript"] == "Hello world\nThis is a test" for r in records)
+    spy_mget.assert_called_once()
+    mock_list_transcripts.assert_called_once_with("c")
+
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_empty_id_list():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/transcripts/bulk", json={"video_ids": " , "})
+    assert response.status_code == 422
@@ -0,0 +1,110 @@
+"""Tests for the streaming ZIP /export endpoint."""
+
+import io
+import json
+import zipfile
+
+import httpx
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from youtube_transcript_api import TranscriptsDisabled
+
+from app.api.routes.export import entry_name, export_filename
+from app.main import app
+from app.services.youtube_client import YouTubeClient, get_youtube_client
+from app.services.zip_stream import ZipStream
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+    {"text": "second line", "start": 2.0, "duration": 1.0},
+]
+
+
+def _fake_list_transcripts(video_id):
+    if video_id == "disabled":
+        raise TranscriptsDisabled(video_id)
+    transcript = MagicMock()
+    transcript.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+def test_zip_stream_emits_chunks_per_write():
+    archive = ZipStream()
+    chunks = list(archive.add("a.txt", [b"x" * 100_000, b"y" * 100_000]))
+    chunks += list(archive.finish())
+
+    assert len(chunks) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.read("a.txt") == b"x" * 100_000 + b"y" * 100_000
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_export_video_ids_as_zip_with_manifest(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/export/", json={"video_ids": "v1,v2,disabled,v1", "format": "srt"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert zf.testzip() is None
+        assert sorted(zf.namelist()) == ["manifest.json", "v1.srt", "v2.srt"]
+        assert zf.read("v1.srt").startswith(b"1\n00:00:00,500 --> 00:00:02,000\nHello world\n")
+        manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["exported"] == 2
+    assert manifest["failed"] == [
+        {"video_id": "disabled", "status_code": 404, "detail": "Transcripts are disabled for this video."}
+    ]
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_export_playlist(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+
+    def data_api(request: httpx.Request) -> httpx.Response:
+        if request.url.params["playlistId"] != "PLknown":
+            return httpx.Response(404, json={"error": {"message": "playlistNotFound"}})
+        return httpx.Response(200, json={"items": [{"contentDetails": {"videoId": v}} for v in ("p1", "p2")]})
+
+    client = YouTubeClient("test-key", transport=httpx.MockTransport(data_api))
+    app.dependency_overrides[get_youtube_client] = lambda: client
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/export/", json={"playlist_id": "PLknown", "format": "text"})
+            missing = await ac.post("/export/", json={"playlist_id": "PLmissing"})
+            invalid = await ac.post("/export/", json={"playlist_id": "PLknown", "video_ids": ["v1"]})
+    finally:
+        app.dependency_overrides.pop(get_youtube_client, None)
+        await client.close()
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert sorted(zf.namelist()) == ["manifest.json", "p1.txt", "p2.txt"]
+        assert zf.read("p2.txt") == b"Hello world\nsecond line"
+    assert response.headers["content-disposition"] == 'attachment; filename="transcripts-PLknown.zip"'
+    assert missing.status_code == 404
+    assert invalid.status_code == 422
+
+
+def test_export_filename_only_keeps_safe_characters():
+    assert export_filename(None) == "transcripts-export.zip"
+    assert export_filename('PL"x; filename=evil.exe') == "transcripts-PL_x__filename_evil_exe.zip"
+    assert entry_name("../../etc/passwd", "txt") == "______etc_passwd.txt"
+    assert entry_name("dQw4w9WgXcQ", "srt") == "dQw4w9WgXcQ.srt"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/export/", "/jobs/", "/transcripts/bulk"])
+async def test_path_like_video_ids_are_rejected(path):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        traversal = await ac.post(path, json={"video_ids": ["v1", "../../etc/passwd"]})
+        too_long = await ac.post(path, json={"video_ids": "v1," + "x" * 65})
+
+    assert traversal.status_code == 422
+    assert too_long.status_code == 422
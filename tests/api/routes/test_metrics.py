@@ -0,0 +1,83 @@
+"""Tests for the hand-rolled Prometheus registry and the /metrics endpoint."""
+
+import threading
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from app.main import app
+from app.utils.metrics import Histogram, Registry
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+]
+
+
+def _mock_transcript_list():
+    transcript = MagicMock()
+    transcript.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+def _sample(body: str, prefix: str) -> float:
+    return sum(float(line.rsplit(" ", 1)[1]) for line in body.splitlines() if line.startswith(prefix))
+
+
+def test_histogram_merges_thread_shards():
+    histogram = Histogram("h", "help", ("kind",), buckets=(1.0, 2.0))
+
+    def worker():
+        for value in (0.5, 1.5, 3.0):
+            histogram.observe(value, "a")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = histogram.render()
+    assert 'h_bucket{kind="a",le="1"} 4' in lines
+    assert 'h_bucket{kind="a",le="2"} 8' in lines
+    assert 'h_bucket{kind="a",le="+Inf"} 12' in lines
+    assert 'h_count{kind="a"} 12' in lines
+    assert 'h_sum{kind="a"} 20' in lines
+
+
+def test_registry_renders_collectors():
+    registry = Registry()
+    registry.collector(lambda: [("jobs_total", "counter", "Jobs", [({"state": 'do"ne'}, 3)])])
+
+    body = registry.render()
+
+    assert "# TYPE jobs_total counter" in body
+    assert 'jobs_total{state="do\\"ne"} 3' in body
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_metrics_endpoint_reports_requests_and_upstream_calls(mock_list_transcripts):
+    mock_list_transcripts.return_value = _mock_transcript_list()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        before = (await ac.get("/metrics")).text
+        assert (await ac.get("/transcripts/vid-metrics", params={"format": "srt"})).status_code == 200
+        assert (await ac.get("/transcripts/vid-metrics", params={"format": "bogus"})).status_code == 422
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+
+    route = 'http_request_duration_seconds_count{method="GET",route="/transcripts/{video_id}"'
+    assert _sample(body, route + ',format="srt",status="200"}') - _sample(before, route + ',format="srt",status="200"}') == 1
+    assert _sample(body, route + ',format="-",status="422"}') - _sample(before, route + ',format="-",status="422"}') == 1
+    assert _sample(body, 'upstream_call_duration_seconds_count{call="list_transcripts"}') >= 1
+    assert _sample(body, 'upstream_call_duration_seconds_count{call="fetch"}') >= 1
+    assert _sample(body, "transcript_segments_count") >= 1
+    assert 'cache_lookups_total{cache="transcripts",tier="l1",result="miss"}' in body
+    assert 'upstream_queued{upstream="youtube_transcripts"}' in body
+    assert "youtube_quota_remaining" in body
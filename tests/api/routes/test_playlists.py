@@ -0,0 +1,109 @@
+"""Tests for the streaming /playlists/{playlist_id}/transcripts endpoint."""
+
+import json
+
+import httpx
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from app.main import app
+from app.services.transcript_service import get_transcript_service
+from app.services.youtube_client import YouTubeClient, get_youtube_client
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+]
+
+PLAYLIST_PAGES = {
+    None: {"items": ["v1", "v2"], "nextPageToken": "p2"},
+    "p2": {"items": ["v3", "v1"], "nextPageToken": "p3"},
+    "p3": {"items": ["v4"]},
+}
+
+
+def _data_api(request: httpx.Request) -> httpx.Response:
+    if request.url.params["playlistId"] != "PLknown":
+        return httpx.Response(404, json={"error": {"message": "playlistNotFound"}})
+    page = PLAYLIST_PAGES[request.url.params.get("pageToken")]
+    body = {"items": [{"contentDetails": {"videoId": v}} for v in page["items"]]}
+    if "nextPageToken" in page:
+        body["nextPageToken"] = page["nextPageToken"]
+    return httpx.Response(200, json=body)
+
+
+def _fake_list_transcripts(video_id):
+    transcript = MagicMock()
+    transcript.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+@pytest.fixture
+def data_api():
+    client = YouTubeClient("test-key", transport=httpx.MockTransport(_data_api))
+    app.dependency_overrides[get_youtube_client] = lambda: client
+    yield client
+    app.dependency_overrides.pop(get_youtube_client, None)
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_playlist_streams_every_video_once(mock_list_transcripts, data_api):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/playlists/PLknown/transcripts")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["video_id"] for r in records) == ["v1", "v2", "v3", "v4"]
+    assert all(r["status"] == "ok" for r in records)
+    assert mock_list_transcripts.call_count == 4
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_playlist_sse_ends_with_summary(mock_list_transcripts, data_api):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/playlists/PLknown/transcripts?stream=sse&format=text")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [e[0] for e in events].count("event: transcript") == 4
+    assert events[-1][0] == "event: done"
+    assert json.loads(events[-1][1][len("data: "):]) == {"playlist_id": "PLknown", "ok": 4, "error": 0}
+
+
+@pytest.mark.asyncio
+async def test_unknown_playlist_returns_404(data_api):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/playlists/PLmissing/transcripts")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_pipeline_depth_bounds_buffered_work():
+    """Listing stays at most a bounded distance ahead of the consumer."""
+    service = get_transcript_service()
+    listed = 0
+
+    async def pages():
+        nonlocal listed
+        for page in range(100):
+            listed += 1
+            yield [f"vid{page}-{i}" for i in range(50)]
+
+    async def fake_fetch(video_id, selection=None):
+        return SAMPLE_TRANSCRIPT_SEGMENTS
+
+    with patch.object(service, "fetch_segments", side_effect=fake_fetch):
+        stream = service.stream_many(pages(), concurrency=2, depth=10)
+        await stream.__anext__()
+        await stream.aclose()
+
+    assert listed <= 2
@@ -0,0 +1,123 @@
+"""Tests for the cached /search endpoint."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.cache.search_cache import search_key
+from app.main import app
+from app.services.quota import QuotaLedger
+from app.services.search_service import SearchService, get_search_service
+from app.services.youtube_client import YouTubeClient
+
+PAGES = {None: "p2", "p2": "p3", "p3": None}
+
+
+class StubSearchAPI:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        token = request.url.params.get("pageToken")
+        self.calls.append((request.url.params["q"], token))
+        body = {
+            "items": [
+                {"id": {"videoId": f"{token or 'p1'}-{i}"}, "snippet": {"title": f"Result {i}", "channelTitle": "Chan"}}
+                for i in range(int(request.url.params["maxResults"]))
+            ],
+            "pageInfo": {"totalResults": 30},
+        }
+        if PAGES[token]:
+            body["nextPageToken"] = PAGES[token]
+        return httpx.Response(200, json=body)
+
+
+@pytest.fixture
+def search_api():
+    stub = StubSearchAPI()
+    client = YouTubeClient("test-key", transport=httpx.MockTransport(stub), quota=QuotaLedger(10_000))
+    service = SearchService(client=client)
+    app.dependency_overrides[get_search_service] = lambda: service
+    yield stub, service
+    app.dependency_overrides.pop(get_search_service, None)
+
+
+def test_search_key_ignores_case_whitespace_and_parameter_order():
+    assert search_key(" Cats   Videos ", maxResults=10, pageToken=None) == search_key(
+        "cats videos", pageToken="", maxResults="10"
+    )
+    assert search_key("cats", maxResults=10) != search_key("cats", maxResults=20)
+
+
+@pytest.mark.asyncio
+async def test_equivalent_searches_cost_one_call(search_api):
+    stub, service = search_api
+    service.prefetch_next_page = False
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get("/search/", params={"q": "Cats  Videos", "maxResults": 3})
+        second = await ac.get("/search/", params={"maxResults": 3, "q": "cats videos"})
+
+    assert first.status_code == 200
+    body = second.json()
+    assert [item["id"] for item in body["items"]] == ["p1-0", "p1-1", "p1-2"]
+    assert body["items"][0]["channel_title"] == "Chan"
+    assert body["next_page_token"] == "p2"
+    assert stub.calls == [("Cats  Videos", None)]
+
+
+@pytest.mark.asyncio
+async def test_next_page_is_prefetched(search_api):
+    stub, service = search_api
+    service.prefetch_next_page = True
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/search/", params={"q": "cats", "maxResults": 2})
+        await asyncio.sleep(0.05)  # background prefetch of p2
+        page2 = await ac.get("/search/", params={"q": "cats", "maxResults": 2, "pageToken": "p2"})
+        await asyncio.sleep(0.05)
+
+    assert [item["id"] for item in page2.json()["items"]] == ["p2-0", "p2-1"]
+    assert [token for _, token in stub.calls] == [None, "p2", "p3"]
+    assert service.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_keeps_the_quota_reserve(search_api):
+    stub, service = search_api
+    service.prefetch_next_page = True
+    service.prefetch_quota_reserve = 9_850
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/search/", params={"q": "cats", "maxResults": 2})
+        await asyncio.sleep(0.05)
+
+    assert stub.calls == [("cats", None)]
+    assert service.stats()["prefetches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_promoted_token_pages_keep_their_short_ttl(search_api):
+    _, service = search_api
+    cache = service.cache
+    await cache.set("paged", {"items": []}, paged=True)
+    cache.l1.clear()
+
+    assert await cache.get("paged") == {"items": []}
+    _, _, expires_at = cache.l1._entries[cache.key("paged")]
+    assert expires_at - time.monotonic() <= cache.page_ttl_seconds < cache.ttl_seconds
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_maps_to_503(search_api):
+    stub, service = search_api
+    service.client.quota = QuotaLedger(50)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/search/", params={"q": "cats"})
+
+    assert response.status_code == 503
+    assert stub.calls == []
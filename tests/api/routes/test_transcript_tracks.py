@@ -0,0 +1,94 @@
+"""Tests for cached track metadata and language selection."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from youtube_transcript_api import Transcript, TranscriptList
+
+from app.main import app
+from app.models.tracks import Selection, Track, select_track
+
+VIDEO_ID = "multiLangVideo"
+CAPTIONS = {
+    "en": '<transcript><text start="0.5" dur="1.5">Hello world</text></transcript>',
+    "de": '<transcript><text start="0.5" dur="1.5">Hallo Welt</text></transcript>',
+    "en&tlang=fr": '<transcript><text start="0.5" dur="1.5">Bonjour le monde</text></transcript>',
+}
+
+
+def _http_client():
+    """Stand-in for ``requests.Session`` serving timed-text by URL suffix."""
+
+    def get(url, headers=None):
+        response = MagicMock()
+        response.text = CAPTIONS[url.split("lang=", 1)[1]]
+        return response
+
+    client = MagicMock()
+    client.get.side_effect = get
+    return client
+
+
+def _listing(video_id):
+    client = _http_client()
+    translations = [{"language": "French", "language_code": "fr"}]
+    english = Transcript(client, video_id, "https://t/?lang=en", "English", "en", False, translations)
+    german = Transcript(client, video_id, "https://t/?lang=de", "German (auto)", "de", True, [])
+    return TranscriptList(video_id, {"en": english}, {"de": german}, translations)
+
+
+@pytest.mark.asyncio
+@patch("app.services.transcript_service.requests.Session", side_effect=_http_client)
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts", side_effect=_listing)
+async def test_other_language_and_tracks_reuse_cached_listing(mock_list_transcripts, mock_session):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        default = await ac.get(f"/transcripts/{VIDEO_ID}?format=text")
+        german = await ac.get(f"/transcripts/{VIDEO_ID}?format=text&language=de")
+        french = await ac.get(f"/transcripts/{VIDEO_ID}?format=text&language=fr")
+        tracks = await ac.get(f"/transcripts/{VIDEO_ID}/tracks")
+
+    assert default.text == "Hello world"
+    assert german.text == "Hallo Welt"
+    assert french.text == "Bonjour le monde"
+    mock_list_transcripts.assert_called_once_with(VIDEO_ID)
+    assert mock_session.call_count == 2  # one direct download per extra language
+
+    assert tracks.json() == {
+        "video_id": VIDEO_ID,
+        "tracks": [
+            {"language": "English", "language_code": "en", "is_generated": False,
+             "is_translatable": True, "translation_languages": ["fr"]},
+            {"language": "German (auto)", "language_code": "de", "is_generated": True,
+             "is_translatable": False, "translation_languages": []},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts", side_effect=_listing)
+async def test_tracks_endpoint_lists_once(mock_list_transcripts):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get(f"/transcripts/{VIDEO_ID}/tracks")
+        second = await ac.get(f"/transcripts/{VIDEO_ID}/tracks")
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    mock_list_transcripts.assert_called_once_with(VIDEO_ID)
+
+
+@pytest.mark.asyncio
+async def test_invalid_prefer_parameter():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(f"/transcripts/{VIDEO_ID}?prefer=best")
+    assert response.status_code == 422
+
+
+def test_select_track_honours_preference_and_translation():
+    manual = Track("English", "en", False, "u1", [{"language": "Spanish", "language_code": "es"}])
+    generated = Track("English (auto)", "en", True, "u2")
+
+    assert select_track([manual, generated], Selection()) == (manual, None)
+    assert select_track([manual, generated], Selection(prefer="generated")) == (generated, None)
+    assert select_track([manual, generated], Selection(("es",))) == (manual, "es")
+    assert select_track([generated], Selection(("es",))) is None
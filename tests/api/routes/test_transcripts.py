@@ -1,5 +1,8 @@
 """Tests for the /transcripts API endpoint."""
 
+import gzip
+import time
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 from unittest.mock import patch, MagicMock
@@ -7,7 +10,11 @@ from unittest.mock import patch, MagicMock
 # Import the actual exceptions from the library
 from youtube_transcript_api import TranscriptsDisabled, NoTranscriptFound
 
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, TranscriptCache, get_transcript_cache
 from app.main import app  # Ensure app is imported for client
+from app.models.compact import CompactTranscript
+from app.services.formatters import render_body
 
 # Constants for video IDs used in tests
 MOCKED_SUCCESS_VIDEO_ID = "mockedSuccessVideo"
@@ -226,3 +233,119 @@ async def test_get_transcript_fetch_raises_unexpected_error(mock_list_transcript
     mock_list_transcripts.assert_called_once_with(video_id)
     mock_transcript_list_obj.find_manually_created_transcript.assert_called_once()
     mock_transcript_data.fetch.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cached_json_response_is_not_reencoded():
+    """Hot videos are served from stored response bytes without rendering again."""
+    video_id = MOCKED_SUCCESS_VIDEO_ID
+    cache = get_transcript_cache()
+    await RedisCache().set(cache.key(video_id), CacheEntry(time.time(), CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)).encode())
+
+    with patch(
+        "app.services.transcript_service.render_body",
+        wraps=render_body,
+    ) as spy_render:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            first = await ac.get(f"/transcripts/{video_id}?format=json")
+            second = await ac.get(f"/transcripts/{video_id}?format=json")
+
+    assert second.status_code == 200
+    assert second.headers["content-type"] == "application/json"
+    assert second.json() == {"video_id": video_id, "transcript": SAMPLE_TRANSCRIPT_SEGMENTS}
+    assert second.content == first.content
+    spy_render.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_returns_304_without_rendering():
+    video_id = MOCKED_SUCCESS_VIDEO_ID
+    cache = get_transcript_cache()
+    await RedisCache().set(cache.key(video_id), CacheEntry(time.time(), CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)).encode())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get(f"/transcripts/{video_id}")
+        tag = first.headers["etag"]
+        with patch("app.services.transcript_service.render_body", wraps=render_body) as spy_render:
+            revalidated = await ac.get(f"/transcripts/{video_id}", headers={"If-None-Match": f'"other", {tag}'})
+        srt = await ac.get(f"/transcripts/{video_id}?format=srt", headers={"If-None-Match": tag})
+        window = await ac.get(f"/transcripts/{video_id}?end=1", headers={"If-None-Match": tag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == tag
+    spy_render.assert_not_called()
+    # Other representations of the same transcript have their own tags.
+    assert srt.status_code == 200 and srt.headers["etag"] != tag
+    assert window.status_code == 200 and window.headers["etag"] not in (tag, srt.headers["etag"])
+
+
+@pytest.mark.asyncio
+async def test_compressed_variants_are_built_once_per_transcript():
+    video_id = MOCKED_SUCCESS_VIDEO_ID
+    segments = [{"text": f"segment number {i}", "start": float(i), "duration": 1.0} for i in range(200)]
+    cache = get_transcript_cache()
+    await RedisCache().set(cache.key(video_id), CacheEntry(time.time(), CompactTranscript.from_segments(segments)).encode())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        with patch("app.services.http_cache.gzip.compress", wraps=gzip.compress) as spy_gzip:
+            responses = [
+                await ac.get(f"/transcripts/{video_id}?format={fmt}", headers={"Accept-Encoding": "gzip"})
+                for fmt in ("json", "json", "srt", "srt")
+            ]
+        plain = await ac.get(f"/transcripts/{video_id}", headers={"Accept-Encoding": "identity"})
+
+    assert spy_gzip.call_count == 2  # once per format
+    for response in responses:
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+    assert responses[0].json() == {"video_id": video_id, "transcript": segments}
+    assert responses[2].text.startswith("1\n00:00:00,000 --> 00:00:01,000\nsegment number 0\n")
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == responses[0].json()
+    # Strong validators differ between content-codings.
+    assert plain.headers["etag"] != responses[0].headers["etag"]
+    assert responses[0].headers["etag"] == responses[1].headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_revalidation_is_answered_from_the_digest_record():
+    video_id = MOCKED_SUCCESS_VIDEO_ID
+    segments = [{"text": f"segment number {i}", "start": float(i), "duration": 1.0} for i in range(200)]
+    cache = get_transcript_cache()
+    await cache.set(video_id, CompactTranscript.from_segments(segments))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        gzipped = await ac.get(f"/transcripts/{video_id}", headers={"Accept-Encoding": "gzip"})
+        plain = await ac.get(f"/transcripts/{video_id}", headers={"Accept-Encoding": "identity"})
+        cache.l1.clear()  # e.g. another worker: only Redis has the transcript
+        with patch("app.cache.transcript_cache.CompactTranscript.decode") as spy_decode:
+            revalidated = [
+                await ac.get(f"/transcripts/{video_id}", headers={"If-None-Match": response.headers["etag"]})
+                for response in (gzipped, plain)
+            ]
+
+    spy_decode.assert_not_called()
+    assert [r.status_code for r in revalidated] == [304, 304]
+    assert [r.headers["etag"] for r in revalidated] == [gzipped.headers["etag"], plain.headers["etag"]]
+
+
+@pytest.mark.asyncio
+async def test_etag_and_body_agree_after_another_worker_stores_a_new_version():
+    video_id = MOCKED_SUCCESS_VIDEO_ID
+    old = [{"text": f"old segment {i}", "start": float(i), "duration": 1.0} for i in range(200)]
+    new = [{"text": f"new segment {i}", "start": float(i), "duration": 1.0} for i in range(200)]
+    cache = get_transcript_cache()
+    await cache.set(video_id, CompactTranscript.from_segments(old))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        before = await ac.get(f"/transcripts/{video_id}", headers={"Accept-Encoding": "gzip"})
+        await TranscriptCache().set(video_id, CompactTranscript.from_segments(new))  # another worker
+        cache.l1.delete(cache.key(video_id))  # our copy expires and is re-read from Redis
+        after = await ac.get(f"/transcripts/{video_id}", headers={"Accept-Encoding": "gzip"})
+        plain = await ac.get(f"/transcripts/{video_id}", headers={"Accept-Encoding": "identity"})
+
+    assert before.json()["transcript"] == old
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["transcript"] == new
+    assert plain.json()["transcript"] == new
@@ -0,0 +1,44 @@
+"""The benchmark fake upstream must keep working against the real service."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.services.youtube_client import get_youtube_client
+from benchmarks.common import latency_summary, percentile
+from benchmarks.fake_upstream import FakeUpstream, FakeUpstreamConfig
+
+FAST = FakeUpstreamConfig(list_latency_ms=0, fetch_latency_ms=0, data_api_latency_ms=0, segments=20, playlist_size=60)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert latency_summary([0.001, 0.002])["p50_ms"] == 1.0
+
+
+def test_fake_transcripts_are_deterministic():
+    assert FakeUpstream(FAST).segments("abc") == FakeUpstream(FAST).segments("abc")
+    assert FakeUpstream(FAST).segments("abc") != FakeUpstream(FAST).segments("abd")
+
+
+@pytest.mark.asyncio
+async def test_fake_upstream_serves_transcripts_and_playlists():
+    upstream = FakeUpstream(FAST)
+    client = upstream.client()
+    app.dependency_overrides[get_youtube_client] = lambda: client
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            with upstream.installed():
+                single = await ac.get("/transcripts/abc")
+                playlist = await ac.get("/playlists/PLbench/transcripts")
+    finally:
+        app.dependency_overrides.pop(get_youtube_client, None)
+        await client.close()
+
+    assert single.status_code == 200
+    assert [s["text"] for s in single.json()["transcript"]] == [s["text"] for s in upstream.segments("abc")]
+    lines = playlist.text.splitlines()
+    assert len(lines) == 60 and all('"status":"ok"' in line for line in lines)
+    assert upstream.calls["data_api"] == 2  # two playlistItems pages of 50
@@ -0,0 +1,75 @@
+"""Tests for the persistent SQLite transcript archive behind Redis."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.cache.archive import TranscriptArchive
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, TranscriptCache
+from app.models.compact import CompactTranscript
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+    {"text": "This is a test", "start": 2.0, "duration": 2.5},
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = TranscriptArchive(str(tmp_path / "archive.sqlite3"))
+    yield archive
+    archive.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_survives_redis_flush_and_restart(archive):
+    await TranscriptCache(archive=archive).set("vid", CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS))
+    await RedisCache().client.flushdb()
+
+    reopened = TranscriptArchive(archive.path)
+    restarted = TranscriptCache(archive=reopened)  # empty L1, empty Redis
+    entry = await restarted.get("vid")
+    reopened.close()
+
+    assert entry.transcript.to_dicts() == SAMPLE_TRANSCRIPT_SEGMENTS
+    assert restarted.is_fresh(entry)
+    assert await RedisCache().get(restarted.key("vid")) is not None  # promoted
+    assert restarted.stats()["archive"]["promotions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_falls_back_to_archive_when_redis_is_down(archive):
+    await TranscriptCache(archive=archive).set("a", CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS))
+    failing = MagicMock(spec=RedisCache)
+    failing.mget.side_effect = RedisConnectionError("down")
+    failing.set.side_effect = RedisConnectionError("down")
+
+    found = await TranscriptCache(l2=failing, archive=archive).get_many(["a", "b"])
+
+    assert list(found) == ["a"]
+    assert archive.stats()["hits"] == 1 and archive.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_older_than_max_age_are_ignored(archive):
+    cache = TranscriptCache(archive=archive)
+    fetched_at = time.time() - cache.archive_max_age_seconds - 1
+    old = CacheEntry(fetched_at, CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS))
+    await archive.put(cache.key("old"), old.fetched_at, old.encode())
+
+    assert await cache.get("old") is None
+    assert cache.stats()["archive"]["promotions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_entries_past_max_age(archive):
+    now = time.time()
+    await archive.put("old", now - 100, b"old")
+    await archive.put("new", now, b"new")
+
+    assert await archive.prune(50) == 1
+    assert await archive.get_many(["old", "new"]) == {"new": b"new"}
+    assert archive.stats()["pruned"] == 1
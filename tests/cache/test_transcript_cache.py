@@ -0,0 +1,160 @@
+"""Tests for the two-tier transcript cache."""
+
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.cache.local_redis import LocalRedis
+from app.cache.memory_cache import ByteLRUCache
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, TranscriptCache
+from app.main import app
+from app.models.compact import CompactTranscript
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+    {"text": "This is a test", "start": 2.0, "duration": 2.5},
+]
+
+
+def test_lru_evicts_by_byte_budget():
+    cache = ByteLRUCache(max_bytes=100)
+    cache.set("a", "A", size=40)
+    cache.set("b", "B", size=40)
+    assert cache.get("a") == "A"  # "b" is now least recently used
+
+    cache.set("c", "C", size=40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.current_bytes == 80
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_rejects_entries_larger_than_budget():
+    cache = ByteLRUCache(max_bytes=10)
+    assert cache.set("big", "x", size=11) is False
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_is_promoted_to_l1():
+    cache = TranscriptCache()
+    await RedisCache().set(cache.key("vid"), CacheEntry(time.time(), CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)).encode())
+
+    assert (await cache.get("vid")).transcript.to_dicts() == SAMPLE_TRANSCRIPT_SEGMENTS
+    assert (await cache.get("vid")).transcript.to_dicts() == SAMPLE_TRANSCRIPT_SEGMENTS
+
+    stats = cache.stats()
+    assert stats["l2"]["hits"] == 1
+    assert stats["l1"]["hits"] == 1
+    assert stats["l1"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_failures_degrade_to_miss():
+    failing = MagicMock(spec=RedisCache)
+    failing.get.side_effect = RedisConnectionError("down")
+    failing.set.side_effect = RedisConnectionError("down")
+    cache = TranscriptCache(l2=failing)
+
+    assert await cache.get("vid") is None
+    await cache.set("vid", CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS))
+    assert (await cache.get("vid")).transcript.to_dicts() == SAMPLE_TRANSCRIPT_SEGMENTS
+    assert cache.stats()["l2"]["errors"] == 2
+
+
+def test_memory_url_selects_local_redis():
+    assert isinstance(RedisCache().client, LocalRedis)
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_repeated_requests_are_served_from_cache(mock_list_transcripts):
+    mock_transcript_data = MagicMock()
+    mock_transcript_data.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    mock_transcript_list_obj = MagicMock()
+    mock_transcript_list_obj.find_manually_created_transcript = MagicMock(return_value=mock_transcript_data)
+    mock_list_transcripts.return_value = mock_transcript_list_obj
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        json_response = await ac.get("/transcripts/cachedVideo?format=json")
+        text_response = await ac.get("/transcripts/cachedVideo?format=text")
+
+    assert json_response.json()["transcript"] == SAMPLE_TRANSCRIPT_SEGMENTS
+    assert text_response.text == "Hello world\nThis is a test"
+    mock_list_transcripts.assert_called_once_with("cachedVideo")
+    mock_transcript_data.fetch.assert_called_once()
+
+
+
+@pytest.mark.asyncio
+async def test_undecodable_l2_entry_is_treated_as_miss():
+    cache = TranscriptCache()
+    await RedisCache().set(cache.key("vid"), b"not a transcript")
+
+    assert await cache.get("vid") is None
+    assert cache.stats()["l2"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_storing_a_transcript_drops_rendered_variants():
+    cache = TranscriptCache()
+    old = CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)
+    await cache.set("vid", old)
+    cache.set_rendered("vid", old.digest, "json", b"old body")
+
+    await cache.set("vid", CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS[:1]))
+
+    assert cache.get_rendered("vid", old.digest, "json") is None
+
+
+@pytest.mark.asyncio
+async def test_rendered_bodies_never_outlive_their_transcript_version():
+    cache = TranscriptCache()
+    old = CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)
+    await cache.set("vid", old)
+    cache.set_rendered("vid", old.digest, "json", b"old body")
+
+    # Another worker stores a newer version; ours expires from L1 and is re-read from Redis.
+    new = CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS[:1])
+    await TranscriptCache().set("vid", new)
+    cache.l1.delete(cache.key("vid"))
+    entry = await cache.get("vid")
+
+    assert entry.transcript.digest == new.digest
+    assert cache.get_rendered("vid", entry.transcript.digest, "json") is None
+
+
+@pytest.mark.asyncio
+async def test_entries_are_fresh_then_stale_then_gone():
+    cache = TranscriptCache(ttl_seconds=10)
+    cache.stale_ttl_seconds = 20
+    transcript = CompactTranscript.from_segments(SAMPLE_TRANSCRIPT_SEGMENTS)
+    await RedisCache().set(cache.key("fresh"), CacheEntry(time.time() - 5, transcript).encode())
+    await RedisCache().set(cache.key("stale"), CacheEntry(time.time() - 15, transcript).encode())
+    await RedisCache().set(cache.key("gone"), CacheEntry(time.time() - 35, transcript).encode())
+
+    entries = await cache.get_many(["fresh", "stale", "gone"])
+
+    assert cache.is_fresh(entries["fresh"])
+    assert not cache.is_fresh(entries["stale"])
+    assert "gone" not in entries
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_entries_round_trip_through_redis():
+    cache = TranscriptCache()
+    await cache.set_negative("vid", "disabled")
+    cache.l1.clear()
+
+    entry = await cache.get("vid")
+
+    assert entry.negative == "disabled"
+    assert entry.transcript is None
+    assert cache.stats()["negative_hits"] == 1
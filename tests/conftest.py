@@ -0,0 +1,44 @@
+"""Shared pytest fixtures.
+
+Process-wide singletons (executor, caches, services, API clients) hold
+asyncio primitives and cached transcripts.  pytest-asyncio creates a fresh
+loop per test and the tests reuse video IDs, so the singletons are rebuilt for
+every test.  Redis is
+replaced by the in-process stand-in selected via ``memory://``.
+"""
+
+import os
+
+os.environ.setdefault("REDIS_URL", "memory://")
+
+import pytest  # noqa: E402
+
+from app.cache.redis_cache import RedisCache  # noqa: E402
+from app.cache.search_cache import get_search_cache  # noqa: E402
+from app.cache.transcript_cache import get_transcript_cache  # noqa: E402
+from app.services.corpus_index import get_corpus_index  # noqa: E402
+from app.services.jobs import get_job_store  # noqa: E402
+from app.services.rate_limit import get_rate_limiter  # noqa: E402
+from app.services.search_service import get_search_service  # noqa: E402
+from app.services.transcript_service import get_transcript_service  # noqa: E402
+from app.services.upstream import get_upstream_executor  # noqa: E402
+from app.services.youtube_client import get_youtube_client  # noqa: E402
+from app.utils.profiling import get_slow_request_log  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_singletons():
+    yield
+    if get_upstream_executor.cache_info().currsize:
+        get_upstream_executor().shutdown()
+    get_upstream_executor.cache_clear()
+    get_transcript_cache.cache_clear()
+    get_transcript_service.cache_clear()
+    get_youtube_client.cache_clear()
+    get_search_cache.cache_clear()
+    get_search_service.cache_clear()
+    get_corpus_index.cache_clear()
+    get_job_store.cache_clear()
+    get_slow_request_log.cache_clear()
+    get_rate_limiter.cache_clear()
+    RedisCache.reset()
@@ -0,0 +1,69 @@
+"""Tests for the compact columnar transcript container and its codec."""
+
+import json
+
+import pytest
+
+from app.models.compact import CompactTranscript, TranscriptDecodeError
+
+SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+    {"text": "multi\nline café ♪", "start": 2.37, "duration": 0.001},
+    {"text": "", "start": 3600.123, "duration": 4.0},
+]
+
+
+def test_round_trip_preserves_segments():
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+
+    assert len(transcript) == 3
+    assert transcript.to_dicts() == SEGMENTS
+    assert transcript.text_at(1) == "multi\nline café ♪"
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_binary_encoding_round_trip(compress):
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+
+    decoded = CompactTranscript.decode(transcript.encode(compress=compress))
+
+    assert decoded.to_dicts() == SEGMENTS
+    assert decoded.text == transcript.text
+
+
+def test_encoding_is_versioned():
+    payload = bytearray(CompactTranscript.from_segments(SEGMENTS).encode())
+    payload[3] = 99
+    with pytest.raises(TranscriptDecodeError):
+        CompactTranscript.decode(bytes(payload))
+
+
+@pytest.mark.parametrize("payload", [b"", b"YTT", b"YTT\x01\x00\x05\x00\x00\x00", b"YTT\x01\x01garbage"])
+def test_corrupt_payloads_raise_decode_error(payload):
+    with pytest.raises(TranscriptDecodeError):
+        CompactTranscript.decode(payload)
+
+
+def test_encoding_is_several_times_smaller_than_json():
+    segments = [
+        {"text": f"this is spoken sentence number {i} of the lecture", "start": i * 2.5, "duration": 2.4}
+        for i in range(5000)
+    ]
+    as_json = json.dumps(segments).encode("utf-8")
+    compact = CompactTranscript.from_segments(segments)
+
+    assert len(compact.encode()) * 5 < len(as_json)
+    assert compact.nbytes < len(as_json)
+
+
+def test_span_and_slice_select_a_time_window():
+    transcript = CompactTranscript.from_segments(
+        [{"text": f"line {i}", "start": i * 2.0, "duration": 2.0} for i in range(10)]
+    )
+
+    assert transcript.span(5.0, 9.0) == (2, 5)  # segment 2 (4s-6s) is on screen at 5s
+    assert transcript.span(None, 0.0) == (0, 0)
+    part = transcript.slice(5.0, 9.0)
+    assert [s["text"] for s in part.to_dicts()] == ["line 2", "line 3", "line 4"]
+    assert part.to_dicts()[0]["start"] == 4.0
+    assert transcript.slice() is transcript
@@ -0,0 +1,157 @@
+"""Tests for the local full-text corpus index and /corpus/search."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.models.compact import CompactTranscript
+from app.services.corpus_index import COMPACT_MIN_TOMBSTONES, CorpusIndex
+from app.services.transcript_service import get_transcript_service
+
+
+def _transcript(*texts):
+    return CompactTranscript.from_segments(
+        [{"text": text, "start": i * 2.5, "duration": 2.5} for i, text in enumerate(texts)]
+    )
+
+
+@pytest.fixture
+def index():
+    index = CorpusIndex()
+    index.add("vidA", _transcript("Welcome back", "today we talk about Rust", "rust ownership rules"))
+    index.add("vidB", _transcript("Python tips", "ownership in Python? Not really"))
+    index.add("vidC", _transcript("rust", "more Rust", "even more rust"))
+    return index
+
+
+def test_all_terms_must_match_within_a_segment(index):
+    hits = index.search("RUST ownership")
+
+    assert [(h.video_id, h.segment, h.start) for h in hits] == [("vidA", 2, 5.0)]
+
+
+def test_videos_with_more_matching_segments_rank_first(index):
+    hits = index.search("rust", per_video=1)
+
+    assert [h.video_id for h in hits] == ["vidC", "vidA"]
+    assert hits[0].score > hits[1].score
+
+
+def test_reindexing_replaces_previous_postings(index):
+    index.add("vidA", _transcript("completely different words"))
+
+    assert [h.video_id for h in index.search("rust")] == ["vidC"] * 3
+    assert index.search("different")[0].video_id == "vidA"
+    assert index.stats()["tombstones"] == 1
+
+
+def test_reindexing_unchanged_content_is_a_noop(index):
+    before = index.stats()
+
+    index.add("vidA", _transcript("Welcome back", "today we talk about Rust", "rust ownership rules"))
+
+    assert index.stats() == before
+
+
+def test_live_index_is_compacted_once_tombstones_pile_up():
+    index = CorpusIndex()
+    for version in range(COMPACT_MIN_TOMBSTONES * 2):
+        index.add("vid", _transcript("shared words", f"version {version}"))
+
+    stats = index.stats()
+    assert stats["tombstones"] < COMPACT_MIN_TOMBSTONES
+    assert stats["postings"] <= 4 * COMPACT_MIN_TOMBSTONES
+    assert [h.segment for h in index.search(f"version {COMPACT_MIN_TOMBSTONES * 2 - 1}")] == [1]
+    assert index.search("version 0") == []
+
+
+def test_search_while_indexing_on_another_thread():
+    index = CorpusIndex()
+    texts = [f"common word {i}" for i in range(1000)]
+    errors = []
+
+    def writer():
+        try:
+            for round_ in range(3):
+                for n in range(100):
+                    index.add(f"vid{n}", _transcript(*texts, f"round {round_}"))
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        while thread.is_alive():
+            index.search("common word")
+    finally:
+        thread.join()
+
+    assert errors == []
+    assert len(index) == 100
+    assert {h.video_id for h in index.search("round 2", limit=1000)} == {f"vid{n}" for n in range(100)}
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    index.remove("vidB")
+    path = str(tmp_path / "corpus.idx")
+
+    index.save(path)
+    loaded = CorpusIndex.load(path)
+
+    assert len(loaded) == 2
+    assert loaded.stats()["tombstones"] == 0
+    assert [(h.video_id, h.segment, h.start) for h in loaded.search("rust ownership")] == [("vidA", 2, 5.0)]
+    assert loaded.search("python") == []
+
+
+def test_concurrent_saves_do_not_share_a_temp_file(index, tmp_path):
+    path = str(tmp_path / "corpus.idx")
+    threads = [threading.Thread(target=index.save, args=(path,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(CorpusIndex.load(path)) == 3
+    assert [p.name for p in tmp_path.iterdir()] == ["corpus.idx"]
+
+
+def test_loaded_index_skips_unchanged_transcripts(index, tmp_path):
+    path = str(tmp_path / "corpus.idx")
+    index.save(path)
+    loaded = CorpusIndex.load(path)
+
+    loaded.add("vidA", _transcript("Welcome back", "today we talk about Rust", "rust ownership rules"))
+    loaded.add("vidB", _transcript("Python tips", "now about Go"))
+
+    assert loaded.stats()["tombstones"] == 1  # only the changed transcript was re-indexed
+    assert [h.video_id for h in loaded.search("rust ownership")] == ["vidA"]
+    assert [h.video_id for h in loaded.search("go")] == ["vidB"]
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_fetched_transcripts_become_searchable(mock_list_transcripts):
+    transcript = MagicMock()
+    transcript.fetch.return_value = [
+        {"text": "intro music", "start": 0.0, "duration": 4.0},
+        {"text": "the Borrow checker explained", "start": 4.0, "duration": 3.0},
+    ]
+    mock_list_transcripts.return_value.find_manually_created_transcript = MagicMock(return_value=transcript)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/transcripts/indexedVid")
+        await asyncio.gather(*get_transcript_service()._indexing)
+        response = await ac.get("/corpus/search", params={"q": "borrow CHECKER"})
+        empty = await ac.get("/corpus/search", params={"q": "?!"})
+
+    assert response.status_code == 200
+    [hit] = response.json()["hits"]
+    assert (hit["video_id"], hit["segment"], hit["start"]) == ("indexedVid", 1, 4.0)
+    assert hit["text"] == "the Borrow checker explained"
+    assert mock_list_transcripts.call_count == 1
+    assert empty.status_code == 400
@@ -0,0 +1,82 @@
+"""Tests for the streaming transcript formatters."""
+
+import json
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from youtube_transcript_api.formatters import SRTFormatter, TextFormatter, WebVTTFormatter
+
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, get_transcript_cache
+from app.main import app
+from app.models.compact import CompactTranscript
+from app.services import formatters
+from app.services.formatters import stream_ndjson, stream_srt, stream_text, stream_vtt
+
+SEGMENTS = [
+    {"text": f"line {i} <i>&</i>", "start": 3595.0 + i * 2, "duration": 1.25} for i in range(10)
+]
+
+
+@pytest.fixture
+def transcript(monkeypatch):
+    monkeypatch.setattr(formatters, "CHUNK_SEGMENTS", 3)
+    return CompactTranscript.from_segments(SEGMENTS)
+
+
+def test_text_and_srt_match_the_library_formatters(transcript):
+    assert b"".join(stream_text(transcript)).decode() == TextFormatter().format_transcript(SEGMENTS)
+    assert b"".join(stream_srt(transcript)).decode() == SRTFormatter().format_transcript(SEGMENTS)
+
+
+def test_overlapping_cues_are_clipped_like_the_library(monkeypatch):
+    monkeypatch.setattr(formatters, "CHUNK_SEGMENTS", 2)
+    segments = [  # auto-generated captions overlap the next line
+        {"text": f"line {i}", "start": i * 1.5, "duration": 2.75 if i % 2 else 1.0} for i in range(5)
+    ]
+    transcript = CompactTranscript.from_segments(segments)
+
+    srt = b"".join(stream_srt(transcript)).decode()
+    assert srt == SRTFormatter().format_transcript(segments)
+    assert "00:00:01,500 --> 00:00:03,000" in srt
+    assert b"".join(stream_vtt(transcript)).decode() == WebVTTFormatter().format_transcript(segments)
+
+
+def test_output_is_chunked(transcript):
+    chunks = list(stream_srt(transcript))
+
+    assert len(chunks) == 4
+    assert chunks[0].startswith(b"1\n00:59:55,000 --> 00:59:56,250\n")
+    assert b"\n01:00:03,000 --> 01:00:04,250\n" in chunks[1]
+
+
+def test_vtt_escapes_cue_text(transcript):
+    body = b"".join(stream_vtt(transcript)).decode()
+
+    assert body.startswith("WEBVTT\n\n00:59:55.000 --> 00:59:56.250\nline 0 &lt;i&gt;&amp;&lt;/i&gt;\n\n")
+
+
+def test_ndjson_lines_are_segments(transcript):
+    lines = b"".join(stream_ndjson(transcript)).splitlines()
+
+    assert [json.loads(line) for line in lines] == SEGMENTS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt, media_type", [
+    ("srt", "application/x-subrip; charset=utf-8"),
+    ("vtt", "text/vtt; charset=utf-8"),
+    ("ndjson", "application/x-ndjson"),
+])
+async def test_route_streams_subtitle_formats(fmt, media_type):
+    window = [{"text": "Welcome", "start": 0.0, "duration": 3.0}, {"text": "bye", "start": 6.0, "duration": 3.0}]
+    entry = CacheEntry(time.time(), CompactTranscript.from_segments(window))
+    await RedisCache().set(get_transcript_cache().key("subtitleVid"), entry.encode())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/transcripts/subtitleVid", params={"format": fmt, "start": 6})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == media_type
+    assert "Welcome" not in response.text and "bye" in response.text
@@ -0,0 +1,121 @@
+"""Tests for the Redis-backed background job queue and the /jobs API."""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from youtube_transcript_api import TranscriptsDisabled
+
+from app.api.routes.transcripts import bulk_record
+from app.main import app
+from app.services.jobs import CANCELLED, DONE, JobRunner, get_job_store
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [{"text": "Hello world", "start": 0.5, "duration": 1.5}]
+
+
+def _fake_list_transcripts(video_id):
+    if video_id.startswith("disabled"):
+        raise TranscriptsDisabled(video_id)
+    transcript = MagicMock()
+    transcript.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_job_lifecycle_over_the_api(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+    video_ids = [f"v{i}" for i in range(7)] + ["disabled1", "v0"]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        submitted = await ac.post("/jobs/", json={"video_ids": video_ids})
+        job_id = submitted.json()["job_id"]
+        queued = await ac.get(f"/jobs/{job_id}")
+
+        runner = JobRunner(render=bulk_record, chunk_size=3)
+        assert await runner.process_next() == job_id
+
+        finished = await ac.get(f"/jobs/{job_id}")
+        first = await ac.get(f"/jobs/{job_id}/results", params={"limit": 5})
+        rest = await ac.get(f"/jobs/{job_id}/results", params={"offset": first.json()["next_offset"]})
+        events = await ac.get(f"/jobs/{job_id}/events")
+        missing = await ac.get("/jobs/unknown")
+
+    assert submitted.status_code == 202
+    assert queued.json()["status"] == "queued" and queued.json()["total"] == 8
+    assert finished.json()["status"] == DONE
+    assert (finished.json()["processed"], finished.json()["ok"], finished.json()["failed"]) == (8, 7, 1)
+    records = first.json()["items"] + rest.json()["items"]
+    assert sorted(r["video_id"] for r in records) == sorted(video_ids[:-1])
+    [error] = [r for r in records if r["status"] == "error"]
+    assert (error["video_id"], error["status_code"]) == ("disabled1", 404)
+    assert events.text.startswith("event: done\n")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_crashed_worker_job_resumes_from_checkpoint(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+    store = get_job_store()
+    job = await store.submit("text", video_ids=[f"v{i}" for i in range(6)])
+
+    # A worker claimed the job, checkpointed the first chunk and died.
+    assert await store.claim() == job.job_id
+    await store.start(job.job_id, owner="dead-worker")
+    await store.checkpoint(job.job_id, [b'{"video_id":"v0"}', b'{"video_id":"v1"}'], ok=2, failed=0)
+    await store.client.hset(store.key(job.job_id), "heartbeat", time.time() - 120)
+
+    runner = JobRunner(render=bulk_record, chunk_size=2, lease_seconds=60)
+    assert await runner.process_next() is None  # still leased by the dead worker... until reaped
+    assert await store.requeue_stale(60) == [job.job_id]
+    assert await runner.process_next() == job.job_id
+
+    finished = await store.get(job.job_id)
+    records = [json.loads(r) for r in await store.results(job.job_id, 0, 100)]
+    assert (finished.status, finished.processed, finished.ok) == (DONE, 6, 6)
+    assert sorted(r["video_id"] for r in records) == [f"v{i}" for i in range(6)]
+    assert sorted(call.args[0] for call in mock_list_transcripts.call_args_list) == ["v2", "v3", "v4", "v5"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_job_is_never_run():
+    store = get_job_store()
+    job = await store.submit("json", video_ids=["v1"])
+
+    cancelled = await store.cancel(job.job_id)
+
+    assert cancelled.status == CANCELLED
+    assert await JobRunner(render=bulk_record).process_next() is None
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_worker_that_lost_its_lease_leaves_the_job_alone(mock_list_transcripts):
+    mock_list_transcripts.side_effect = _fake_list_transcripts
+    store = get_job_store()
+    job = await store.submit("text", video_ids=[f"v{i}" for i in range(6)])
+    next_chunk = store.next_chunk
+
+    async def stalled_next_chunk(job_id, offset, size):
+        ids = await next_chunk(job_id, offset, size)
+        if offset == 2:  # the job was reaped and claimed again while this worker stalled
+            await store.client.hset(store.key(job_id), "owner", "new-worker")
+        return ids
+
+    runner = JobRunner(render=bulk_record, chunk_size=2)
+    with patch.object(store, "next_chunk", side_effect=stalled_next_chunk):
+        assert await runner.process_next() == job.job_id
+
+    current = await store.get(job.job_id)
+    assert (current.status, current.owner, current.processed) == ("running", "new-worker", 2)
+    assert await store.next_chunk(job.job_id, 0, 10) == [f"v{i}" for i in range(6)]  # input kept
+    assert job.job_id.encode() in await store.client.lrange(store.PROCESSING, 0, -1)
+    assert not await store.finish(job.job_id, DONE, owner="old-worker")
+    assert (await store.get(job.job_id)).status == "running"
+    assert runner.completed == 0
@@ -0,0 +1,127 @@
+"""Tests for the start-up warm-up and the playlist prefetcher."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.cache.transcript_cache import get_transcript_cache
+from app.main import app
+from app.models.compact import CompactTranscript
+from app.services.prefetch import Prefetcher, load_hot_ids, uploads_playlist
+from app.services.transcript_service import TranscriptService, get_transcript_service
+from app.services.upstream import UpstreamExecutor
+from benchmarks.fake_upstream import FakeUpstream, FakeUpstreamConfig
+
+FAST = FakeUpstreamConfig(
+    list_latency_ms=0, fetch_latency_ms=0, data_api_latency_ms=0, segments=5, playlist_size=8, disabled_rate=0.2
+)
+
+
+def _prefetcher(client, **kwargs):
+    return Prefetcher(service=get_transcript_service(), client=client, interval=3600, poll_interval=0.01, **kwargs)
+
+
+def test_hot_ids_and_uploads_playlist(tmp_path):
+    path = tmp_path / "hot.txt"
+    path.write_text("a\n# comment\nb  # trailing\n\nc\n")
+
+    assert load_hot_ids(["c", "d"], str(path)) == ["c", "d", "a", "b"]
+    assert uploads_playlist("UCabc") == "UUabc"
+    assert uploads_playlist("PLxyz") == "PLxyz"
+
+
+@pytest.mark.asyncio
+async def test_cycle_prefetches_new_videos_only():
+    upstream = FakeUpstream(FAST)
+    client = upstream.client()
+    prefetcher = _prefetcher(client, playlists=["PLone"], quota_reserve=0)
+    await get_transcript_cache().set("PLone-00000", CompactTranscript.from_segments(upstream.segments("PLone-00000")))
+
+    with upstream.installed():
+        await prefetcher.run_cycle()
+        first_fetches = upstream.calls["list_transcripts"]
+        await prefetcher.run_cycle()
+    await client.close()
+
+    counters = prefetcher.stats()
+    assert counters["cycles"] == 2 and counters["deferred"] == 0
+    assert counters["already_cached"] == 1
+    assert counters["prefetched"] + counters["no_transcript"] == 7
+    assert first_fetches == 7
+    assert upstream.calls["list_transcripts"] == 7  # nothing new the second time
+    cached = await get_transcript_cache().get_many([f"PLone-{i:05d}" for i in range(8)])
+    assert len(cached) == 8  # transcripts and negative entries alike
+
+
+@pytest.mark.asyncio
+async def test_cycle_respects_quota_reserve_and_live_traffic():
+    upstream = FakeUpstream(FAST)
+    client = upstream.client()
+    starved = _prefetcher(client, playlists=["PLone"], quota_reserve=client.quota.daily_budget + 1)
+    with upstream.installed():
+        await starved.run_cycle()
+    assert starved.stats()["deferred"] == 1
+    assert upstream.calls["data_api"] == 0
+
+    # While live callers queue on the transcript upstream the prefetcher waits...
+    prefetcher = _prefetcher(client, playlists=["PLone"], quota_reserve=0)
+    lane = prefetcher.service.executor._lane(prefetcher.service.UPSTREAM)
+    lane.queued += 1
+    with upstream.installed():
+        task = asyncio.ensure_future(prefetcher.run_cycle())
+        await asyncio.sleep(0.1)
+        assert upstream.calls["list_transcripts"] == 0
+        lane.queued -= 1
+        await asyncio.wait_for(task, 5)
+    assert upstream.calls["list_transcripts"] == 8
+
+    # ...but only for so long: then the rest of the cycle is deferred.
+    impatient = _prefetcher(client, playlists=["PLtwo"], quota_reserve=0, max_wait=0.05)
+    lane.queued += 1
+    with upstream.installed():
+        await asyncio.wait_for(impatient.run_cycle(), 5)
+    lane.queued -= 1
+    await client.close()
+    assert impatient.stats()["deferred"] == 1
+    assert upstream.calls["list_transcripts"] == 8
+
+
+@pytest.mark.asyncio
+async def test_prefetch_runs_on_a_lane_narrower_than_the_headroom():
+    upstream = FakeUpstream(FAST)
+    client = upstream.client()
+    service = TranscriptService(executor=UpstreamExecutor(max_workers=2, max_concurrency=1))
+    prefetcher = Prefetcher(
+        service=service, client=client, playlists=["PLone"], interval=3600, quota_reserve=0,
+        headroom=2, max_wait=1, poll_interval=0.01,
+    )
+
+    with upstream.installed():
+        await asyncio.wait_for(prefetcher.run_cycle(), 5)
+    await client.close()
+
+    counters = prefetcher.stats()
+    assert counters["deferred"] == 0
+    assert counters["prefetched"] + counters["no_transcript"] == 8
+
+
+@pytest.mark.asyncio
+async def test_health_reports_warming_up_until_hot_ids_are_loaded():
+    upstream = FakeUpstream(FakeUpstreamConfig(list_latency_ms=100, fetch_latency_ms=0, segments=5))
+    prefetcher = _prefetcher(None, playlists=[], hot_ids=["hot1", "hot2"])
+    app.state.prefetcher = prefetcher
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            with upstream.installed():
+                prefetcher.start()
+                during = await ac.get("/health")
+                await asyncio.wait_for(prefetcher._task, 5)
+            after = await ac.get("/health")
+            stats = (await ac.get("/health/prefetch")).json()
+    finally:
+        del app.state.prefetcher
+
+    assert during.status_code == 503 and during.json() == {"status": "warming_up"}
+    assert after.status_code == 200
+    assert stats["warmed"] == 2 and stats["warming_up"] is False
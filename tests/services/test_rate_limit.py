@@ -0,0 +1,97 @@
+"""Tests for token-bucket rate limiting and its middleware."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch
+
+from app.api.middleware import RateLimitMiddleware
+from app.main import app
+from app.services.rate_limit import BULK, DEFAULT, SEARCH, Limit, LocalRateLimiter, get_rate_limiter, take
+
+
+def test_take_refills_and_reports_retry_after():
+    limit = Limit(rate=2.0, burst=4)
+
+    decision, tokens, ts = take(4.0, 0.0, 0.0, limit, 3)
+    assert decision.allowed and tokens == 1.0
+
+    decision, tokens, ts = take(tokens, ts, 0.5, limit, 3)  # refilled to 2.0
+    assert not decision.allowed and tokens == 2.0
+    assert decision.retry_after == pytest.approx(0.5)
+
+    decision, tokens, _ = take(tokens, ts, 100.0, limit, 1)  # capped at burst
+    assert decision.allowed and tokens == 3.0
+
+
+def test_memory_redis_uses_local_limiter():
+    assert isinstance(get_rate_limiter(), LocalRateLimiter)
+
+
+def _limited_app(limiter, burst=3, bulk_burst=10):
+    limits = {
+        DEFAULT: Limit(rate=0.001, burst=burst),
+        BULK: Limit(rate=0.001, burst=bulk_burst),
+        SEARCH: Limit(rate=0.001, burst=1),
+    }
+    return RateLimitMiddleware(app, limiter=limiter, limits=limits, playlist_cost=4, api_keys=["team-b"])
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_the_burst_get_429_per_client():
+    limited = _limited_app(LocalRateLimiter())
+
+    async with AsyncClient(transport=ASGITransport(app=limited), base_url="http://test") as ac:
+        statuses = [(await ac.get("/corpus/search", params={"q": "x"})).status_code for _ in range(4)]
+        refused = await ac.get("/corpus/search", params={"q": "x"})
+        other_key = await ac.get("/corpus/search", params={"q": "x"}, headers={"X-API-Key": "team-b"})
+        health = [(await ac.get("/health")).status_code for _ in range(5)]
+
+    assert statuses == [200, 200, 200, 429]
+    assert refused.status_code == 429
+    assert int(refused.headers["retry-after"]) >= 1
+    assert other_key.status_code == 200
+    assert health == [200] * 5
+
+
+@pytest.mark.asyncio
+async def test_unknown_api_keys_share_the_address_bucket():
+    limited = _limited_app(LocalRateLimiter())
+
+    async with AsyncClient(transport=ASGITransport(app=limited), base_url="http://test") as ac:
+        statuses = [
+            (await ac.get("/corpus/search", params={"q": "x"}, headers={"X-API-Key": f"random-{i}"})).status_code
+            for i in range(4)
+        ]
+
+    assert statuses == [200, 200, 200, 429]
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_buckets_of_slower_route_classes():
+    fast, slow = Limit(rate=100.0, burst=1), Limit(rate=0.001, burst=1)
+    limiter = LocalRateLimiter([fast, slow])
+    limiter.MAX_BUCKETS = 1
+    with patch("app.services.rate_limit.time.monotonic", side_effect=[0.0, 10.0, 10.0]):
+        await limiter.hit("bulk:client", slow, 1)
+        await limiter.hit("default:other", fast, 1)  # triggers a prune, long after `fast` refills
+
+        assert not (await limiter.hit("bulk:client", slow, 1)).allowed
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts", side_effect=RuntimeError("no upstream"))
+async def test_bulk_requests_are_charged_per_unique_video(_mock_list):
+    limiter = LocalRateLimiter()
+    limited = _limited_app(limiter)
+
+    async with AsyncClient(transport=ASGITransport(app=limited), base_url="http://test") as ac:
+        first = await ac.post("/transcripts/bulk", json={"video_ids": ["a", "b", "c", "a", "d", "e", "f"]})
+        second = await ac.post("/transcripts/bulk", json={"video_ids": "g,h,i,j,k"})
+        small = await ac.post("/transcripts/bulk", json={"video_ids": ["g", "h", "i"]})
+        single = await ac.get("/corpus/search", params={"q": "x"})  # other route class, own bucket
+
+    assert first.status_code == 200 and len(first.text.splitlines()) == 6  # body replayed intact
+    assert second.status_code == 429
+    assert small.status_code == 200
+    assert single.status_code == 200
+    assert limiter.refused == 1
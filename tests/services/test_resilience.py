@@ -0,0 +1,141 @@
+"""Tests for the circuit breaker and adaptive concurrency limits."""
+
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch
+
+from youtube_transcript_api import TooManyRequests, TranscriptsDisabled
+
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, get_transcript_cache
+from app.main import app
+from app.models.compact import CompactTranscript
+from app.services.resilience import AIMDLimiter, CircuitBreaker
+from app.services.transcript_service import get_transcript_service
+from app.services.upstream import CircuitOpen, UpstreamExecutor
+
+STALE_SEGMENTS = [{"text": "Stale text", "start": 0.0, "duration": 1.0}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limiter_halves_on_failure_and_grows_back():
+    clock = FakeClock()
+    limiter = AIMDLimiter(8, min_limit=1, latency_target=1.0, cooldown_seconds=1.0, clock=clock)
+
+    limiter.on_failure()
+    limiter.on_failure()  # same congestion event: ignored within the cooldown
+    assert limiter.limit == 4
+
+    clock.now = 2.0
+    limiter.on_success(latency=5.0)  # latency spike
+    assert limiter.limit == 2
+
+    for _ in range(40):
+        limiter.on_success(latency=0.1)
+    assert limiter.limit == 8
+
+
+def test_breaker_opens_then_probes_once():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.on_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10.0
+    assert breaker.state == "half_open"
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()
+    breaker.on_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.on_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["opened"] == 2
+
+
+def _throttled(video_id):
+    raise TooManyRequests(video_id)
+
+
+@pytest.mark.asyncio
+async def test_executor_fails_fast_while_circuit_is_open():
+    executor = UpstreamExecutor(max_workers=2, max_concurrency=4, failure_threshold=2, reset_seconds=60)
+    calls = 0
+
+    def flaky():
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("throttled")
+
+    try:
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await executor.run("yt", flaky)
+        with pytest.raises(CircuitOpen) as exc_info:
+            await executor.run("yt", flaky)
+
+        assert calls == 2
+        assert exc_info.value.retry_after > 0
+        stats = executor.stats()["yt"]
+        assert stats["circuit"]["state"] == "open"
+        assert stats["limit"] < 4
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_ordinary_answers_do_not_trip_the_breaker():
+    executor = get_transcript_service().executor
+    executor.failure_threshold = 1
+
+    with patch(
+        "app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts",
+        side_effect=TranscriptsDisabled("disabledVideo"),
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/transcripts/disabledVideo")
+
+    assert response.status_code == 404
+    assert executor.circuit_state("youtube_transcripts") == "closed"
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts", side_effect=_throttled)
+async def test_throttling_opens_circuit_and_stale_entries_are_still_served(mock_list_transcripts):
+    service = get_transcript_service()
+    service.executor.failure_threshold = 2
+    cache = get_transcript_cache()
+    stale_at = time.time() - cache.ttl_seconds - 1
+    await RedisCache().set(
+        cache.key("staleVideo"), CacheEntry(stale_at, CompactTranscript.from_segments(STALE_SEGMENTS)).encode()
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        throttled = [await ac.get(f"/transcripts/video{i}") for i in range(2)]
+        refused = await ac.get("/transcripts/video3")
+        stale = await ac.get("/transcripts/staleVideo?format=text")
+        monitoring = await ac.get("/health/upstream")
+
+    assert [r.status_code for r in throttled] == [503, 503]
+    assert refused.status_code == 503
+    assert int(refused.headers["Retry-After"]) > 1
+    assert mock_list_transcripts.call_count == 2
+
+    assert stale.text == "Stale text"
+    assert service.stats()["revalidations"] == 0  # no refresh attempted while open
+    assert monitoring.json()["youtube_transcripts"]["circuit"]["state"] == "open"
@@ -0,0 +1,91 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from app.main import app
+from app.services.singleflight import SingleFlight
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    executions = 0
+
+    async def work():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.02)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert executions == 1
+    assert flight.stats() == {"calls": 10, "executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_key_is_released():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(*(flight.do("key", boom) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def ok():
+        return 42
+
+    assert await flight.do("key", ok) == 42
+    assert flight.stats()["executions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_concurrent_route_requests_are_coalesced(mock_list_transcripts):
+    def slow_fetch():
+        time.sleep(0.05)
+        return SAMPLE_TRANSCRIPT_SEGMENTS
+
+    mock_transcript_data = MagicMock()
+    mock_transcript_data.fetch.side_effect = slow_fetch
+    mock_transcript_list_obj = MagicMock()
+    mock_transcript_list_obj.find_manually_created_transcript = MagicMock(return_value=mock_transcript_data)
+    mock_list_transcripts.return_value = mock_transcript_list_obj
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(ac.get(f"/transcripts/viralVideo?format={fmt}") for fmt in ["json", "text"] * 5)
+        )
+
+    assert all(r.status_code == 200 for r in responses)
+    mock_list_transcripts.assert_called_once_with("viralVideo")
+    mock_transcript_data.fetch.assert_called_once()
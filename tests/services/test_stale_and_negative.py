@@ -0,0 +1,104 @@
+"""Tests for negative caching and stale-while-revalidate in the transcript service."""
+
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
+
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, get_transcript_cache
+from app.main import app
+from app.models.compact import CompactTranscript
+from app.services.transcript_service import get_transcript_service
+
+OLD_SEGMENTS = [{"text": "Old text", "start": 0.0, "duration": 1.0}]
+NEW_SEGMENTS = [{"text": "New text", "start": 0.0, "duration": 1.0}]
+
+
+def _transcript_list(segments):
+    transcript = MagicMock()
+    transcript.fetch.return_value = segments
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+def _not_found(*args):
+    raise NoTranscriptFound("missingVideo", ["en"], None)
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_disabled_outcome_is_cached(mock_list_transcripts):
+    mock_list_transcripts.side_effect = TranscriptsDisabled("disabledVideo")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get("/transcripts/disabledVideo")
+        second = await ac.get("/transcripts/disabledVideo?format=text")
+
+    assert first.status_code == second.status_code == 404
+    assert second.json()["detail"] == "Transcripts are disabled for this video."
+    mock_list_transcripts.assert_called_once_with("disabledVideo")
+    assert get_transcript_cache().stats()["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_not_found_outcome_is_cached_for_bulk_requests(mock_list_transcripts):
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript.side_effect = _not_found
+    transcript_list.find_generated_transcript.side_effect = _not_found
+    mock_list_transcripts.return_value = transcript_list
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/transcripts/missingVideo")
+        response = await ac.post("/transcripts/bulk", json={"video_ids": ["missingVideo"]})
+
+    assert '"status_code": 404' in response.text
+    mock_list_transcripts.assert_called_once_with("missingVideo")
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_stale_entry_is_served_and_refreshed_once(mock_list_transcripts):
+    mock_list_transcripts.return_value = _transcript_list(NEW_SEGMENTS)
+    cache = get_transcript_cache()
+    stale_at = time.time() - cache.ttl_seconds - 1
+    await RedisCache().set(
+        cache.key("staleVideo"), CacheEntry(stale_at, CompactTranscript.from_segments(OLD_SEGMENTS)).encode()
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        responses = await asyncio.gather(*(ac.get("/transcripts/staleVideo?format=text") for _ in range(5)))
+        assert all(r.text == "Old text" for r in responses)
+
+        await asyncio.sleep(0.1)  # let the background refresh finish
+        refreshed = await ac.get("/transcripts/staleVideo?format=text")
+
+    assert refreshed.text == "New text"
+    mock_list_transcripts.assert_called_once_with("staleVideo")
+    assert get_transcript_service().stats()["revalidations"] == 1
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_failed_refresh_keeps_serving_stale_copy(mock_list_transcripts):
+    mock_list_transcripts.side_effect = RuntimeError("upstream down")
+    cache = get_transcript_cache()
+    stale_at = time.time() - cache.ttl_seconds - 1
+    await RedisCache().set(
+        cache.key("staleVideo"), CacheEntry(stale_at, CompactTranscript.from_segments(OLD_SEGMENTS)).encode()
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get("/transcripts/staleVideo?format=text")
+        await asyncio.sleep(0.1)
+        second = await ac.get("/transcripts/staleVideo?format=text")
+        await asyncio.sleep(0.1)
+
+    assert first.text == second.text == "Old text"
+    assert get_transcript_service().stats()["revalidations"] == 2
@@ -0,0 +1,67 @@
+"""Tests for phrase search inside a transcript and the time-window parameters."""
+
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.cache.redis_cache import RedisCache
+from app.cache.transcript_cache import CacheEntry, get_transcript_cache
+from app.main import app
+from app.models.compact import CompactTranscript
+from app.services.transcript_search import find_phrase
+
+SEGMENTS = [
+    {"text": "Welcome to the show", "start": 0.0, "duration": 3.0},
+    {"text": "today: the borrow", "start": 3.0, "duration": 3.0},
+    {"text": "Checker, explained.", "start": 6.0, "duration": 3.0},
+    {"text": "Ça va? The BORROW checker again", "start": 9.0, "duration": 3.0},
+    {"text": "bye", "start": 12.0, "duration": 3.0},
+]
+
+
+ASCII_SEGMENTS = [*SEGMENTS[:3], {**SEGMENTS[3], "text": "The BORROW checker again"}, *SEGMENTS[4:]]
+
+
+@pytest.mark.parametrize("segments", [SEGMENTS, ASCII_SEGMENTS], ids=["unicode", "ascii"])
+def test_phrase_found_across_segment_boundaries(segments):
+    transcript = CompactTranscript.from_segments(segments)
+
+    matches = find_phrase(transcript, "borrow checker")
+
+    assert [(m.first, m.last) for m in matches] == [(1, 2), (3, 3)]
+    assert find_phrase(transcript, "borrow checkers") == []
+
+
+async def _seed(video_id):
+    entry = CacheEntry(time.time(), CompactTranscript.from_segments(SEGMENTS))
+    await RedisCache().set(get_transcript_cache().key(video_id), entry.encode())
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_returns_timestamps_and_context():
+    await _seed("phraseVid")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/transcripts/phraseVid/search", params={"q": "Borrow Checker", "context": 1})
+
+    assert response.status_code == 200
+    first, second = response.json()["matches"]
+    assert (first["start"], first["end"]) == (3.0, 9.0)
+    assert first["text"] == "today: the borrow Checker, explained."
+    assert [s["start"] for s in first["context"]] == [0.0, 3.0, 6.0, 9.0]
+    assert [s["start"] for s in second["context"]] == [6.0, 9.0, 12.0]
+
+
+@pytest.mark.asyncio
+async def test_start_and_end_slice_the_transcript():
+    await _seed("windowVid")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        sliced = await ac.get("/transcripts/windowVid", params={"start": 4, "end": 9})
+        text = await ac.get("/transcripts/windowVid", params={"start": 11, "format": "text"})
+        invalid = await ac.get("/transcripts/windowVid", params={"start": 9, "end": 4})
+
+    assert sliced.json()["transcript"] == SEGMENTS[1:3]
+    assert text.text == "Ça va? The BORROW checker again\nbye"
+    assert invalid.status_code == 400
@@ -0,0 +1,105 @@
+"""Tests for the bounded upstream executor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch
+
+from app.main import app
+from app.services.upstream import UpstreamExecutor, UpstreamOverloaded, UpstreamTimeout
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_does_not_block_event_loop():
+    """Other coroutines keep running while an upstream call blocks a thread."""
+    executor = UpstreamExecutor(max_workers=2, max_concurrency=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    try:
+        await asyncio.gather(executor.run("yt", time.sleep, 0.2), ticker())
+        assert ticks == 5
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_enforced_per_upstream():
+    executor = UpstreamExecutor(max_workers=8, max_concurrency=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    try:
+        await asyncio.gather(*(executor.run("yt", work) for _ in range(6)))
+        assert peak == 2
+        assert executor.stats()["yt"]["completed"] == 6
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_limit_rejects_fast():
+    executor = UpstreamExecutor(max_workers=2, max_concurrency=1, max_queue_depth=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run("yt", release.wait))
+        queued = asyncio.ensure_future(executor.run("yt", lambda: None))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(UpstreamOverloaded):
+            await executor.run("yt", lambda: None)
+        assert executor.stats()["yt"]["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_keeps_slot_until_thread_finishes():
+    executor = UpstreamExecutor(max_workers=2, max_concurrency=1, timeout_seconds=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(UpstreamTimeout):
+            await executor.run("yt", release.wait)
+        stats = executor.stats()["yt"]
+        assert stats["timeouts"] == 1
+        assert stats["in_flight"] == 1
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert executor.stats()["yt"]["in_flight"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+@patch("app.services.transcript_service.TranscriptService.fetch_segments")
+async def test_route_maps_overload_to_503(mock_fetch_segments):
+    mock_fetch_segments.side_effect = UpstreamOverloaded("youtube_transcripts", 64)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/transcripts/anyVideo")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
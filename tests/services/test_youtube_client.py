@@ -0,0 +1,141 @@
+"""Tests for the pooled, quota-aware YouTube Data API client."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.services.quota import QuotaLedger
+from app.services.upstream import UpstreamExecutor
+from app.services.youtube_client import YouTubeAPIError, YouTubeClient
+
+
+class StubDataAPI:
+    """Minimal local Data API: search, videos.list and ETags."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        resource = request.url.path.rsplit("/", 1)[-1]
+        params = request.url.params
+        if resource == "search":
+            count = int(params["maxResults"])
+            body = {
+                "items": [{"id": {"kind": "youtube#video", "videoId": f"v{i}"}} for i in range(count)],
+                "nextPageToken": "next",
+                "pageInfo": {"totalResults": 1000},
+            }
+        elif resource == "videos":
+            ids = params["id"].split(",")
+            assert len(ids) <= 50
+            body = {"items": [{"id": v, "snippet": {"title": f"Video {v}"}} for v in ids if v != "gone"]}
+        else:
+            return httpx.Response(404, json={"error": {"message": "unknown"}})
+
+        etag = f'"{hash(json.dumps(body, sort_keys=True)) & 0xFFFFFFFF:x}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json=body, headers={"ETag": etag})
+
+
+@pytest.fixture
+def stub():
+    return StubDataAPI()
+
+
+@pytest_asyncio.fixture
+async def client(stub):
+    yt = YouTubeClient("test-key", transport=httpx.MockTransport(stub), quota=QuotaLedger(10_000))
+    yield yt
+    await yt.close()
+
+
+@pytest.mark.asyncio
+async def test_get_videos_batches_fifty_ids_per_call(client, stub):
+    ids = [f"id{i}" for i in range(120)] + ["id0", "gone"]
+
+    videos = await client.get_videos(ids)
+
+    assert len(videos) == 120
+    assert len(stub.requests) == 3
+    assert client.quota.snapshot()["by_resource"] == {"videos": 3}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_single_lookups_share_one_call(client, stub):
+    results = await asyncio.gather(*(client.get_video(f"id{i}") for i in range(30)), client.get_video("gone"))
+
+    assert [r["id"] for r in results[:30]] == [f"id{i}" for i in range(30)]
+    assert results[30] is None
+    assert len(stub.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_resource_is_revalidated_with_etag(client, stub):
+    first = await client.get_videos(["a", "b"])
+    second = await client.get_videos(["a", "b"])
+
+    assert second == first
+    assert "If-None-Match" in stub.requests[1].headers
+    assert client.stats()["not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_refuses_locally(stub):
+    client = YouTubeClient("test-key", transport=httpx.MockTransport(stub), quota=QuotaLedger(150))
+    try:
+        await client.search("cats")
+        with pytest.raises(YouTubeAPIError) as exc_info:
+            await client.search("dogs")
+    finally:
+        await client.close()
+
+    assert exc_info.value.status_code == 403
+    assert len(stub.requests) == 1
+    assert client.quota.snapshot()["remaining"] == 50
+
+
+@pytest.mark.asyncio
+async def test_calls_refused_by_an_open_circuit_are_not_charged(stub):
+    executor = UpstreamExecutor(max_workers=1, max_concurrency=4, failure_threshold=1, reset_seconds=60)
+    client = YouTubeClient(
+        "test-key", transport=httpx.MockTransport(stub), executor=executor, quota=QuotaLedger(10_000)
+    )
+    try:
+        executor._lane(YouTubeClient.UPSTREAM).breaker.on_failure()
+        for _ in range(3):
+            with pytest.raises(YouTubeAPIError) as exc_info:
+                await client.search("cats")
+    finally:
+        await client.close()
+        executor.shutdown()
+
+    assert exc_info.value.status_code == 503
+    assert stub.requests == []
+    assert client.quota.used == 0
+
+
+@pytest.mark.asyncio
+async def test_enriched_search_costs_far_less_than_per_video_lookups(stub):
+    batched = YouTubeClient("test-key", transport=httpx.MockTransport(stub), quota=QuotaLedger(10_000))
+    naive = YouTubeClient("test-key", transport=httpx.MockTransport(StubDataAPI()), quota=QuotaLedger(10_000))
+    try:
+        page = await batched.search_videos("cats", max_results=50)
+
+        naive_page = await naive.search("cats", max_results=50)
+        for item in naive_page["items"]:
+            await naive._get("videos", {"part": YouTubeClient.VIDEO_PARTS, "id": item["id"]["videoId"]})
+    finally:
+        await batched.close()
+        await naive.close()
+
+    assert len(page["items"]) == 50
+    assert page["nextPageToken"] == "next"
+    assert batched.stats()["requests"] == 2
+    assert batched.quota.used == 101
+    assert naive.stats()["requests"] == 51
+    assert naive.quota.used == 150
@@ -0,0 +1,39 @@
+"""Tests for the queued logging pipeline."""
+
+import logging
+import queue
+
+from app.utils.logger import DroppingQueueHandler, SamplingFilter
+
+
+def _record(level: int, msg: str = "hello %s", args=("world",)) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(_record(logging.INFO))
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_queue_handler_leaves_formatting_to_the_listener():
+    handler = DroppingQueueHandler(queue.Queue())
+    handler.handle(_record(logging.INFO))
+
+    record = handler.queue.get_nowait()
+    assert record.msg == "hello %s" and record.args == ("world",)
+    assert record.getMessage() == "hello world"
+
+
+def test_sampling_filter_only_thins_info_and_below():
+    sampler = SamplingFilter(0.0)
+
+    assert not sampler.filter(_record(logging.INFO))
+    assert not sampler.filter(_record(logging.DEBUG))
+    assert sampler.filter(_record(logging.WARNING))
+    assert sampler.filter(_record(logging.ERROR))
+    assert sampler.sampled_out == 2
+    assert SamplingFilter(1.0).filter(_record(logging.INFO))
@@ -0,0 +1,91 @@
+"""Tests for request profiling spans, Server-Timing and the slow-request log."""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+
+from app.api.middleware import ProfilingMiddleware
+from app.main import app
+from app.utils.profiling import SlowRequestLog, end_profile, span, start_profile, timed_chunks
+
+SAMPLE_TRANSCRIPT_SEGMENTS = [
+    {"text": "Hello world", "start": 0.5, "duration": 1.5},
+    {"text": "second line", "start": 2.0, "duration": 1.0},
+]
+
+
+def _mock_transcript_list():
+    transcript = MagicMock()
+    transcript.fetch.return_value = SAMPLE_TRANSCRIPT_SEGMENTS
+    transcript_list = MagicMock()
+    transcript_list.find_manually_created_transcript = MagicMock(return_value=transcript)
+    return transcript_list
+
+
+def test_spans_are_noops_without_a_profile():
+    chunks = [b"a", b"b"]
+    assert timed_chunks("render", chunks) is chunks
+    with span("anything"):
+        pass
+
+
+def test_profile_aggregates_spans():
+    profile, token = start_profile()
+    try:
+        for _ in range(2):
+            with span("cache.redis"):
+                pass
+        assert list(timed_chunks("render.srt", [b"x", b"y"])) == [b"x", b"y"]
+    finally:
+        end_profile(token)
+
+    totals = profile.totals()
+    assert list(totals) == ["cache.redis", "render.srt"]
+    assert totals["cache.redis"][1] == 2
+    assert profile.server_timing(0.0012).endswith("app;dur=1.20")
+
+
+def test_slow_request_log_keeps_recent_slow_requests_slowest_first():
+    log = SlowRequestLog(capacity=2, threshold_seconds=0.1)
+    profile, token = start_profile()
+    end_profile(token)
+
+    assert not log.record(profile, 0.05, "GET", "/fast", 200)
+    for duration, path in ((0.3, "/a"), (0.2, "/b"), (0.5, "/c")):
+        log.record(profile, duration, "GET", path, 200)
+
+    assert [entry["path"] for entry in log.slowest()] == ["/c", "/b"]  # "/a" was evicted
+    assert log.recorded == 3
+
+
+@pytest.mark.asyncio
+@patch("app.api.routes.transcripts.YouTubeTranscriptApi.list_transcripts")
+async def test_middleware_reports_server_timing_and_slow_requests(mock_list_transcripts):
+    mock_list_transcripts.return_value = _mock_transcript_list()
+    slow_log = SlowRequestLog(capacity=10, threshold_seconds=0.0)
+    profiled = ProfilingMiddleware(app, slow_log=slow_log)
+
+    async with AsyncClient(transport=ASGITransport(app=profiled), base_url="http://test") as ac:
+        cold = await ac.get("/transcripts/vid-prof")
+        streamed = await ac.get("/transcripts/vid-prof", params={"format": "srt"})
+
+    assert cold.status_code == 200 and streamed.status_code == 200
+    timing = cold.headers["server-timing"]
+    for name in ("upstream.list", "upstream.fetch", "upstream", "compact", "cache.encode", "render.json", "app"):
+        assert f"{name};dur=" in timing
+    assert "upstream" not in streamed.headers["server-timing"]  # served from L1
+
+    entries = slow_log.slowest()
+    assert {entry["path"] for entry in entries} == {"/transcripts/vid-prof"}
+    streamed_entry = next(e for e in entries if any(s["name"] == "render.srt" for s in e["spans"]))
+    assert streamed_entry["status"] == 200
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_lists_slow_requests():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/admin/slow-requests")
+
+    assert response.status_code == 200
+    assert response.json()["enabled"] is False
+    assert response.json()["requests"] == []